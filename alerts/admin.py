@@ -1,15 +1,21 @@
+import datetime
 from typing import Any
 
 from django.contrib import admin
-from django.http import HttpRequest
+from django.db.models import Avg, Count, Max, Q, QuerySet, Sum
+from django.http import HttpRequest, HttpResponse
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.html import format_html
 from django.utils.safestring import SafeString
 from django.utils.translation import gettext_lazy as _
 
 from alerts.config import AlertConfig
 
-from .models import Alert
+from .models import Alert, AlertRun
+
+# сводка по обработчикам над списком алертов считается за этот период
+ALERT_RUN_SUMMARY_PERIOD = datetime.timedelta(days=7)
 
 
 @admin.register(Alert)
@@ -56,6 +62,32 @@ class AlertAdmin(admin.ModelAdmin[Alert]):
         ),
     )
 
+    def changelist_view(self, request: HttpRequest, extra_context: dict[str, Any] | None = None) -> HttpResponse:
+        extra_context = extra_context or {}
+        extra_context["alert_run_summary"] = self.get_alert_run_summary()
+        extra_context["alert_run_summary_days"] = ALERT_RUN_SUMMARY_PERIOD.days
+        return super().changelist_view(request, extra_context)
+
+    @staticmethod
+    def get_alert_run_summary() -> QuerySet[AlertRun, dict[str, Any]]:
+        """Запуски обработчиков за последние дни, самые долгие сверху."""
+        return (
+            AlertRun.objects.filter(started_at__gte=timezone.now() - ALERT_RUN_SUMMARY_PERIOD)
+            .values("handler")
+            .annotate(
+                runs=Count("pk"),
+                failures=Count("pk", filter=Q(failed=True)),
+                avg_duration=Avg("duration"),
+                max_duration=Max("duration"),
+                avg_query_count=Avg("query_count"),
+                avg_rows_scanned=Avg("rows_scanned"),
+                created=Sum("created"),
+                resolved=Sum("resolved"),
+                last_run=Max("started_at"),
+            )
+            .order_by("-avg_duration")
+        )
+
     @admin.display(description=_("Related Object"))
     def content_object_link(self, obj: Alert) -> str:
         """Создает ссылку на админку связанного объекта, если возможно."""
@@ -100,3 +132,28 @@ class AlertAdmin(admin.ModelAdmin[Alert]):
         style = AlertConfig.STYLES.get(obj.alert_type, "")
         label = obj.get_alert_type_display() if hasattr(obj, "get_alert_type_display") else obj.alert_type
         return format_html('<span style="padding:2px 6px; border-radius:4px; {}">{}</span>', style, label)
+
+
+@admin.register(AlertRun)
+class AlertRunAdmin(admin.ModelAdmin[AlertRun]):
+    """История запусков обработчиков алертов; записи создает только `alerts.tasks.run_alert_handler`."""
+
+    list_display = (
+        "handler",
+        "started_at",
+        "duration",
+        "query_count",
+        "rows_scanned",
+        "created",
+        "resolved",
+        "is_incremental",
+        "failed",
+    )
+    list_filter = ("handler", "is_incremental", "failed", "started_at")
+    date_hierarchy = "started_at"
+
+    def has_add_permission(self, request: HttpRequest) -> bool:  # noqa: ARG002
+        return False
+
+    def has_change_permission(self, request: HttpRequest, obj: AlertRun | None = None) -> bool:  # noqa: ARG002
+        return False
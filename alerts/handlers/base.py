@@ -1,7 +1,11 @@
+import datetime
 import logging
 from abc import ABC, abstractmethod
+from collections.abc import Iterable
+from typing import Any, ClassVar
 
 from django.contrib.contenttypes.models import ContentType
+from django.db.models import Exists, OuterRef, Q, QuerySet
 from django.utils import timezone
 
 from alerts.models import Alert
@@ -12,10 +16,26 @@ logger = logging.getLogger(__name__)
 class AlertHandler(ABC):
     """Базовый класс для обработчиков алертов."""
 
+    # каждый обработчик выполняется отдельной Celery-задачей, см. `alerts.tasks.run_alert_handler`
+    TIME_LIMIT: ClassVar[datetime.timedelta] = datetime.timedelta(minutes=5)
+    MAX_RETRIES: ClassVar[int] = 2
+    RETRY_DELAY: ClassVar[datetime.timedelta] = datetime.timedelta(minutes=1)
+
     def __init__(self, content_type: ContentType, alert_type: str):
         self.content_type = content_type
         self.alert_type = alert_type
         self.now = timezone.now()
+        # None — полная проверка всех объектов, см. `limit_to_changes`
+        self.dirty_ids: set[int] | None = None
+        self.evaluated_until: datetime.datetime | None = None
+
+    def limit_to_changes(self, dirty_ids: Iterable[int], evaluated_until: datetime.datetime) -> None:
+        """
+        Ограничивает проверку измененными объектами (см. `DirtyObject`)
+        и объектами, порог по времени для которых истек после `evaluated_until`.
+        """
+        self.dirty_ids = set(dirty_ids)
+        self.evaluated_until = evaluated_until
 
     @abstractmethod
     def check_and_create_alerts(self, processed_alerts: dict[str, int]) -> None:
@@ -27,30 +47,46 @@ class AlertHandler(ABC):
         """Проверяет и разрешает существующие алерты."""
         pass
 
-    def _bulk_create_alerts(self, alerts_to_create: list[Alert], processed_alerts: dict[str, int]) -> None:
-        """Создает список алертов с обработкой ошибок."""
-        if not alerts_to_create:
-            return
+    def run(self, processed_alerts: dict[str, int]) -> None:
+        """Создает новые и разрешает устаревшие алерты."""
+        self.check_and_create_alerts(processed_alerts)
+        self.resolve_alerts(processed_alerts)
 
-        try:
-            created_alerts = Alert.objects.bulk_create(alerts_to_create)
+    def _filter_changed(
+        self, qs: QuerySet[Any], time_field: str, period: datetime.timedelta, object_field: str = "pk"
+    ) -> QuerySet[Any]:
+        """
+        При инкрементальной проверке оставляет в `qs` измененные объекты
+        и строки, у которых `time_field` перешел порог `period` после прошлой проверки.
+        """
+        if self.dirty_ids is None or self.evaluated_until is None:
+            return qs
+        return qs.filter(
+            Q(**{f"{object_field}__in": self.dirty_ids}) | Q(**{f"{time_field}__gt": self.evaluated_until - period})
+        )
+
+    def _resolve_alerts_not_matching(self, matching_qs: QuerySet[Any], processed_alerts: dict[str, int]) -> None:
+        """
+        Разрешает одним UPDATE активные алерты, объекты которых больше не входят в `matching_qs`
+        (или удалены).  Число запросов не зависит от числа открытых алертов.
+        При инкрементальной проверке пересматриваются только алерты измененных объектов.
+        """
+        active = Alert.objects.filter(content_type=self.content_type, alert_type=self.alert_type, is_resolved=False)
+        if self.dirty_ids is not None:
+            active = active.filter(object_id__in=self.dirty_ids)
+        count = active.exclude(Exists(matching_qs.filter(pk=OuterRef("object_id")))).update(
+            is_resolved=True, resolved_at=self.now
+        )
+        processed_alerts["resolved"] += count
+        if count:
+            logger.info(f"Resolved {count} {self.alert_type} alerts.")
+
+    def _bulk_create_alerts(self, alerts_to_create: list[Alert], processed_alerts: dict[str, int]) -> None:
+        """
+        Создает алерты одним запросом; объекты, у которых уже есть активный алерт этого типа,
+        пропускаются на уровне БД (см. `AlertQuerySet.create_missing`).
+        """
+        created_alerts = Alert.objects.create_missing(alerts_to_create)
+        processed_alerts["created"] += len(created_alerts)
+        if created_alerts:
             logger.info(f"Created {len(created_alerts)} {self.alert_type} alerts.")
-            processed_alerts["created"] += len(created_alerts)
-        except Exception as e:
-            logger.error(f"Error bulk creating {self.alert_type} alerts: {e}")
-            # Резервная логика: попытаться создать по одному
-            self._fallback_create_alerts(alerts_to_create, processed_alerts)
-
-    def _fallback_create_alerts(self, alerts_to_create: list[Alert], processed_alerts: dict[str, int]) -> None:
-        """Резервный метод создания алертов по одному в случае ошибки bulk_create."""
-        created_count = 0
-        for alert in alerts_to_create:
-            try:
-                alert.save()
-                created_count += 1
-            except Exception as e:
-                logger.error(f"Error creating single {self.alert_type} alert for object {alert.object_id}: {e}")
-
-        processed_alerts["created"] += created_count
-        if created_count > 0:
-            logger.info(f"Created {created_count} {self.alert_type} alerts using fallback method.")
@@ -10,6 +10,7 @@ from django.utils import timezone
 
 from alerts.handlers.base import AlertHandler
 from alerts.models import Alert
+from api.models.log_event import LatestLogEvent
 
 logger = logging.getLogger(__name__)
 
@@ -19,8 +20,7 @@ class DateThresholdHandler(AlertHandler):
     Декларативный обработчик «последнее событие + порог по времени + проверка статуса».
     Необходимые атрибуты в подклассе:
       - MODEL: Django-модель, по которой создаются алерты
-      - EVENT_MODEL: модель лога с datetime-полем (например, TeacherLogEvent)
-      - EVENT_TYPE: значение в event_model.type, по которому фильтруем
+      - EVENT_TYPE: тип события в логе MODEL, по которому фильтруем
       - STATUS_FIELD: строка с именем поля статуса (на модели MODEL)
       - STATUS_VALUE: значение для STATUS_FIELD при активном алерте
       - PERIOD: datetime.timedelta — порог «старости» события
@@ -28,7 +28,6 @@ class DateThresholdHandler(AlertHandler):
     """
 
     MODEL: ClassVar[type[Model]]
-    EVENT_MODEL: ClassVar[type[Model]]
     EVENT_TYPE: ClassVar[Any]
     STATUS_FIELD: ClassVar[str]
     STATUS_VALUE: ClassVar[Any]
@@ -36,7 +35,7 @@ class DateThresholdHandler(AlertHandler):
     ALERT_TYPE: ClassVar[str]
 
     def __init__(self) -> None:
-        assert self.MODEL and self.EVENT_MODEL and self.EVENT_TYPE is not None
+        assert self.MODEL and self.EVENT_TYPE is not None
         assert self.STATUS_FIELD and self.STATUS_VALUE is not None
         assert self.PERIOD and self.ALERT_TYPE
         ct = ContentType.objects.get_for_model(self.MODEL)
@@ -45,39 +44,23 @@ class DateThresholdHandler(AlertHandler):
 
     def _get_threshold_qs(self) -> QuerySet[Model]:
         threshold = self.now - self.PERIOD
-        # дата последнего нужного события
-        latest_ev = (
-            self.EVENT_MODEL.objects.filter(  # type: ignore[attr-defined]
-                **{f"{self.MODEL._meta.model_name}": OuterRef("pk"), "type": self.EVENT_TYPE}
-            )
-            .order_by("-date_time")
-            .values("date_time")[:1]
-        )
-        return (
+        # дата последнего нужного события — одна строка в `LatestLogEvent`, а не поиск по всему логу
+        latest_ev = LatestLogEvent.objects.filter(
+            content_type=self.content_type, object_id=OuterRef("pk"), type=self.EVENT_TYPE
+        ).values("date_time")
+        qs = (
             self.MODEL.objects.filter(**{self.STATUS_FIELD: self.STATUS_VALUE})  # type: ignore[attr-defined]
             .annotate(last_event=Subquery(latest_ev))
             .filter(last_event__lte=threshold)
         )
+        return self._filter_changed(qs, "last_event", self.PERIOD)
 
     def check_and_create_alerts(self, processed: dict[str, int]) -> None:
         qs = self._get_threshold_qs()
         overdue_rows = list(qs.values("pk", "last_event"))
-        overdue_ids = {row["pk"] for row in overdue_rows}
-        # исключаем уже существующие
-        existing = set(
-            Alert.objects.filter(
-                content_type=self.content_type,
-                object_id__in=overdue_ids,
-                alert_type=self.alert_type,
-                is_resolved=False,
-            ).values_list("object_id", flat=True)
-        )
-        new_ids = overdue_ids - existing
         alerts = []
         for row in overdue_rows:
             pk = row["pk"]
-            if pk not in new_ids:
-                continue
             last_date = row["last_event"]
             if last_date is None:
                 continue
@@ -94,21 +77,11 @@ class DateThresholdHandler(AlertHandler):
                     details=details,
                 )
             )
-            logger.info(f"Created alert {self.ALERT_TYPE} for {self.MODEL.__name__} {pk}")
         self._bulk_create_alerts(alerts, processed)
 
     def resolve_alerts(self, processed: dict[str, int]) -> None:
-        active = Alert.objects.filter(
-            content_type=self.content_type,
-            alert_type=self.alert_type,
-            is_resolved=False,
+        # алерт остается активным, пока объект в том же статусе
+        self._resolve_alerts_not_matching(
+            self.MODEL.objects.filter(**{self.STATUS_FIELD: self.STATUS_VALUE}),  # type: ignore[attr-defined]
+            processed,
         )
-        to_resolve = []
-        for alert in active:
-            obj = self.MODEL.objects.filter(pk=alert.object_id).first()  # type: ignore[attr-defined]
-            if not obj or getattr(obj, self.STATUS_FIELD) != self.STATUS_VALUE:
-                to_resolve.append(alert.pk)
-        if to_resolve:
-            count = Alert.objects.filter(pk__in=to_resolve).update(is_resolved=True, resolved_at=self.now)
-            processed["resolved"] += count
-            logger.info(f"Resolved {count} {self.ALERT_TYPE} alerts.")
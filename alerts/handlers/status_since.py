@@ -40,28 +40,17 @@ class StatusSinceHandler(AlertHandler):
 
     def _get_threshold_qs(self) -> QuerySet[Model]:
         threshold = self.now - self.PERIOD
-        return self.MODEL.objects.filter(  # type: ignore[attr-defined]
+        qs = self.MODEL.objects.filter(  # type: ignore[attr-defined]
             **{self.STATUS_FIELD: self.STATUS_VALUE, "status_since__lte": threshold}
         )
+        return self._filter_changed(qs, "status_since", self.PERIOD)
 
     def check_and_create_alerts(self, processed: dict[str, int]) -> None:
         qs = self._get_threshold_qs()
         overdue_rows = list(qs.values("pk", "status_since"))
-        overdue_ids = {row["pk"] for row in overdue_rows}
-        existing = set(
-            Alert.objects.filter(
-                content_type=self.content_type,
-                object_id__in=overdue_ids,
-                alert_type=self.alert_type,
-                is_resolved=False,
-            ).values_list("object_id", flat=True)
-        )
-        new_ids = overdue_ids - existing
         alerts = []
         for row in overdue_rows:
             pk = row["pk"]
-            if pk not in new_ids:
-                continue
             since = row["status_since"]
             if since is None:
                 continue
@@ -77,21 +66,11 @@ class StatusSinceHandler(AlertHandler):
                     details=details,
                 )
             )
-            logger.info(f"Created alert {self.ALERT_TYPE} for {self.MODEL.__name__} {pk}")
         self._bulk_create_alerts(alerts, processed)
 
     def resolve_alerts(self, processed: dict[str, int]) -> None:
-        active = Alert.objects.filter(
-            content_type=self.content_type,
-            alert_type=self.alert_type,
-            is_resolved=False,
+        # алерт остается активным, пока объект в том же статусе
+        self._resolve_alerts_not_matching(
+            self.MODEL.objects.filter(**{self.STATUS_FIELD: self.STATUS_VALUE}),  # type: ignore[attr-defined]
+            processed,
         )
-        to_resolve = []
-        for alert in active:
-            obj = self.MODEL.objects.filter(pk=alert.object_id).first()  # type: ignore[attr-defined]
-            if not obj or getattr(obj, self.STATUS_FIELD) != self.STATUS_VALUE:
-                to_resolve.append(alert.pk)
-        if to_resolve:
-            count = Alert.objects.filter(pk__in=to_resolve).update(is_resolved=True, resolved_at=self.now)
-            processed["resolved"] += count
-            logger.info(f"Resolved {count} {self.ALERT_TYPE} alerts.")
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import logging
+from abc import abstractmethod
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, ClassVar
+
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Exists, Model, OuterRef, QuerySet
+from django.utils import timezone
+
+from alerts.handlers.base import AlertHandler
+from alerts.models import Alert
+from api.models.log_event import LatestLogEvent
+
+logger = logging.getLogger(__name__)
+
+
+class UnansweredEventHandler(AlertHandler):
+    """
+    Декларативный обработчик «событие-запрос без ответа дольше порога».
+    Необходимые атрибуты в подклассе:
+      - MODEL: Django-модель, по которой создаются алерты
+      - EVENT_MODEL: модель лога с datetime-полем (например, StudentLogEvent)
+      - SUBJECT_FIELD: имя FK на MODEL в EVENT_MODEL
+      - REQUEST_TYPE: тип события-запроса
+      - RESOLVE_TYPES: типы событий, которые считаются ответом на запрос
+      - PERIOD: datetime.timedelta — порог «старости» запроса
+      - ALERT_TYPE: строковый тип алерта из AlertConfig.TYPES
+    Необязательные атрибуты:
+      - SCOPE_FIELDS: поля, в пределах которых ответ относится к запросу (кроме SUBJECT_FIELD)
+      - REQUEST_FILTER: дополнительные условия для событий-запросов;
+        без SCOPE_FIELDS — только условия на сам объект (например, его статус)
+      - REQUEST_ORDER: какой из неотвеченных запросов в пределах SCOPE_FIELDS брать — последний или первый
+
+    Без SCOPE_FIELDS последний запрос и ответы берутся из `LatestLogEvent`,
+    иначе неотвеченные запросы находятся по логу одним запросом (NOT EXISTS + DISTINCT ON).
+    `run` использует результат и для создания, и для разрешения алертов.
+    """
+
+    MODEL: ClassVar[type[Model]]
+    EVENT_MODEL: ClassVar[type[Model]]
+    SUBJECT_FIELD: ClassVar[str]
+    REQUEST_TYPE: ClassVar[Any]
+    RESOLVE_TYPES: ClassVar[list[Any]]
+    PERIOD: ClassVar[timedelta]
+    ALERT_TYPE: ClassVar[str]
+    SCOPE_FIELDS: ClassVar[tuple[str, ...]] = ()
+    REQUEST_FILTER: ClassVar[dict[str, Any]] = {}
+    REQUEST_ORDER: ClassVar[str] = "-date_time"
+
+    def __init__(self) -> None:
+        assert self.MODEL and self.EVENT_MODEL and self.SUBJECT_FIELD
+        assert self.REQUEST_TYPE is not None and self.RESOLVE_TYPES
+        assert self.PERIOD and self.ALERT_TYPE
+        ct = ContentType.objects.get_for_model(self.MODEL)
+        super().__init__(ct, self.ALERT_TYPE)
+        self.now = timezone.now()
+
+    def _get_unanswered_requests_qs(self) -> QuerySet[Any]:
+        threshold = self.now - self.PERIOD
+        if self.SCOPE_FIELDS:
+            unanswered = self._get_unanswered_requests_from_log(threshold)
+        else:
+            unanswered = self._get_unanswered_requests_from_latest_events(threshold)
+        return self._filter_changed(unanswered, "date_time", self.PERIOD, object_field=self.SUBJECT_FIELD)
+
+    def _get_unanswered_requests_from_latest_events(self, threshold: datetime) -> QuerySet[Any]:
+        """
+        Без SCOPE_FIELDS достаточно `LatestLogEvent`: если на последний запрос ответили,
+        то ответ позже и всех предыдущих запросов.
+        """
+        later_responses = LatestLogEvent.objects.filter(
+            content_type=self.content_type,
+            object_id=OuterRef("object_id"),
+            type__in=self.RESOLVE_TYPES,
+            date_time__gt=OuterRef("date_time"),
+        )
+        latest_requests = LatestLogEvent.objects.filter(
+            content_type=self.content_type, type=self.REQUEST_TYPE, date_time__lte=threshold
+        ).exclude(Exists(later_responses))
+        return self.EVENT_MODEL.objects.filter(  # type: ignore[attr-defined]
+            pk__in=latest_requests.values("event_id"), **self.REQUEST_FILTER
+        )
+
+    def _get_unanswered_requests_from_log(self, threshold: datetime) -> QuerySet[Any]:
+        partition_fields = (self.SUBJECT_FIELD, *self.SCOPE_FIELDS)
+        # ответ относится к запросу, если он позже запроса и в тех же пределах
+        responses = self.EVENT_MODEL.objects.filter(  # type: ignore[attr-defined]
+            type__in=self.RESOLVE_TYPES,
+            date_time__gt=OuterRef("date_time"),
+            **{field: OuterRef(field) for field in partition_fields},
+        )
+        requests = (
+            self.EVENT_MODEL.objects.filter(type=self.REQUEST_TYPE, **self.REQUEST_FILTER)  # type: ignore[attr-defined]
+            .exclude(Exists(responses))
+            .order_by(*partition_fields, self.REQUEST_ORDER)
+            .distinct(*partition_fields)
+        )
+        # порог проверяется после DISTINCT ON: более свежий запрос перекрывает старый
+        return self.EVENT_MODEL.objects.filter(  # type: ignore[attr-defined]
+            pk__in=requests.values("pk"), date_time__lte=threshold
+        )
+
+    def _get_unanswered_requests(self) -> dict[int, list[Any]]:
+        unanswered: dict[int, list[Any]] = defaultdict(list)
+        for request in self._get_unanswered_requests_qs().order_by("date_time"):
+            unanswered[getattr(request, f"{self.SUBJECT_FIELD}_id")].append(request)
+        return unanswered
+
+    @abstractmethod
+    def _get_details(self, object_id: int, requests: list[Any]) -> str:
+        """Текст алерта по неотвеченным запросам объекта."""
+
+    def run(self, processed: dict[str, int]) -> None:
+        unanswered = self._get_unanswered_requests()
+        self._create_alerts(unanswered, processed)
+        self._resolve_alerts_not_matching(self.MODEL.objects.filter(pk__in=unanswered), processed)  # type: ignore[attr-defined]
+
+    def check_and_create_alerts(self, processed: dict[str, int]) -> None:
+        self._create_alerts(self._get_unanswered_requests(), processed)
+
+    def resolve_alerts(self, processed: dict[str, int]) -> None:
+        self._resolve_alerts_not_matching(
+            self.MODEL.objects.filter(  # type: ignore[attr-defined]
+                pk__in=self._get_unanswered_requests_qs().values(self.SUBJECT_FIELD)
+            ),
+            processed,
+        )
+
+    def _create_alerts(self, unanswered: dict[int, list[Any]], processed: dict[str, int]) -> None:
+        alerts = [
+            Alert(
+                content_type=self.content_type,
+                object_id=object_id,
+                alert_type=self.alert_type,
+                details=self._get_details(object_id, requests),
+            )
+            for object_id, requests in unanswered.items()
+        ]
+        self._bulk_create_alerts(alerts, processed)
@@ -0,0 +1,46 @@
+import datetime
+import time
+from collections.abc import Callable
+from types import TracebackType
+from typing import Any
+
+from django.db import connection
+from django.utils import timezone
+
+
+class AlertRunMeter:
+    """
+    Замеряет время выполнения, число запросов и строк, которые запросы внутри `with`
+    вернули или изменили (`cursor.rowcount`).  Результат сохраняется в `AlertRun`.
+    """
+
+    def __init__(self) -> None:
+        self.started_at = timezone.now()
+        self.duration = datetime.timedelta()
+        self.query_count = 0
+        self.rows_scanned = 0
+        self._start = 0.0
+        self._wrapper_context: Any = None
+
+    def __call__(self, execute: Callable[..., Any], sql: str, params: Any, many: bool, context: Any) -> Any:
+        result = execute(sql, params, many, context)
+        self.query_count += 1
+        # -1, если драйвер не знает числа строк
+        self.rows_scanned += max(context["cursor"].rowcount, 0)
+        return result
+
+    def __enter__(self) -> "AlertRunMeter":
+        self.started_at = timezone.now()
+        self._start = time.perf_counter()
+        self._wrapper_context = connection.execute_wrapper(self)
+        self._wrapper_context.__enter__()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self._wrapper_context.__exit__(exc_type, exc_value, traceback)
+        self.duration = datetime.timedelta(seconds=time.perf_counter() - self._start)
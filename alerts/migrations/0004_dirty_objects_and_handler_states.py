@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:18
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("alerts", "0003_alter_alert_alert_type"),
+        ("contenttypes", "0002_remove_content_type_name"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AlertHandlerState",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("handler", models.CharField(max_length=100, unique=True, verbose_name="Handler")),
+                ("evaluated_until", models.DateTimeField(verbose_name="Evaluated Until")),
+            ],
+            options={
+                "verbose_name": "Alert handler state",
+                "verbose_name_plural": "Alert handler states",
+            },
+        ),
+        migrations.CreateModel(
+            name="DirtyObject",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("object_id", models.PositiveIntegerField(verbose_name="Related Object ID")),
+                ("marked_at", models.DateTimeField(default=django.utils.timezone.now, verbose_name="Marked At")),
+                (
+                    "content_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="contenttypes.contenttype",
+                        verbose_name="Related Model Type",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Dirty object",
+                "verbose_name_plural": "Dirty objects",
+                "constraints": [
+                    models.UniqueConstraint(fields=("content_type", "object_id"), name="dirty_object_unique")
+                ],
+            },
+        ),
+    ]
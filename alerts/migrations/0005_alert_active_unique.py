@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:28
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+from django.db.migrations.state import StateApps
+from django.db.models import Exists, OuterRef
+
+
+def resolve_duplicate_active_alerts(apps: StateApps, _schema_editor: BaseDatabaseSchemaEditor) -> None:
+    """Оставляет самый ранний из активных алертов одного типа для одного объекта, чтобы добавить ограничение."""
+    Alert = apps.get_model("alerts", "Alert")
+    earlier_active = Alert.objects.filter(
+        content_type=OuterRef("content_type"),
+        object_id=OuterRef("object_id"),
+        alert_type=OuterRef("alert_type"),
+        is_resolved=False,
+        pk__lt=OuterRef("pk"),
+    )
+    Alert.objects.filter(Exists(earlier_active), is_resolved=False).update(
+        is_resolved=True, resolved_at=django.utils.timezone.now()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("alerts", "0004_dirty_objects_and_handler_states"),
+        ("contenttypes", "0002_remove_content_type_name"),
+    ]
+
+    operations = [
+        migrations.RunPython(resolve_duplicate_active_alerts, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="alert",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("is_resolved", False)),
+                fields=("content_type", "object_id", "alert_type"),
+                name="alert_active_unique",
+            ),
+        ),
+    ]
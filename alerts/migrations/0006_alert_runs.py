@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:33
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("alerts", "0005_alert_active_unique"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AlertRun",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("handler", models.CharField(max_length=100, verbose_name="Handler")),
+                ("started_at", models.DateTimeField(default=django.utils.timezone.now, verbose_name="Started At")),
+                ("duration", models.DurationField(verbose_name="Duration")),
+                ("query_count", models.PositiveIntegerField(default=0, verbose_name="Queries")),
+                (
+                    "rows_scanned",
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text="Rows returned or changed by the handler's queries.",
+                        verbose_name="Rows Scanned",
+                    ),
+                ),
+                ("created", models.PositiveIntegerField(default=0, verbose_name="Created")),
+                ("resolved", models.PositiveIntegerField(default=0, verbose_name="Resolved")),
+                ("is_incremental", models.BooleanField(default=False, verbose_name="Incremental")),
+                ("failed", models.BooleanField(default=False, verbose_name="Failed")),
+            ],
+            options={
+                "verbose_name": "Alert handler run",
+                "verbose_name_plural": "Alert handler runs",
+                "ordering": ["-started_at"],
+                "indexes": [
+                    models.Index(fields=["handler", "-started_at"], name="alert_run_handler_idx"),
+                    models.Index(fields=["started_at"], name="alert_run_started_at_idx"),
+                ],
+            },
+        ),
+    ]
@@ -1,14 +1,67 @@
+from collections.abc import Sequence
 from typing import Any
 
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
-from django.db import models
+from django.db import connections, models
+from django.db.models.constants import OnConflict
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from alerts.config import AlertConfig
 
 
+class AlertQuerySet(models.QuerySet[Any]):
+    def create_missing(self, alerts: Sequence["Alert"]) -> list["Alert"]:
+        """
+        Создает алерты через INSERT ... ON CONFLICT DO NOTHING, пачками того же размера, что и `bulk_create`.
+        Алерты, для объекта которых уже есть активный алерт того же типа (см. `alert_active_unique`),
+        пропускаются — в том числе при одновременной вставке из разных процессов.
+        Возвращает созданные алерты с заполненным pk.
+        """
+        if not alerts:
+            return []
+        alerts_by_key: dict[tuple[Any, ...], Alert] = {}
+        for alert in alerts:
+            # из повторов записывается первый: следующие пропускаются как конфликтующие с ним
+            alerts_by_key.setdefault((alert.content_type_id, alert.object_id, alert.alert_type), alert)
+        created = []
+        for pk, *key in self._insert_ignoring_conflicts(alerts):
+            alert = alerts_by_key[tuple(key)]
+            alert.pk = pk
+            alert._state.adding = False
+            alert._state.db = self.db
+            created.append(alert)
+        return created
+
+    def _insert_ignoring_conflicts(self, alerts: Sequence["Alert"]) -> list[tuple[Any, ...]]:
+        """
+        Вставляет алерты с ON CONFLICT DO NOTHING и возвращает (pk, content_type_id, object_id, alert_type)
+        вставленных строк.
+
+        `bulk_create(ignore_conflicts=True)` не возвращает строки, а отличить созданные алерты
+        от уже существовавших активных последующим SELECT нельзя, поэтому используется внутренний
+        `QuerySet._insert`.  Все зависимости от него собраны здесь и проверяются тестами `create_missing`.
+        """
+        opts = self.model._meta
+        fields = [field for field in opts.concrete_fields if not field.primary_key]
+        key_fields = [opts.get_field("content_type"), opts.get_field("object_id"), opts.get_field("alert_type")]
+        # размер пачки ограничен числом параметров запроса, которое допускает БД
+        batch_size = max(connections[self.db].ops.bulk_batch_size(fields, alerts), 1)
+        rows = []
+        for start in range(0, len(alerts), batch_size):
+            rows.extend(
+                self._insert(  # type: ignore[attr-defined]
+                    alerts[start : start + batch_size],
+                    fields=fields,
+                    returning_fields=[opts.pk, *key_fields],
+                    on_conflict=OnConflict.IGNORE,
+                )
+            )
+        # для пропущенной единственной строки пачки Django возвращает [None]
+        return [tuple(row) for row in rows if row is not None]
+
+
 class Alert(models.Model):
     """
     Generic Alert model to flag issues related to any model instance.
@@ -44,6 +97,8 @@ class Alert(models.Model):
     # "Виртуальное" поле для удобного доступа к связанному объекту (Coordinator, Student...)
     content_object = GenericForeignKey("content_type", "object_id")
 
+    objects = AlertQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("Alert")
         verbose_name_plural = _("Alerts")
@@ -54,6 +109,14 @@ class Alert(models.Model):
             # Индекс для поиска активных алертов определенного типа
             models.Index(fields=["alert_type", "is_resolved"], name="alert_type_resolved_idx"),
         ]
+        constraints = [
+            # Не больше одного активного алерта каждого типа на объект
+            models.UniqueConstraint(
+                fields=["content_type", "object_id", "alert_type"],
+                condition=models.Q(is_resolved=False),
+                name="alert_active_unique",
+            ),
+        ]
 
     def __str__(self) -> str:
         status = "Resolved" if self.is_resolved else "Active"
@@ -81,3 +144,74 @@ class Alert(models.Model):
             self.is_resolved = True
             self.resolved_at = timezone.now()
             self.save(update_fields=["is_resolved", "resolved_at"])
+
+
+class DirtyObject(models.Model):
+    """
+    Объект, статус или события которого изменились после последней проверки алертов.
+    Инкрементальная проверка берет только такие объекты и удаляет их после обработки.
+    """
+
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE, verbose_name=_("Related Model Type"))
+    object_id = models.PositiveIntegerField(verbose_name=_("Related Object ID"))
+    marked_at = models.DateTimeField(default=timezone.now, verbose_name=_("Marked At"))
+
+    class Meta:
+        verbose_name = _("Dirty object")
+        verbose_name_plural = _("Dirty objects")
+        constraints = [
+            models.UniqueConstraint(fields=["content_type", "object_id"], name="dirty_object_unique"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.content_type.model} #{self.object_id} (marked at {self.marked_at})"
+
+
+class AlertHandlerState(models.Model):
+    """
+    Время, до которого обработчик алертов уже проверил объекты (high-water mark).
+    Инкрементальная проверка берет объекты, порог по времени для которых истек после этого момента.
+    """
+
+    handler = models.CharField(max_length=100, unique=True, verbose_name=_("Handler"))
+    evaluated_until = models.DateTimeField(verbose_name=_("Evaluated Until"))
+
+    class Meta:
+        verbose_name = _("Alert handler state")
+        verbose_name_plural = _("Alert handler states")
+
+    def __str__(self) -> str:
+        return f"{self.handler}: {self.evaluated_until}"
+
+
+class AlertRun(models.Model):
+    """
+    Один запуск обработчика алертов: время, число запросов и строк, созданные и разрешенные алерты.
+    Пишется `alerts.tasks.run_alert_handler`, сводка показывается над списком алертов в админке.
+    """
+
+    handler = models.CharField(max_length=100, verbose_name=_("Handler"))
+    started_at = models.DateTimeField(default=timezone.now, verbose_name=_("Started At"))
+    duration = models.DurationField(verbose_name=_("Duration"))
+    query_count = models.PositiveIntegerField(default=0, verbose_name=_("Queries"))
+    rows_scanned = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_("Rows Scanned"),
+        help_text=_("Rows returned or changed by the handler's queries."),
+    )
+    created = models.PositiveIntegerField(default=0, verbose_name=_("Created"))
+    resolved = models.PositiveIntegerField(default=0, verbose_name=_("Resolved"))
+    is_incremental = models.BooleanField(default=False, verbose_name=_("Incremental"))
+    failed = models.BooleanField(default=False, verbose_name=_("Failed"))
+
+    class Meta:
+        verbose_name = _("Alert handler run")
+        verbose_name_plural = _("Alert handler runs")
+        ordering = ["-started_at"]
+        indexes = [
+            models.Index(fields=["handler", "-started_at"], name="alert_run_handler_idx"),
+            models.Index(fields=["started_at"], name="alert_run_started_at_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.handler} at {self.started_at}: {self.duration}"
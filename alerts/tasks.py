@@ -1,34 +1,163 @@
 import logging
+from datetime import datetime, timedelta
+from typing import Any
 
-from celery import shared_task
+from celery import Signature, Task, chord, shared_task
+from django.db.models import Max
+from django.utils import timezone
 
 from alerts.handlers import ALERT_HANDLERS
-from alerts.models import Alert
+from alerts.handlers.base import AlertHandler
+from alerts.metrics import AlertRunMeter
+from alerts.models import Alert, AlertHandlerState, AlertRun, DirtyObject
 
 logger = logging.getLogger(__name__)
 
+ALERT_HANDLERS_BY_NAME = {handler_class.__name__: handler_class for handler_class in ALERT_HANDLERS}
+# жесткий лимит убивает процесс воркера, поэтому обработчику оставляется время отреагировать на мягкий
+HARD_TIME_LIMIT_GRACE_SECONDS = 30
+# история запусков обработчиков (`AlertRun`) старше этого срока удаляется
+ALERT_RUN_RETENTION = timedelta(days=90)
 
-@shared_task(name="alerts.tasks.check_system_alerts")  # type: ignore[misc]
-def check_system_alerts() -> str:
+
+@shared_task(name="alerts.tasks.check_system_alerts", bind=True)  # type: ignore[misc]
+def check_system_alerts(self: Task) -> str:
     """
     Периодически проверяет условия для разных моделей и создает/разрешает алерты
     используя GenericForeignKey.
+    Полная проверка всех объектов; между ними работает `check_changed_alerts`.
     """
-    processed_alerts = {"created": 0, "resolved": 0}
+    return _check_alerts(self, incremental=False)
 
-    # Инициализация и запуск всех обработчиков алертов
-    for handler_class in ALERT_HANDLERS:
-        try:
+
+@shared_task(name="alerts.tasks.check_changed_alerts", bind=True)  # type: ignore[misc]
+def check_changed_alerts(self: Task) -> str:
+    """
+    Проверяет только объекты, отмеченные как измененные (см. `mark_objects_dirty`),
+    и объекты, порог по времени для которых истек после прошлой проверки обработчика.
+    """
+    return _check_alerts(self, incremental=True)
+
+
+def _check_alerts(task: Task, incremental: bool) -> str:
+    """
+    При прямом или eager-вызове (например, `trigger_task --sync`) обработчики запускаются по очереди
+    в текущем процессе и возвращается итог проверки.
+    На воркере задача заменяется chord'ом: `replace()` завершает ее исключением `Ignore`,
+    а итог возвращает `aggregate_alert_counts`.
+    """
+    started_at = timezone.now().isoformat()
+    last_dirty_object_pk = DirtyObject.objects.aggregate(Max("pk"))["pk__max"]
+    if task.request.called_directly or task.request.is_eager:
+        # eager-запуск подзадачи выполняет и ее повторы, result backend при этом не нужен
+        results = [
+            run_alert_handler.apply(args=(handler_class.__name__, incremental, started_at, last_dirty_object_pk)).get()
+            for handler_class in ALERT_HANDLERS
+        ]
+        return aggregate_alert_counts(results, started_at, last_dirty_object_pk)
+    raise task.replace(_build_alert_check(incremental, started_at, last_dirty_object_pk))
+
+
+def _build_alert_check(incremental: bool, started_at: str, last_dirty_object_pk: int | None) -> Signature:
+    """
+    Chord: каждый обработчик — отдельная подзадача со своим лимитом времени и повторами,
+    `aggregate_alert_counts` суммирует результаты.
+    """
+    return chord(
+        (
+            run_alert_handler.s(handler_class.__name__, incremental, started_at, last_dirty_object_pk).set(
+                soft_time_limit=handler_class.TIME_LIMIT.total_seconds(),
+                time_limit=handler_class.TIME_LIMIT.total_seconds() + HARD_TIME_LIMIT_GRACE_SECONDS,
+            )
+            for handler_class in ALERT_HANDLERS
+        ),
+        aggregate_alert_counts.s(started_at, last_dirty_object_pk),
+    )
+
+
+@shared_task(name="alerts.tasks.run_alert_handler", bind=True)  # type: ignore[misc]
+def run_alert_handler(
+    self: Task, handler_name: str, incremental: bool, started_at: str, last_dirty_object_pk: int | None
+) -> dict[str, Any]:
+    """
+    Запускает один обработчик.  После исчерпания повторов возвращает результат с `failed`,
+    чтобы остальные обработчики все равно были учтены.
+    """
+    handler_class = ALERT_HANDLERS_BY_NAME[handler_name]
+    processed_alerts = {"created": 0, "resolved": 0}
+    meter = AlertRunMeter()
+    try:
+        with meter:
             handler = handler_class()  # type: ignore[abstract]
-            handler.check_and_create_alerts(processed_alerts)
-            handler.resolve_alerts(processed_alerts)
-        except Exception:
-            logger.exception("Error processing alerts with handler %s", handler_class.__name__)
+            _run_handler(
+                handler, processed_alerts, incremental, datetime.fromisoformat(started_at), last_dirty_object_pk
+            )
+    except Exception as e:
+        _record_run(handler_name, incremental, meter, processed_alerts, failed=True)
+        if self.request.retries < handler_class.MAX_RETRIES:
+            logger.warning("Retrying alerts handler %s after error: %s", handler_name, e)
+            raise self.retry(exc=e, countdown=handler_class.RETRY_DELAY.total_seconds())
+        logger.exception("Error processing alerts with handler %s", handler_name)
+        return {"handler": handler_name, "created": 0, "resolved": 0, "failed": True}
+    _record_run(handler_name, incremental, meter, processed_alerts, failed=False)
+    return {"handler": handler_name, **processed_alerts, "failed": False}
+
 
-    logger.info(
-        f"Alert check complete. Created: {processed_alerts['created']}. Resolved: {processed_alerts['resolved']}."
+def _record_run(
+    handler_name: str, incremental: bool, meter: AlertRunMeter, processed_alerts: dict[str, int], failed: bool
+) -> None:
+    AlertRun.objects.create(
+        handler=handler_name,
+        started_at=meter.started_at,
+        duration=meter.duration,
+        query_count=meter.query_count,
+        rows_scanned=meter.rows_scanned,
+        created=processed_alerts["created"],
+        resolved=processed_alerts["resolved"],
+        is_incremental=incremental,
+        failed=failed,
     )
-    return f"Alert check complete. Created: {processed_alerts['created']}. Resolved: {processed_alerts['resolved']}."
+
+
+def _run_handler(
+    handler: AlertHandler,
+    processed_alerts: dict[str, int],
+    incremental: bool,
+    started_at: datetime,
+    last_dirty_object_pk: int | None,
+) -> None:
+    handler_name = type(handler).__name__
+    state = AlertHandlerState.objects.filter(handler=handler_name).first()
+    # обработчик, который еще ни разу не запускался, проверяет все объекты
+    if incremental and state is not None:
+        dirty_ids = DirtyObject.objects.filter(
+            content_type=handler.content_type, pk__lte=last_dirty_object_pk or 0, marked_at__lte=started_at
+        ).values_list("object_id", flat=True)
+        handler.limit_to_changes(dirty_ids, state.evaluated_until)
+    handler.run(processed_alerts)
+    AlertHandlerState.objects.update_or_create(handler=handler_name, defaults={"evaluated_until": handler.now})
+
+
+@shared_task(name="alerts.tasks.aggregate_alert_counts")  # type: ignore[misc]
+def aggregate_alert_counts(results: list[dict[str, Any]], started_at: str, last_dirty_object_pk: int | None) -> str:
+    created = sum(result["created"] for result in results)
+    resolved = sum(result["resolved"] for result in results)
+    failed = [result["handler"] for result in results if result["failed"]]
+
+    # объекты, отмеченные во время проверки, остаются до следующего запуска;
+    # если обработчик упал, его объекты тоже нужно проверить еще раз
+    if not failed and last_dirty_object_pk is not None:
+        DirtyObject.objects.filter(
+            pk__lte=last_dirty_object_pk, marked_at__lte=datetime.fromisoformat(started_at)
+        ).delete()
+
+    AlertRun.objects.filter(started_at__lt=timezone.now() - ALERT_RUN_RETENTION).delete()
+
+    message = f"Alert check complete. Created: {created}. Resolved: {resolved}."
+    if failed:
+        message += f" Failed: {', '.join(failed)}."
+    logger.info(message)
+    return message
 
 
 @shared_task(name="alerts.tasks.create_demo_alerts")  # type: ignore[misc]
@@ -36,19 +165,24 @@ def create_demo_alerts(alert_specs: list[dict[str, str | int]]) -> int:
     created = 0
     for spec in alert_specs:
         try:
-            alert = Alert.objects.create(
-                alert_type=str(spec["alert_type"]),
-                content_type_id=int(spec["content_type_id"]),
-                object_id=int(spec["object_id"]),
-                details=str(spec.get("details", "")),
-            )
-            logger.info(
-                "Created demo alert %s for content_type=%s object_id=%s",
-                alert.pk,
-                alert.content_type_id,
-                alert.object_id,
+            alerts = Alert.objects.create_missing(
+                [
+                    Alert(
+                        alert_type=str(spec["alert_type"]),
+                        content_type_id=int(spec["content_type_id"]),
+                        object_id=int(spec["object_id"]),
+                        details=str(spec.get("details", "")),
+                    )
+                ]
             )
-            created += 1
+            for alert in alerts:
+                logger.info(
+                    "Created demo alert %s for content_type=%s object_id=%s",
+                    alert.pk,
+                    alert.content_type_id,
+                    alert.object_id,
+                )
+            created += len(alerts)
         except Exception:
             logger.exception("Failed to create demo alert for spec=%s", spec)
     return created
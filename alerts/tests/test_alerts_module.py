@@ -1,9 +1,16 @@
+import math
 from datetime import timedelta
 
 import pytest
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
 from django.utils import timezone
 from model_bakery import baker
+from pytest_django import DjangoAssertNumQueries
 from pytest_mock import MockerFixture
+from rest_framework import status
 
 from alerts.handlers.coordinator import (
     CoordinatorOnboardingStaleHandler,
@@ -21,9 +28,10 @@ from alerts.handlers.teacher import (
     TeacherOverdueGroupOfferHandler,
     TeacherOverdueOnLeaveHandler,
 )
-from alerts.models import Alert
-from alerts.tasks import check_system_alerts
+from alerts.models import Alert, AlertHandlerState, AlertRun, DirtyObject
+from alerts.tasks import ALERT_HANDLERS_BY_NAME, check_changed_alerts, check_system_alerts
 from alerts.utils import create_alert_for_object, resolve_alerts_for_objects
+from api.models.auxil.status_setter import StatusSetter
 from api.models.choices.log_event_type import CoordinatorLogEventType, StudentLogEventType, TeacherLogEventType
 from api.models.choices.registration_telegram_bot_language import RegistrationTelegramBotLanguage
 from api.models.choices.status import GroupProjectStatus, StudentProjectStatus, TeacherProjectStatus
@@ -299,6 +307,37 @@ def test_student_overdue_group_offer_no_alert_if_recent_offer_exists(student_no_
     assert processed["created"] == 0
 
 
+@pytest.mark.django_db  # type: ignore[misc]
+def test_student_overdue_group_offer_run_finds_offers_once(
+    django_assert_num_queries: DjangoAssertNumQueries,
+) -> None:
+    past = timezone.now() - timedelta(days=15)
+    answered, unanswered, *others = baker.make(
+        Student, project_status=StudentProjectStatus.NO_GROUP_YET, _fill_optional=True, _quantity=5
+    )
+    for student in (answered, unanswered, *others):
+        StudentLogEvent.objects.create(
+            student=student, type=StudentLogEventType.GROUP_OFFERED, comment="", date_time=past
+        )
+    handler = StudentOverdueGroupOfferHandler()
+    processed = {"created": 0, "resolved": 0}
+    handler.check_and_create_alerts(processed)
+    assert processed["created"] == 2 + len(others)
+
+    StudentLogEvent.objects.create(
+        student=answered, type=StudentLogEventType.DECLINED_OFFER, comment="", date_time=past + timedelta(days=1)
+    )
+    # поиск неотвеченных предложений, поиск существующих алертов, UPDATE
+    with django_assert_num_queries(3):
+        handler.run(processed)
+
+    active_ids = set(
+        Alert.objects.filter(alert_type=handler.alert_type, is_resolved=False).values_list("object_id", flat=True)
+    )
+    assert active_ids == {unanswered.pk, *(student.pk for student in others)}
+    assert processed["resolved"] == 1
+
+
 @pytest.mark.django_db  # type: ignore[misc]
 def test_student_no_group_30_days_creates_alert(student_no_group: Student) -> None:
     student = student_no_group
@@ -364,6 +403,34 @@ def test_group_awaiting_start_overdue_creates_alert() -> None:
     assert processed["created"] == 1
 
 
+@pytest.mark.django_db  # type: ignore[misc]
+def test_status_since_resolve_alerts_runs_one_query(django_assert_num_queries: DjangoAssertNumQueries) -> None:
+    groups = baker.make(
+        Group,
+        _fill_optional=True,
+        project_status=GroupProjectStatus.PENDING,
+        status_since=timezone.now() - timedelta(days=15),
+        _quantity=4,
+    )
+    handler = GroupPendingOverdueHandler()
+    processed = {"created": 0, "resolved": 0}
+    handler.check_and_create_alerts(processed)
+
+    still_pending, *moved_on = groups
+    for group in moved_on:
+        group.project_status = GroupProjectStatus.AWAITING_START
+        group.save(update_fields=["project_status", "status_since"])
+
+    with django_assert_num_queries(1):
+        handler.resolve_alerts(processed)
+
+    active_ids = Alert.objects.filter(alert_type=handler.alert_type, is_resolved=False).values_list(
+        "object_id", flat=True
+    )
+    assert list(active_ids) == [still_pending.pk]
+    assert processed["resolved"] == len(moved_on)
+
+
 @pytest.mark.django_db  # type: ignore[misc]
 def test_teacher_overdue_leave_creates_and_resolves(teacher_no_group: Teacher) -> None:
     teacher = teacher_no_group
@@ -614,6 +681,113 @@ def test_coordinator_onboarding_stale_recent_no_alert() -> None:
     assert Alert.objects.filter(object_id=coordinator.pk, alert_type=handler.alert_type).count() == 0
 
 
+@pytest.mark.django_db  # type: ignore[misc]
+def test_changed_alerts_check_only_dirty_objects_and_crossed_thresholds() -> None:
+    long_ago = timezone.now() - timedelta(days=30)
+    changed, changed_unmarked = baker.make(
+        Group, _fill_optional=True, project_status=GroupProjectStatus.PENDING, status_since=long_ago, _quantity=2
+    )
+    check_system_alerts.apply().get()
+    assert set(
+        Alert.objects.filter(alert_type=GroupPendingOverdueHandler.ALERT_TYPE, is_resolved=False).values_list(
+            "object_id", flat=True
+        )
+    ) == {changed.pk, changed_unmarked.pk}
+
+    StatusSetter.set_status(changed, project_status=GroupProjectStatus.AWAITING_START)
+    Group.objects.filter(pk=changed_unmarked.pk).update(project_status=GroupProjectStatus.AWAITING_START)
+    # порог истек после прошлой проверки
+    AlertHandlerState.objects.filter(handler=GroupPendingOverdueHandler.__name__).update(
+        evaluated_until=timezone.now() - timedelta(days=1)
+    )
+    crossed = baker.make(
+        Group,
+        _fill_optional=True,
+        project_status=GroupProjectStatus.PENDING,
+        status_since=timezone.now() - timedelta(days=14, hours=12),
+    )
+    assert DirtyObject.objects.filter(object_id=changed.pk).exists()
+
+    check_changed_alerts.apply().get()
+
+    active_ids = set(
+        Alert.objects.filter(alert_type=GroupPendingOverdueHandler.ALERT_TYPE, is_resolved=False).values_list(
+            "object_id", flat=True
+        )
+    )
+    assert active_ids == {changed_unmarked.pk, crossed.pk}
+    assert not DirtyObject.objects.exists()
+
+    # полная проверка находит изменения, которые не были отмечены
+    check_system_alerts.apply().get()
+    assert not Alert.objects.filter(
+        object_id=changed_unmarked.pk, alert_type=GroupPendingOverdueHandler.ALERT_TYPE, is_resolved=False
+    ).exists()
+
+
+@pytest.mark.django_db  # type: ignore[misc]
+def test_create_missing_skips_active_duplicates_in_one_query(
+    django_assert_num_queries: DjangoAssertNumQueries, teacher_no_group: Teacher, student_no_group: Student
+) -> None:
+    alert_type = TeacherNoGroup45DaysHandler.ALERT_TYPE
+    active = create_alert_for_object(teacher_no_group, alert_type, "active")
+    resolved = create_alert_for_object(student_no_group, alert_type, "resolved")
+    assert active is not None and resolved is not None
+    resolved.resolve()
+
+    alerts = [
+        Alert(content_type=active.content_type, object_id=teacher_no_group.pk, alert_type=alert_type),
+        Alert(content_type=resolved.content_type, object_id=student_no_group.pk, alert_type=alert_type),
+        Alert(content_type=resolved.content_type, object_id=student_no_group.pk, alert_type=alert_type),
+    ]
+    with django_assert_num_queries(1):
+        created = Alert.objects.create_missing(alerts)
+
+    # у учителя уже есть активный алерт, для студента создается один новый рядом с разрешенным
+    assert created == [alerts[1]]
+    assert created[0].pk is not None
+    assert set(student_no_group.alerts.filter(alert_type=alert_type)) == {resolved, alerts[1]}
+    assert set(Alert.objects.filter(alert_type=alert_type, is_resolved=False)) == {active, alerts[1]}
+
+
+@pytest.mark.django_db  # type: ignore[misc]
+def test_create_missing_skips_single_conflicting_alert(
+    django_assert_num_queries: DjangoAssertNumQueries, teacher_no_group: Teacher
+) -> None:
+    alert_type = TeacherNoGroup45DaysHandler.ALERT_TYPE
+    active = create_alert_for_object(teacher_no_group, alert_type, "active")
+    assert active is not None
+    duplicate = Alert(content_type=active.content_type, object_id=teacher_no_group.pk, alert_type=alert_type)
+
+    # единственная пропущенная строка не должна ломать разбор результата INSERT
+    with django_assert_num_queries(1):
+        created = Alert.objects.create_missing([duplicate])
+
+    assert created == []
+    assert duplicate.pk is None
+    assert list(teacher_no_group.alerts.filter(alert_type=alert_type)) == [active]
+
+
+@pytest.mark.django_db  # type: ignore[misc]
+def test_create_missing_inserts_in_batches(
+    mocker: MockerFixture, django_assert_num_queries: DjangoAssertNumQueries, teacher_no_group: Teacher
+) -> None:
+    batch_size = 2
+    mocker.patch.object(connection.ops, "bulk_batch_size", return_value=batch_size)
+    content_type = ContentType.objects.get_for_model(Teacher)
+    alert_types = ["first", "second", "third", "fourth", "fifth"]
+    alerts = [
+        Alert(content_type=content_type, object_id=teacher_no_group.pk, alert_type=alert_type)
+        for alert_type in alert_types
+    ]
+
+    with django_assert_num_queries(math.ceil(len(alerts) / batch_size)):
+        created = Alert.objects.create_missing(alerts)
+
+    assert created == alerts
+    assert set(teacher_no_group.alerts.values_list("alert_type", flat=True)) == set(alert_types)
+
+
 @pytest.mark.django_db  # type: ignore[misc]
 def test_utils_create_and_resolve(teacher_no_group: Teacher) -> None:
     teacher = teacher_no_group
@@ -649,3 +823,57 @@ def test_celery_task_aggregates_counts(mocker: MockerFixture, teacher_no_group:
 
     result = check_system_alerts()
     assert "Created: 1" in result
+
+
+@pytest.mark.django_db  # type: ignore[misc]
+def test_failed_handler_does_not_lose_counts_of_others(mocker: MockerFixture, teacher_no_group: Teacher) -> None:
+    """Упавший после всех повторов обработчик попадает в итог, счётчики остальных сохраняются."""
+    run = mocker.patch.object(StudentNoGroup30DaysHandler, "run", side_effect=RuntimeError("boom"))
+    TeacherLogEvent.objects.create(
+        teacher=teacher_no_group,
+        type=TeacherLogEventType.AWAITING_OFFER,
+        comment="",
+        date_time=timezone.now() - timedelta(days=46),
+    )
+
+    result = check_system_alerts.apply().get()
+
+    assert run.call_count == StudentNoGroup30DaysHandler.MAX_RETRIES + 1
+    assert "Created: 1" in result
+    assert "Failed: StudentNoGroup30DaysHandler" in result
+    assert not AlertHandlerState.objects.filter(handler="StudentNoGroup30DaysHandler").exists()
+
+
+@pytest.mark.django_db  # type: ignore[misc]
+def test_alert_check_records_run_of_every_handler(teacher_no_group: Teacher) -> None:
+    TeacherLogEvent.objects.create(
+        teacher=teacher_no_group,
+        type=TeacherLogEventType.AWAITING_OFFER,
+        comment="",
+        date_time=timezone.now() - timedelta(days=46),
+    )
+
+    check_system_alerts.apply().get()
+
+    runs = {run.handler: run for run in AlertRun.objects.all()}
+    assert set(runs) == set(ALERT_HANDLERS_BY_NAME)
+    run = runs["TeacherNoGroup45DaysHandler"]
+    assert (run.created, run.resolved, run.failed, run.is_incremental) == (1, 0, False, False)
+    assert run.query_count > 0
+    assert run.rows_scanned > 0
+    assert run.duration > timedelta()
+
+
+@pytest.mark.django_db  # type: ignore[misc]
+def test_alert_changelist_shows_handler_run_summary(admin_client: Client) -> None:
+    AlertRun.objects.create(handler="TeacherNoGroup45DaysHandler", duration=timedelta(seconds=2), query_count=4)
+    AlertRun.objects.create(handler="TeacherNoGroup45DaysHandler", duration=timedelta(seconds=4), query_count=6)
+
+    response = admin_client.get(reverse("admin:alerts_alert_changelist"))
+
+    assert response.status_code == status.HTTP_200_OK
+    [summary] = response.context["alert_run_summary"]
+    assert summary["handler"] == "TeacherNoGroup45DaysHandler"
+    assert summary["runs"] == len(["first", "second"])
+    assert summary["avg_duration"] == timedelta(seconds=3)
+    assert summary["avg_query_count"] == pytest.approx(5)
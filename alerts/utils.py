@@ -1,10 +1,11 @@
 import logging
+from collections.abc import Iterable, Mapping
 
 from django.contrib.contenttypes.models import ContentType
 from django.db.models import Model
 from django.utils import timezone
 
-from alerts.models import Alert
+from alerts.models import Alert, DirtyObject
 
 logger = logging.getLogger(__name__)
 
@@ -27,25 +28,23 @@ def create_alert_for_object(
     if content_type is None:
         content_type = ContentType.objects.get_for_model(obj.__class__)
 
-    # Проверяем, существует ли уже такой алерт
-    existing_alert = Alert.objects.filter(
-        content_type=content_type, object_id=obj.pk, alert_type=alert_type, is_resolved=False
-    ).first()
-
-    if existing_alert:
-        logger.debug(f"Alert {alert_type} for {obj.__class__.__name__} #{obj.pk} already exists")
-        return existing_alert
-
+    alert = Alert(content_type=content_type, object_id=obj.pk, alert_type=alert_type, details=details)
     try:
-        alert = Alert.objects.create(
-            content_type=content_type, object_id=obj.pk, alert_type=alert_type, details=details
-        )
-        logger.debug(f"Created alert {alert_type} for {obj.__class__.__name__} #{obj.pk}")
-        return alert
+        created = Alert.objects.create_missing([alert])
     except Exception as e:
         logger.error(f"Error creating alert for {obj.__class__.__name__} #{obj.pk}: {e}")
         return None
 
+    if created:
+        logger.debug(f"Created alert {alert_type} for {obj.__class__.__name__} #{obj.pk}")
+        return alert
+
+    # активный алерт этого типа уже есть (см. `alert_active_unique`)
+    logger.debug(f"Alert {alert_type} for {obj.__class__.__name__} #{obj.pk} already exists")
+    return Alert.objects.filter(
+        content_type=content_type, object_id=obj.pk, alert_type=alert_type, is_resolved=False
+    ).first()
+
 
 def resolve_alerts_for_objects(model_class: type[Model], object_ids: list[int], alert_type: str) -> int:
     """
@@ -74,3 +73,34 @@ def resolve_alerts_for_objects(model_class: type[Model], object_ids: list[int],
     except Exception as e:
         logger.error(f"Error resolving alerts for {model_class.__name__} objects: {e}")
         return 0
+
+
+def mark_objects_dirty(model_class: type[Model], object_ids: Iterable[int]) -> None:
+    """
+    Отмечает объекты как измененные, чтобы инкрементальная проверка алертов их пересмотрела.
+
+    Args:
+        model_class: Класс модели объектов
+        object_ids: ID объектов
+    """
+    mark_objects_of_content_types_dirty({ContentType.objects.get_for_model(model_class): object_ids})
+
+
+def mark_objects_of_content_types_dirty(object_ids: Mapping[ContentType, Iterable[int]]) -> None:
+    """
+    Отмечает измененными объекты нескольких моделей одним запросом.
+
+    Args:
+        object_ids: ID объектов по типам контента
+    """
+    now = timezone.now()
+    DirtyObject.objects.bulk_create(
+        [
+            DirtyObject(content_type=content_type, object_id=object_id, marked_at=now)
+            for content_type, ids in object_ids.items()
+            for object_id in set(ids)
+        ],
+        update_conflicts=True,
+        unique_fields=["content_type", "object_id"],
+        update_fields=["marked_at"],
+    )
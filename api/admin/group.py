@@ -260,14 +260,18 @@ class GroupAdmin(CoordinatorRestrictedAdminMixin, VersionAdmin):
             or previous_situational_status != obj.situational_status
         ):
             timestamp = timezone.now()
-            StatusSetter.update_statuses_of_active_coordinators(timestamp)
+            StatusSetter.update_statuses_of_coordinators(obj.coordinators.all(), timestamp)
             StatusSetter.update_related_statuses_for_group(obj, timestamp)
 
     def save_related(self, request: HttpRequest, form: forms.ModelForm[Any], formsets: list[Any], change: bool) -> None:
         super().save_related(request, form, formsets, change)
         obj = form.instance
         timestamp = timezone.now()
-        StatusSetter.update_statuses_of_active_coordinators(timestamp)
+        # coordinators removed from the group have fewer groups now, too
+        previous_coordinator_ids = [coordinator.pk for coordinator in form.initial.get("coordinators", [])]
+        StatusSetter.update_statuses_of_coordinators(
+            Coordinator.objects.filter(Q(pk__in=previous_coordinator_ids) | Q(groups=obj)), timestamp
+        )
         StatusSetter.update_related_statuses_for_group(obj, timestamp)
 
     def get_search_results(
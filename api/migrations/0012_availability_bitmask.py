@@ -0,0 +1,71 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:36
+
+from django.db import migrations, models
+
+from api.models.auxil.availability_bitmask import AvailabilityBitmask
+from api.models.auxil.data_populator import DataPopulator
+
+APP_NAME = "api"
+WEEKDAY_FIELD_NAMES = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+
+
+class AvailabilityBitmaskPopulator(DataPopulator):
+    def _populate(self):
+        """Fills bitmasks of existing students, teachers and groups."""
+        for model_name in ("Student", "Teacher"):
+            model = self.apps.get_model(APP_NAME, model_name)
+            people = list(model.objects.prefetch_related("availability_slots__time_slot"))
+            for person in people:
+                person.availability_bitmask = AvailabilityBitmask.from_slots(person.availability_slots.all())
+            model.objects.bulk_update(people, ["availability_bitmask"], batch_size=1000)
+
+        Group = self.apps.get_model(APP_NAME, "Group")
+        groups = list(Group.objects.all())
+        for group in groups:
+            group.schedule_bitmask = AvailabilityBitmask.from_day_times(
+                (day_of_week_index, getattr(group, field_name))
+                for day_of_week_index, field_name in enumerate(WEEKDAY_FIELD_NAMES)
+                if getattr(group, field_name) is not None
+            )
+        Group.objects.bulk_update(groups, ["schedule_bitmask"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0011_alter_coordinator_project_status_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="group",
+            name="schedule_bitmask",
+            field=models.PositiveBigIntegerField(
+                default=0,
+                editable=False,
+                help_text="lesson times encoded the same way as availability of students and teachers",
+                verbose_name="schedule bitmask",
+            ),
+        ),
+        migrations.AddField(
+            model_name="student",
+            name="availability_bitmask",
+            field=models.PositiveBigIntegerField(
+                default=0,
+                editable=False,
+                help_text="availability slots encoded as one bit per slot, kept in sync automatically",
+                verbose_name="availability bitmask",
+            ),
+        ),
+        migrations.AddField(
+            model_name="teacher",
+            name="availability_bitmask",
+            field=models.PositiveBigIntegerField(
+                default=0,
+                editable=False,
+                help_text="availability slots encoded as one bit per slot, kept in sync automatically",
+                verbose_name="availability bitmask",
+            ),
+        ),
+        migrations.RunPython(AvailabilityBitmaskPopulator.run, reverse_code=migrations.RunPython.noop),
+    ]
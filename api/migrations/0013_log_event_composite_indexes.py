@@ -0,0 +1,76 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:35
+
+from django.contrib.postgres.operations import AddIndexConcurrently, RemoveIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # log tables are large, the indexes are built without blocking writes
+    atomic = False
+
+    dependencies = [
+        ("api", "0012_availability_bitmask"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="coordinatorlogevent",
+            index=models.Index(fields=["coordinator", "-date_time"], name="coordinator_log_date_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="coordinatorlogevent",
+            index=models.Index(fields=["coordinator", "type", "-date_time"], name="coordinator_log_type_date_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="grouplogevent",
+            index=models.Index(fields=["group", "-date_time"], name="group_log_date_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="grouplogevent",
+            index=models.Index(fields=["group", "type", "-date_time"], name="group_log_type_date_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="studentlogevent",
+            index=models.Index(fields=["student", "-date_time"], name="student_log_date_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="studentlogevent",
+            index=models.Index(fields=["student", "type", "-date_time"], name="student_log_type_date_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="teacherlogevent",
+            index=models.Index(fields=["teacher", "-date_time"], name="teacher_log_date_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="teacherlogevent",
+            index=models.Index(fields=["teacher", "type", "-date_time"], name="teacher_log_type_date_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="teacherunder18logevent",
+            index=models.Index(fields=["teacher", "-date_time"], name="teacher18_log_date_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="teacherunder18logevent",
+            index=models.Index(fields=["teacher", "type", "-date_time"], name="teacher18_log_type_date_idx"),
+        ),
+        RemoveIndexConcurrently(
+            model_name="coordinatorlogevent",
+            name="coordinator_id_idx",
+        ),
+        RemoveIndexConcurrently(
+            model_name="grouplogevent",
+            name="group_id_idx",
+        ),
+        RemoveIndexConcurrently(
+            model_name="studentlogevent",
+            name="student_id_idx",
+        ),
+        RemoveIndexConcurrently(
+            model_name="teacherlogevent",
+            name="young_teacher_id_idx",
+        ),
+        RemoveIndexConcurrently(
+            model_name="teacherunder18logevent",
+            name="teacher_id_idx",
+        ),
+    ]
@@ -0,0 +1,84 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from api.models.auxil.data_populator import DataPopulator
+
+APP_NAME = "api"
+# log event model and the foreign key to the object it is about
+LOG_EVENT_MODELS = (
+    ("CoordinatorLogEvent", "coordinator"),
+    ("GroupLogEvent", "group"),
+    ("StudentLogEvent", "student"),
+    ("TeacherLogEvent", "teacher"),
+    ("TeacherUnder18LogEvent", "teacher"),
+)
+
+
+class LatestLogEventPopulator(DataPopulator):
+    def _populate(self):
+        """Fills the latest events of each type from existing logs."""
+        ContentType = self.apps.get_model("contenttypes", "ContentType")
+        LatestLogEvent = self.apps.get_model(APP_NAME, "LatestLogEvent")
+        for model_name, object_field in LOG_EVENT_MODELS:
+            model = self.apps.get_model(APP_NAME, model_name)
+            object_model = model._meta.get_field(object_field).related_model
+            content_type, _ = ContentType.objects.get_or_create(app_label=APP_NAME, model=object_model._meta.model_name)
+            latest_events = (
+                model.objects.order_by(object_field, "type", "-date_time", "-pk")
+                .distinct(object_field, "type")
+                .values_list(f"{object_field}_id", "type", "date_time", "pk")
+            )
+            LatestLogEvent.objects.bulk_create(
+                (
+                    LatestLogEvent(
+                        content_type=content_type,
+                        object_id=object_id,
+                        type=event_type,
+                        date_time=date_time,
+                        event_id=event_id,
+                    )
+                    for object_id, event_type, date_time, event_id in latest_events.iterator()
+                ),
+                batch_size=1000,
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0013_log_event_composite_indexes"),
+        ("contenttypes", "0002_remove_content_type_name"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LatestLogEvent",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("object_id", models.PositiveIntegerField(verbose_name="object ID")),
+                ("type", models.CharField(max_length=50, verbose_name="event type")),
+                ("date_time", models.DateTimeField(verbose_name="date and time")),
+                ("event_id", models.PositiveBigIntegerField(verbose_name="event ID")),
+                (
+                    "content_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="contenttypes.contenttype",
+                        verbose_name="object type",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "latest log event",
+                "verbose_name_plural": "latest log events",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("content_type", "object_id", "type"), name="latest_log_event_unique"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(LatestLogEventPopulator.run, reverse_code=migrations.RunPython.noop),
+    ]
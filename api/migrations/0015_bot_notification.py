@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:07
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0014_latest_log_event"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BotNotification",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("chat_id", models.BigIntegerField(verbose_name="Telegram chat ID")),
+                ("event_type", models.CharField(max_length=50, verbose_name="event type")),
+                ("payload", models.JSONField(default=dict, verbose_name="payload")),
+                ("created_at", models.DateTimeField(default=django.utils.timezone.now, verbose_name="created at")),
+                ("attempts", models.PositiveSmallIntegerField(default=0, verbose_name="failed attempts")),
+                (
+                    "next_attempt_at",
+                    models.DateTimeField(default=django.utils.timezone.now, verbose_name="next attempt at"),
+                ),
+            ],
+            options={
+                "verbose_name": "bot notification",
+                "verbose_name_plural": "bot notifications",
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("attempts__lt", 10)),
+                        fields=["next_attempt_at"],
+                        name="bot_notification_due_idx",
+                    )
+                ],
+            },
+        ),
+    ]
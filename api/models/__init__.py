@@ -1,6 +1,7 @@
 from api.models.shared_abstract.group_or_person import GroupOrPerson
 
 from .age_range import AgeRange
+from .bot_notification import BotNotification
 from .coordinator import Coordinator
 from .day_and_time_slot import DayAndTimeSlot, TimeSlot
 from .enrollment_test import EnrollmentTest, EnrollmentTestQuestion, EnrollmentTestQuestionOption, EnrollmentTestResult
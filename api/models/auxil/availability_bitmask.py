@@ -0,0 +1,60 @@
+"""Compact encoding of weekly availability: one bit per day and time slot.
+
+Bit number is `day_of_week_index * len(TIME_SLOTS) + <index of time slot in TIME_SLOTS>`,
+so two availabilities overlap if and only if their bitwise AND is not zero.
+"""
+
+import datetime
+from collections.abc import Iterable, Iterator
+from typing import TYPE_CHECKING
+
+from api.models.auxil.constants import TIME_SLOTS
+
+if TYPE_CHECKING:
+    from api.models.day_and_time_slot import DayAndTimeSlot
+
+
+class AvailabilityBitmask:
+    BIT_COUNT = 7 * len(TIME_SLOTS)
+
+    @staticmethod
+    def get_bit_number(day_of_week_index: int, time: datetime.time) -> int | None:
+        """Return the number of the bit of the time slot containing `time` on the given day, if there is one."""
+        for slot_index, (hour_from, hour_to) in enumerate(TIME_SLOTS):
+            if hour_from <= time.hour < hour_to:
+                return day_of_week_index * len(TIME_SLOTS) + slot_index
+        return None
+
+    @staticmethod
+    def get_day_of_week_index(bit_number: int) -> int:
+        return bit_number // len(TIME_SLOTS)
+
+    @classmethod
+    def get_bit(cls, day_of_week_index: int, time: datetime.time) -> int:
+        """Return the bit of the time slot containing `time` on the given day.
+
+        Times outside the pre-populated time slots have no bit (0 is returned).
+        """
+        bit_number = cls.get_bit_number(day_of_week_index, time)
+        return 0 if bit_number is None else 1 << bit_number
+
+    @staticmethod
+    def iterate_bit_numbers(bitmask: int) -> Iterator[int]:
+        """Iterate over numbers of set bits in ascending order, i.e. by day and then by time."""
+        while bitmask:
+            lowest_bit = bitmask & -bitmask
+            yield lowest_bit.bit_length() - 1
+            bitmask ^= lowest_bit
+
+    @classmethod
+    def from_day_times(cls, day_times: Iterable[tuple[int, datetime.time]]) -> int:
+        """Encode pairs of (day of week index, time)."""
+        bitmask = 0
+        for day_of_week_index, time in day_times:
+            bitmask |= cls.get_bit(day_of_week_index, time)
+        return bitmask
+
+    @classmethod
+    def from_slots(cls, slots: Iterable["DayAndTimeSlot"]) -> int:
+        """Encode day and time slots.  Use `select_related("time_slot")` to avoid extra queries."""
+        return cls.from_day_times((slot.day_of_week_index, slot.time_slot.from_utc_hour) for slot in slots)
@@ -1,11 +1,14 @@
 import datetime
+from collections import defaultdict
+from collections.abc import Collection
+from typing import Any
 
 from django.db import models
 from django.utils import timezone
 
+from alerts.utils import mark_objects_dirty
 from api.models import Coordinator, Group, Student, Teacher
 from api.models.choices.status import (
-    CoordinatorProjectStatus,
     GroupProjectStatus,
     GroupSituationalStatus,
     ProjectStatus,
@@ -36,30 +39,72 @@ class StatusSetter:
     ) -> None:
         """Set statuses, `status_since` to given time or current time in UTC, save object.
 
+        Only the status fields are written, unless the object has not been saved yet.
+
         Note:
             Pass a datetime object as `status_since` to have identical timestamps
             for multiple log events.
         """
+        update_fields = ["status_since"]
         if project_status:
             obj.project_status = project_status
+            update_fields.append("project_status")
         if situational_status:
             obj.situational_status = situational_status
+            update_fields.append("situational_status")
         obj.status_since = status_since or timezone.now()
-        obj.save()
+        obj.save(update_fields=None if obj._state.adding else update_fields)
+        mark_objects_dirty(type(obj), [obj.pk])
 
     @staticmethod
-    def update_statuses_of_active_coordinators(timestamp: datetime.datetime) -> None:
-        coordinators = Coordinator.objects.filter_active()
+    def set_statuses(
+        objs: "Collection[Group] | Collection[Person]",
+        project_status: ProjectStatus | None = None,
+        situational_status: SituationalStatus | None = None,
+        status_since: datetime.datetime | None = None,
+    ) -> None:
+        """Set the same statuses to many saved objects of one model with a single UPDATE.
 
-        coordinators.filter_below_threshold().update(
-            project_status=CoordinatorProjectStatus.WORKING_BELOW_THRESHOLD, status_since=timestamp
-        )
-        coordinators.filter_above_threshold_and_within_limit().update(
-            project_status=CoordinatorProjectStatus.WORKING_OK, status_since=timestamp
-        )
-        coordinators.filter_limit_reached().update(
-            project_status=CoordinatorProjectStatus.WORKING_LIMIT_REACHED, status_since=timestamp
-        )
+        Objects are updated in memory too.  Unlike `set_status`, `save()` is not called.
+        """
+        if not objs:
+            return
+        fields: dict[str, Any] = {"status_since": status_since or timezone.now()}
+        if project_status:
+            fields["project_status"] = project_status
+        if situational_status:
+            fields["situational_status"] = situational_status
+        for obj in objs:
+            for name, value in fields.items():
+                setattr(obj, name, value)
+
+        model = type(next(iter(objs)))
+        ids = [obj.pk for obj in objs]
+        model.objects.filter(pk__in=ids).update(**fields)  # type: ignore[attr-defined]
+        mark_objects_dirty(model, ids)
+
+    @staticmethod
+    def update_statuses_of_coordinators(
+        coordinators: "models.QuerySet[Coordinator]", timestamp: datetime.datetime
+    ) -> None:
+        """Recalculate project statuses of given coordinators that are active, based on their group counts.
+
+        Pass coordinators of the groups that were changed: group counts of other coordinators stay the same.
+        Only coordinators whose status actually changes are written.
+        """
+        changed_ids: dict[str, list[int]] = defaultdict(list)
+        for coordinator_id, project_status in (
+            Coordinator.objects.filter_active()
+            .filter(pk__in=coordinators.values("pk"))
+            .annotate_with_project_status_by_group_count()
+            .exclude(project_status=models.F("project_status_by_group_count"))
+            .values_list("pk", "project_status_by_group_count")
+        ):
+            changed_ids[project_status].append(coordinator_id)
+
+        for project_status, ids in changed_ids.items():
+            Coordinator.objects.filter(pk__in=ids).update(project_status=project_status, status_since=timestamp)
+            mark_objects_dirty(Coordinator, ids)
 
     @classmethod
     def update_related_statuses_for_group(cls, group: Group, timestamp: datetime.datetime) -> None:
@@ -80,59 +125,65 @@ class StatusSetter:
     def _recalculate_teacher_situational_statuses(
         cls, teachers: "models.QuerySet[Teacher]", timestamp: datetime.datetime
     ) -> None:
-        teachers = teachers.prefetch_related("groups")
-        updates: dict[TeacherSituationalStatus | str, list[int]] = {}
-
-        for teacher in teachers:
-            current = teacher.situational_status or ""
-            if current in cls._TEACHER_HIGH_PRIORITY:
-                new_status: TeacherSituationalStatus | str = current
-            else:
-                groups = list(teacher.groups.all())
-                has_holiday = any(g.situational_status == GroupSituationalStatus.HOLIDAY for g in groups)
-                has_awaiting_start = any(g.project_status == GroupProjectStatus.AWAITING_START for g in groups)
-                has_pending = any(g.project_status == GroupProjectStatus.PENDING for g in groups)
-                if has_holiday:
-                    new_status = TeacherSituationalStatus.HOLIDAY
-                elif has_awaiting_start:
-                    new_status = TeacherSituationalStatus.AWAITING_START
-                elif has_pending:
-                    new_status = TeacherSituationalStatus.GROUP_OFFERED
-                else:
-                    new_status = ""
-
-            if new_status != current:
-                updates.setdefault(new_status, []).append(teacher.pk)
-
-        for status_value, ids in updates.items():
-            Teacher.objects.filter(pk__in=ids).update(situational_status=status_value, status_since=timestamp)
+        groups = Group.objects.filter(teachers=models.OuterRef("pk"))
+        new_status = models.Case(
+            models.When(situational_status__in=cls._TEACHER_HIGH_PRIORITY, then=models.F("situational_status")),
+            models.When(
+                models.Exists(groups.filter(situational_status=GroupSituationalStatus.HOLIDAY)),
+                then=models.Value(TeacherSituationalStatus.HOLIDAY),
+            ),
+            models.When(
+                models.Exists(groups.filter(project_status=GroupProjectStatus.AWAITING_START)),
+                then=models.Value(TeacherSituationalStatus.AWAITING_START),
+            ),
+            models.When(
+                models.Exists(groups.filter(project_status=GroupProjectStatus.PENDING)),
+                then=models.Value(TeacherSituationalStatus.GROUP_OFFERED),
+            ),
+            default=models.Value(""),
+        )
+        cls._update_situational_statuses(Teacher, teachers, new_status, timestamp)
 
     @classmethod
     def _recalculate_student_situational_statuses(
         cls, students: "models.QuerySet[Student]", timestamp: datetime.datetime
     ) -> None:
-        students = students.prefetch_related("groups")
-        updates: dict[StudentSituationalStatus | str, list[int]] = {}
-
-        for student in students:
-            current = student.situational_status or ""
-            if current in cls._STUDENT_HIGH_PRIORITY:
-                new_status: StudentSituationalStatus | str = current
-            else:
-                groups = list(student.groups.all())
-                has_holiday = any(g.situational_status == GroupSituationalStatus.HOLIDAY for g in groups)
-                has_awaiting_start = any(g.project_status == GroupProjectStatus.AWAITING_START for g in groups)
-                if has_holiday:
-                    new_status = StudentSituationalStatus.HOLIDAY
-                elif has_awaiting_start:
-                    new_status = StudentSituationalStatus.AWAITING_START
-                elif current == StudentSituationalStatus.GROUP_OFFERED and groups:
-                    new_status = StudentSituationalStatus.GROUP_OFFERED
-                else:
-                    new_status = ""
-
-            if new_status != current:
-                updates.setdefault(new_status, []).append(student.pk)
-
-        for status_value, ids in updates.items():
-            Student.objects.filter(pk__in=ids).update(situational_status=status_value, status_since=timestamp)
+        groups = Group.objects.filter(students=models.OuterRef("pk"))
+        new_status = models.Case(
+            models.When(situational_status__in=cls._STUDENT_HIGH_PRIORITY, then=models.F("situational_status")),
+            models.When(
+                models.Exists(groups.filter(situational_status=GroupSituationalStatus.HOLIDAY)),
+                then=models.Value(StudentSituationalStatus.HOLIDAY),
+            ),
+            models.When(
+                models.Exists(groups.filter(project_status=GroupProjectStatus.AWAITING_START)),
+                then=models.Value(StudentSituationalStatus.AWAITING_START),
+            ),
+            models.When(
+                models.Q(situational_status=StudentSituationalStatus.GROUP_OFFERED) & models.Exists(groups),
+                then=models.Value(StudentSituationalStatus.GROUP_OFFERED),
+            ),
+            default=models.Value(""),
+        )
+        cls._update_situational_statuses(Student, students, new_status, timestamp)
+
+    @staticmethod
+    def _update_situational_statuses(
+        model: type[Teacher] | type[Student],
+        people: "models.QuerySet[Teacher] | models.QuerySet[Student]",
+        new_status: models.Case,
+        timestamp: datetime.datetime,
+    ) -> None:
+        """Set situational statuses computed by the database, touching only people whose status changes.
+
+        Only primary keys of those people are read, so that they can be marked dirty for alert checks.
+        """
+        changed_ids = list(
+            people.alias(new_situational_status=new_status)
+            .exclude(situational_status=models.F("new_situational_status"))
+            .values_list("pk", flat=True)
+        )
+        if not changed_ids:
+            return
+        model.objects.filter(pk__in=changed_ids).update(situational_status=new_status, status_since=timestamp)
+        mark_objects_dirty(model, changed_ids)
@@ -0,0 +1,92 @@
+from collections.abc import Iterable
+from typing import Any
+
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from api.models.auxil.constants import DEFAULT_CHOICE_CHAR_FIELD_MAX_LENGTH
+from api.models.log_event import CoordinatorLogEvent, LogEvent, StudentLogEvent, TeacherLogEvent
+from api.models.personal_info import PersonalInfo
+
+# events of these models are about people, who may have a chat with the bot
+PERSON_LOG_EVENT_MODELS = (CoordinatorLogEvent, StudentLogEvent, TeacherLogEvent)
+GROUP_FIELDS = ("group", "from_group", "to_group")
+# after that many failed attempts a notification is kept for inspection, but not sent anymore
+MAX_SEND_ATTEMPTS = 10
+
+
+class BotNotificationQuerySet(models.QuerySet[Any]):
+    def enqueue_for_log_events(self, events: Iterable[LogEvent]) -> list["BotNotification"]:
+        """Queue notifications about saved log events for people who have a chat with the bot.
+
+        Call inside the transaction that creates the events, so that notifications are sent
+        only for changes that were committed.
+        """
+        events = [event for event in events if isinstance(event, PERSON_LOG_EVENT_MODELS)]
+        # primary key of a person is the primary key of their personal info
+        chat_ids = {
+            person_id: chat_id
+            for person_id, chat_id in PersonalInfo.objects.filter(
+                pk__in={event.object_id for event in events}
+            ).values_list("pk", "registration_telegram_bot_chat_id")
+            if chat_id is not None
+        }
+        return self.bulk_create(
+            BotNotification(
+                chat_id=chat_ids[event.object_id],
+                event_type=event.type,  # type: ignore[attr-defined]
+                payload=BotNotification.make_payload(event),
+            )
+            for event in events
+            if event.object_id in chat_ids
+        )
+
+    def filter_due(self) -> "BotNotificationQuerySet":
+        return self.filter(next_attempt_at__lte=timezone.now(), attempts__lt=MAX_SEND_ATTEMPTS)
+
+
+class BotNotification(models.Model):
+    """Notification to be sent to a chat by the bot.
+
+    Notifications are saved in the same transaction as the change they are about (transactional outbox)
+    and sent later by `api.tasks.relay_bot_notifications`, so no HTTP request is made inside the transaction.
+    Sent notifications are deleted.  Failed ones are retried with backoff up to `MAX_SEND_ATTEMPTS` times.
+    """
+
+    chat_id = models.BigIntegerField(verbose_name=_("Telegram chat ID"))
+    event_type = models.CharField(max_length=DEFAULT_CHOICE_CHAR_FIELD_MAX_LENGTH, verbose_name=_("event type"))
+    payload = models.JSONField(default=dict, verbose_name=_("payload"))
+    created_at = models.DateTimeField(default=timezone.now, verbose_name=_("created at"))
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name=_("failed attempts"))
+    next_attempt_at = models.DateTimeField(default=timezone.now, verbose_name=_("next attempt at"))
+
+    objects = BotNotificationQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = _("bot notification")
+        verbose_name_plural = _("bot notifications")
+        indexes = [
+            models.Index(
+                fields=("next_attempt_at",),
+                name="bot_notification_due_idx",
+                condition=models.Q(attempts__lt=MAX_SEND_ATTEMPTS),
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.chat_id}: {self.event_type}"
+
+    @staticmethod
+    def make_payload(event: LogEvent) -> dict[str, Any]:
+        payload = {
+            "object": event.OBJECT_FIELD,
+            "object_id": event.object_id,
+            "type": event.type,  # type: ignore[attr-defined]
+            "date_time": event.date_time.isoformat(),
+            "comment": event.comment,
+        }
+        for field_name in GROUP_FIELDS:
+            if hasattr(event, f"{field_name}_id"):
+                payload[f"{field_name}_id"] = getattr(event, f"{field_name}_id")
+        return payload
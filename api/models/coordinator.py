@@ -3,7 +3,7 @@ from typing import Any
 from django.contrib.auth.models import User
 from django.contrib.contenttypes.fields import GenericRelation
 from django.db import models
-from django.db.models import Count, OneToOneField
+from django.db.models import Case, Count, OneToOneField, Value, When
 from django.utils.translation import gettext_lazy as _
 
 from api.models.auxil.constants import (
@@ -34,6 +34,19 @@ class CoordinatorQuerySet(models.QuerySet[Any]):
         """QuerySet with coordinators that have exceeded the limit of groups."""
         return self.annotate_with_group_count().filter(group_count__gte=CoordinatorGroupLimit.MAX)
 
+    def annotate_with_project_status_by_group_count(self) -> "CoordinatorQuerySet":
+        """QuerySet with `project_status_by_group_count`: active status that matches the number of groups."""
+        return self.annotate_with_group_count().annotate(
+            project_status_by_group_count=Case(
+                When(
+                    group_count__lt=CoordinatorGroupLimit.MIN,
+                    then=Value(CoordinatorProjectStatus.WORKING_BELOW_THRESHOLD),
+                ),
+                When(group_count__lt=CoordinatorGroupLimit.MAX, then=Value(CoordinatorProjectStatus.WORKING_OK)),
+                default=Value(CoordinatorProjectStatus.WORKING_LIMIT_REACHED),
+            )
+        )
+
     def filter_active(self) -> "CoordinatorQuerySet":
         """QuerySet with Coordinators that are active."""
         return self.filter(project_status__in=CoordinatorProjectStatus.active_statuses())
@@ -1,8 +1,11 @@
+from typing import Any
+
 from django.contrib.contenttypes.fields import GenericRelation
 from django.db import models
 from django.db.models import Count, Q, QuerySet
 from django.utils.translation import gettext_lazy as _
 
+from api.models.auxil.availability_bitmask import AvailabilityBitmask
 from api.models.auxil.constants import DEFAULT_CHOICE_CHAR_FIELD_MAX_LENGTH
 from api.models.choices.status import GroupProjectStatus, GroupSituationalStatus
 from api.models.coordinator import Coordinator
@@ -13,6 +16,9 @@ from api.models.student import Student
 from api.models.teacher import Teacher
 from api.models.teacher_under_18 import TeacherUnder18
 
+# in the order of `DayAndTimeSlot.DayOfWeek`
+WEEKDAY_FIELD_NAMES = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+
 
 class GroupCommon(GroupOrPerson):
     """Abstract model for attributes shared by regular groups and speaking clubs."""
@@ -109,6 +115,12 @@ class Group(GroupCommon):
     friday = models.TimeField(null=True, blank=True, verbose_name=_("Friday"))
     saturday = models.TimeField(null=True, blank=True, verbose_name=_("Saturday"))
     sunday = models.TimeField(null=True, blank=True, verbose_name=_("Sunday"))
+    schedule_bitmask = models.PositiveBigIntegerField(
+        default=0,
+        editable=False,
+        verbose_name=_("schedule bitmask"),
+        help_text=_("lesson times encoded the same way as availability of students and teachers"),
+    )
 
     alerts = GenericRelation(
         "alerts.Alert",
@@ -141,6 +153,13 @@ class Group(GroupCommon):
             models.Index(fields=("start_date",), name="group_start_date_idx"),
         ]
 
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        self.schedule_bitmask = self.get_schedule_bitmask()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and not set(update_fields).isdisjoint(WEEKDAY_FIELD_NAMES):
+            kwargs["update_fields"] = {*update_fields, "schedule_bitmask"}
+        super().save(*args, **kwargs)
+
     def __str__(self) -> str:
         coordinator_ids = ", ".join(str(c.personal_info.pk) for c in self.coordinators.all())
         return f"{self.pk}: {self.language_and_level}, CID: {coordinator_ids}"
@@ -154,6 +173,14 @@ class Group(GroupCommon):
     def teachers_with_no_other_groups(self) -> QuerySet[Teacher]:
         return self._teachers_group_count_annotation().filter(group_count__lte=1)
 
+    def get_schedule_bitmask(self) -> int:
+        """Encode lesson times from the weekday fields with `AvailabilityBitmask`."""
+        return AvailabilityBitmask.from_day_times(
+            (day_of_week_index, lesson_time)
+            for day_of_week_index, field_name in enumerate(WEEKDAY_FIELD_NAMES)
+            if (lesson_time := getattr(self, field_name)) is not None
+        )
+
 
 class SpeakingClub(GroupCommon):
     """Model for a speaking club (a group without any changing status or fixed schedule)."""
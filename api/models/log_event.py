@@ -1,4 +1,8 @@
-from django.db import models
+from collections.abc import Collection, Iterable
+from typing import Any, ClassVar, cast
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import connections, models
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
@@ -19,6 +23,10 @@ from api.models.teacher_under_18 import TeacherUnder18
 # We could have created one table listing all possible names of log events, but that might look
 # confusing for admin users later on.  It seems more convenient for them to have separate tables.
 
+# Log tables only grow, so every one of them has two composite indexes:
+# (object, -date_time) for the event history of an object and
+# (object, type, -date_time) for "the latest event of a type", which alerts and status checks look up.
+
 
 class LogEvent(models.Model):
     """Abstract model for some sort of internal event.
@@ -33,9 +41,22 @@ class LogEvent(models.Model):
     comment = models.TextField(verbose_name=_("comment"))
     date_time = models.DateTimeField(default=timezone.now, verbose_name=_("date and time"))
 
+    # foreign key to the object the event is about, see `LatestLogEvent`
+    OBJECT_FIELD: ClassVar[str]
+
     class Meta:
         abstract = True
 
+    @classmethod
+    def get_object_content_type(cls) -> ContentType:
+        return ContentType.objects.get_for_model(
+            cast(type[models.Model], cls._meta.get_field(cls.OBJECT_FIELD).related_model)
+        )
+
+    @property
+    def object_id(self) -> int:
+        return getattr(self, f"{self.OBJECT_FIELD}_id")
+
     @property
     def date_as_str(self) -> str:
         return self.date_time.strftime("%d.%m.%Y")
@@ -61,12 +82,15 @@ class CoordinatorLogEvent(LogEvent):
         verbose_name=_("event type"),
     )
 
+    OBJECT_FIELD = "coordinator"
+
     class Meta:
         verbose_name = _("coordinator log event")
         verbose_name_plural = _("coordinator log events")
 
         indexes = [
-            models.Index(fields=("coordinator_id",), name="coordinator_id_idx"),
+            models.Index(fields=("coordinator", "-date_time"), name="coordinator_log_date_idx"),
+            models.Index(fields=("coordinator", "type", "-date_time"), name="coordinator_log_type_date_idx"),
             models.Index(fields=("type",), name="coordinator_log_event_type_idx"),
         ]
 
@@ -84,11 +108,14 @@ class GroupLogEvent(LogEvent):
         verbose_name=_("event type"),
     )
 
+    OBJECT_FIELD = "group"
+
     class Meta:
         verbose_name = _("group log event")
         verbose_name_plural = _("group log events")
         indexes = [
-            models.Index(fields=("group_id",), name="group_id_idx"),
+            models.Index(fields=("group", "-date_time"), name="group_log_date_idx"),
+            models.Index(fields=("group", "type", "-date_time"), name="group_log_type_date_idx"),
             models.Index(fields=("type",), name="group_log_event_type_idx"),
         ]
 
@@ -122,11 +149,14 @@ class StudentLogEvent(LogEvent):
         verbose_name=_("event type"),
     )
 
+    OBJECT_FIELD = "student"
+
     class Meta:
         verbose_name = _("student log event")
         verbose_name_plural = _("student log events")
         indexes = [
-            models.Index(fields=("student_id",), name="student_id_idx"),
+            models.Index(fields=("student", "-date_time"), name="student_log_date_idx"),
+            models.Index(fields=("student", "type", "-date_time"), name="student_log_type_date_idx"),
             models.Index(fields=("type",), name="student_log_event_type_idx"),
         ]
 
@@ -160,11 +190,14 @@ class TeacherLogEvent(LogEvent):
         verbose_name=_("event type"),
     )
 
+    OBJECT_FIELD = "teacher"
+
     class Meta:
         verbose_name = _("teacher log event")
         verbose_name_plural = _("teacher log events")
         indexes = [
-            models.Index(fields=("teacher_id",), name="young_teacher_id_idx"),
+            models.Index(fields=("teacher", "-date_time"), name="teacher_log_date_idx"),
+            models.Index(fields=("teacher", "type", "-date_time"), name="teacher_log_type_date_idx"),
             models.Index(fields=("type",), name="young_teach_log_event_type_idx"),
         ]
 
@@ -187,13 +220,84 @@ class TeacherUnder18LogEvent(LogEvent):
         verbose_name=_("event type"),
     )
 
+    OBJECT_FIELD = "teacher"
+
     class Meta:
         verbose_name = _("teacher under 18 log event")
         verbose_name_plural = _("teacher under 18 log events")
         indexes = [
-            models.Index(fields=("teacher_id",), name="teacher_id_idx"),
+            models.Index(fields=("teacher", "-date_time"), name="teacher18_log_date_idx"),
+            models.Index(fields=("teacher", "type", "-date_time"), name="teacher18_log_type_date_idx"),
             models.Index(fields=("type",), name="teacher_log_event_type_idx"),
         ]
 
     def __str__(self) -> str:
         return f"{self.date_as_str}: young teacher {self.teacher.personal_info.full_name} {self.get_type_display()}"
+
+
+class LatestLogEventQuerySet(models.QuerySet[Any]):
+    def record(self, events: Iterable[LogEvent]) -> None:
+        """Store saved events as the latest ones of their type, unless a later event of the type is stored already."""
+        latest_events: dict[tuple[int, int, str], LogEvent] = {}
+        for event in events:
+            key = (event.get_object_content_type().pk, event.object_id, event.type)  # type: ignore[attr-defined]
+            current = latest_events.get(key)
+            if current is None or (current.date_time, current.pk) < (event.date_time, event.pk):
+                latest_events[key] = event
+        if not latest_events:
+            return
+
+        # bulk_create(update_conflicts=True) cannot keep the later of the two rows, so the upsert is written out
+        table = self.model._meta.db_table
+        values = ", ".join(["(%s, %s, %s, %s, %s)"] * len(latest_events))
+        params = [
+            param
+            for (content_type_id, object_id, event_type), event in latest_events.items()
+            for param in (content_type_id, object_id, event_type, event.date_time, event.pk)
+        ]
+        with connections[self.db].cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} (content_type_id, object_id, type, date_time, event_id) VALUES {values} "
+                "ON CONFLICT (content_type_id, object_id, type) DO UPDATE "
+                "SET date_time = EXCLUDED.date_time, event_id = EXCLUDED.event_id "
+                f"WHERE {table}.date_time <= EXCLUDED.date_time",
+                params,
+            )
+
+    def refresh(self, log_event_model: type[LogEvent], object_ids: Collection[int]) -> None:
+        """Rebuild the latest events of given objects from their log, e.g. after events were changed or deleted."""
+        self.filter(content_type=log_event_model.get_object_content_type(), object_id__in=object_ids).delete()
+        object_field = log_event_model.OBJECT_FIELD
+        self.record(
+            log_event_model.objects.filter(**{f"{object_field}__in": object_ids})  # type: ignore[attr-defined]
+            .order_by(object_field, "type", "-date_time", "-pk")
+            .distinct(object_field, "type")
+        )
+
+
+class LatestLogEvent(models.Model):
+    """The latest log event of each type for each object.
+
+    Log tables only grow, so "when did this student last get a group offer" would otherwise
+    be looked up in the full log.  Kept up to date by `api.signals` for saved and deleted events;
+    code that creates events with `bulk_create` must call `LatestLogEvent.objects.record`.
+    """
+
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE, verbose_name=_("object type"))
+    object_id = models.PositiveIntegerField(verbose_name=_("object ID"))
+    type = models.CharField(max_length=DEFAULT_CHOICE_CHAR_FIELD_MAX_LENGTH, verbose_name=_("event type"))
+    date_time = models.DateTimeField(verbose_name=_("date and time"))
+    # primary key in the log table of the object's model
+    event_id = models.PositiveBigIntegerField(verbose_name=_("event ID"))
+
+    objects = LatestLogEventQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = _("latest log event")
+        verbose_name_plural = _("latest log events")
+        constraints = [
+            models.UniqueConstraint(fields=("content_type", "object_id", "type"), name="latest_log_event_unique"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.content_type.model} {self.object_id}: {self.type} at {self.date_time}"
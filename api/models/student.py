@@ -2,7 +2,7 @@ from typing import Any
 
 from django.contrib.contenttypes.fields import GenericRelation
 from django.db import models
-from django.db.models import Count
+from django.db.models import Count, F
 from django.urls import reverse
 from django.utils.html import format_html
 from django.utils.translation import gettext_lazy as _
@@ -29,6 +29,14 @@ class StudentQuerySet(models.QuerySet[Any]):
         """QuerySet with Students that have no groups."""
         return self.annotate_with_group_count().filter(group_count=0)
 
+    def filter_available_at_all(self, bitmask: int) -> "StudentQuerySet":
+        """QuerySet with Students available at every slot encoded in `bitmask` (see `AvailabilityBitmask`)."""
+        return self.alias(common_slots=F("availability_bitmask").bitand(bitmask)).filter(common_slots=bitmask)
+
+    def filter_available_at_any(self, bitmask: int) -> "StudentQuerySet":
+        """QuerySet with Students available at one or more slots encoded in `bitmask`."""
+        return self.alias(common_slots=F("availability_bitmask").bitand(bitmask)).filter(common_slots__gt=0)
+
 
 class Student(Person):
     """Model for a student."""
@@ -50,6 +58,12 @@ class Student(Person):
         verbose_name=_("availability slots"),
         blank=True,
     )
+    availability_bitmask = models.PositiveBigIntegerField(
+        default=0,
+        editable=False,
+        verbose_name=_("availability bitmask"),
+        help_text=_("availability slots encoded as one bit per slot, kept in sync automatically"),
+    )
     # irrelevant if student doesn't want to learn English, hence optional
     can_read_in_english = models.BooleanField(null=True, blank=True, verbose_name=_("can read in English"))
     children = models.ManyToManyField(
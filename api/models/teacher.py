@@ -3,7 +3,7 @@ from typing import Any
 
 from django.contrib.contenttypes.fields import GenericRelation
 from django.db import models
-from django.db.models import Count
+from django.db.models import Count, ExpressionWrapper, F, IntegerField
 from django.urls import reverse
 from django.utils.html import format_html
 from django.utils.translation import gettext_lazy as _
@@ -32,6 +32,46 @@ class TeacherQuerySet(models.QuerySet[Any]):
         """QuerySet with Teachers that have no groups."""
         return self.annotate_with_group_count().filter(group_count=0)
 
+    def annotate_with_free_group_capacity(self) -> "TeacherQuerySet":
+        """QuerySet with `free_group_capacity`: how many more groups every Teacher can take."""
+        return self.annotate(
+            free_group_capacity=ExpressionWrapper(
+                F("simultaneous_groups") - Count("groups", distinct=True), output_field=IntegerField()
+            )
+        )
+
+    def filter_can_take_more_groups(self) -> "TeacherQuerySet":
+        """QuerySet with Teachers that can take more groups than they already have."""
+        return self.annotate_with_free_group_capacity().filter(free_group_capacity__gt=0)
+
+    def filter_available_for_matching(self) -> "TeacherQuerySet":
+        """QuerySet with Teachers that are waiting for a group or can take one more, the longest waiting first."""
+        return (
+            self.filter(
+                project_status__in=(TeacherProjectStatus.NO_GROUP_YET, TeacherProjectStatus.WORKING),
+                situational_status="",
+            )
+            .filter_can_take_more_groups()
+            .order_by("status_since", "pk")
+        )
+
+    def prefetch_for_matching(self) -> "TeacherQuerySet":
+        """QuerySet with everything group matching reads from Teachers loaded in advance."""
+        return self.select_related("personal_info").prefetch_related(
+            "teaching_languages_and_levels__language",
+            "teaching_languages_and_levels__level",
+            "availability_slots__time_slot",
+            "student_age_ranges",
+        )
+
+    def filter_available_at_all(self, bitmask: int) -> "TeacherQuerySet":
+        """QuerySet with Teachers available at every slot encoded in `bitmask` (see `AvailabilityBitmask`)."""
+        return self.alias(common_slots=F("availability_bitmask").bitand(bitmask)).filter(common_slots=bitmask)
+
+    def filter_available_at_any(self, bitmask: int) -> "TeacherQuerySet":
+        """QuerySet with Teachers available at one or more slots encoded in `bitmask`."""
+        return self.alias(common_slots=F("availability_bitmask").bitand(bitmask)).filter(common_slots__gt=0)
+
     def filter_active(self) -> "TeacherQuerySet":
         """QuerySet with Teachers that are active."""
         return self.filter(project_status__in=TeacherProjectStatus.active_statuses())
@@ -47,6 +87,12 @@ class Teacher(TeacherCommon):
         blank=True,
     )
     availability_slots = models.ManyToManyField(DayAndTimeSlot, verbose_name=_("availability slots"))
+    availability_bitmask = models.PositiveBigIntegerField(
+        default=0,
+        editable=False,
+        verbose_name=_("availability bitmask"),
+        help_text=_("availability slots encoded as one bit per slot, kept in sync automatically"),
+    )
     has_prior_teaching_experience = models.BooleanField(
         default=False,
         help_text=_("Has the applicant already worked as a teacher before applying at Samantha Smith's Group?"),
@@ -150,7 +196,13 @@ class Teacher(TeacherCommon):
 
     @property
     def can_take_more_groups(self) -> bool:
-        """`True` if a teacher can take more groups than they already have."""
+        """`True` if a teacher can take more groups than they already have.
+
+        Uses `free_group_capacity` if the teacher was loaded with `annotate_with_free_group_capacity`.
+        """
+        free_group_capacity = getattr(self, "free_group_capacity", None)
+        if free_group_capacity is not None:
+            return free_group_capacity > 0
         return self.groups.count() < self.simultaneous_groups
 
     @property
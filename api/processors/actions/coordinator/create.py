@@ -1,5 +1,3 @@
-from django.db import transaction
-
 from api.models import Coordinator
 from api.models.choices.log_event_type import CoordinatorLogEventType
 from api.models.log_event import CoordinatorLogEvent
@@ -10,12 +8,13 @@ class CoordinatorCreateProcessor(CoordinatorActionProcessor):
     def __init__(self, coordinator: Coordinator):
         super().__init__(coordinator)
 
-    @transaction.atomic
-    def process(self) -> None:
+    def _process(self) -> None:
         self._create_log_events()
 
     def _set_statuses(self) -> None:
         pass
 
     def _create_log_events(self) -> None:
-        CoordinatorLogEvent.objects.create(coordinator=self.coordinator, type=CoordinatorLogEventType.APPLIED)
+        self.log_event_writer.add(
+            [CoordinatorLogEvent(coordinator=self.coordinator, type=CoordinatorLogEventType.APPLIED)]
+        )
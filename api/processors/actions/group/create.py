@@ -1,5 +1,3 @@
-from django.db import transaction
-
 from api.models.auxil.status_setter import StatusSetter
 from api.models.choices.log_event_type import GroupLogEventType, StudentLogEventType, TeacherLogEventType
 from api.models.choices.status import GroupProjectStatus
@@ -8,8 +6,7 @@ from api.processors.auxil.log_event_creator import GroupLogEventCreator
 
 
 class GroupCreateProcessor(GroupActionProcessor):
-    @transaction.atomic
-    def process(self) -> None:
+    def _process(self) -> None:
         self._set_statuses()
         self._create_log_events()
 
@@ -20,13 +17,14 @@ class GroupCreateProcessor(GroupActionProcessor):
             teacher_log_event_type=TeacherLogEventType.GROUP_OFFERED,
             group_log_event_type=GroupLogEventType.FORMED,
             to_group=self.group,
+            writer=self.log_event_writer,
         )
 
     def _set_group_status(self) -> None:
         StatusSetter.set_status(obj=self.group, project_status=GroupProjectStatus.PENDING, status_since=self.timestamp)
 
     def _set_coordinators_status(self) -> None:
-        StatusSetter.update_statuses_of_active_coordinators(self.timestamp)
+        StatusSetter.update_statuses_of_coordinators(self.group.coordinators.all(), self.timestamp)
 
     def _set_teachers_status(self) -> None:
         pass
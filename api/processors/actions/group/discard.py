@@ -1,12 +1,11 @@
-from django.db import transaction
 from django.db.models import Count
 
-from api.models import Group, Student, Teacher
+from api.models import Coordinator, Group, Student, Teacher
 from api.models.auxil.status_setter import StatusSetter
 from api.models.choices.log_event_type import StudentLogEventType, TeacherLogEventType
 from api.models.choices.status import StudentProjectStatus, TeacherProjectStatus
 from api.processors.actions.group import GroupActionProcessor
-from api.processors.auxil.log_event_creator import GroupLogEventCreator
+from api.processors.auxil.log_event_creator import GroupLogEventCreator, GroupMembers
 
 
 class GroupDiscardProcessor(GroupActionProcessor):
@@ -14,23 +13,23 @@ class GroupDiscardProcessor(GroupActionProcessor):
         self.reason = reason
         super().__init__(group)
 
-    @transaction.atomic
-    def process(self) -> None:
-        teachers = list(self.group.teachers.all())
-        students = list(self.group.students.all())
-        coordinators = list(self.group.coordinators.all())
+    def _process(self) -> None:
+        # members are remembered before the group is deleted
+        self.members = GroupMembers.load(self.group)
 
         self._set_statuses()
         self._create_log_events()
         self._delete()
 
         timestamp = self.timestamp
-        if coordinators:
-            StatusSetter.update_statuses_of_active_coordinators(timestamp)
-        if teachers or students:
+        if self.members.coordinator_ids:
+            StatusSetter.update_statuses_of_coordinators(
+                Coordinator.objects.filter(pk__in=self.members.coordinator_ids), timestamp
+            )
+        if self.members.teacher_ids or self.members.student_ids:
             StatusSetter.update_related_statuses_for_people(
-                teachers=Teacher.objects.filter(pk__in=[t.pk for t in teachers]),
-                students=Student.objects.filter(pk__in=[s.pk for s in students]),
+                teachers=Teacher.objects.filter(pk__in=self.members.teacher_ids),
+                students=Student.objects.filter(pk__in=self.members.student_ids),
                 timestamp=timestamp,
             )
 
@@ -41,6 +40,8 @@ class GroupDiscardProcessor(GroupActionProcessor):
             student_log_event_type=StudentLogEventType.TENTATIVE_GROUP_DISCARDED,
             teacher_log_event_type=TeacherLogEventType.TENTATIVE_GROUP_DISCARDED,
             comment=self.reason,
+            members=self.members,
+            writer=self.log_event_writer,
         )
 
     def _delete(self) -> None:
@@ -50,7 +51,7 @@ class GroupDiscardProcessor(GroupActionProcessor):
         pass
 
     def _set_coordinators_status(self) -> None:
-        StatusSetter.update_statuses_of_active_coordinators(self.timestamp)
+        StatusSetter.update_statuses_of_coordinators(self.group.coordinators.all(), self.timestamp)
 
     def _set_teachers_status(self) -> None:
         self.group.teachers_with_other_groups().update(
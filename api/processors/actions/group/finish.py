@@ -1,4 +1,3 @@
-from django.db import transaction
 from django.db.models import Count
 
 from api.models import Student
@@ -15,8 +14,7 @@ from api.processors.auxil.log_event_creator import GroupLogEventCreator
 
 
 class GroupFinishProcessor(GroupActionProcessor):
-    @transaction.atomic
-    def process(self) -> None:
+    def _process(self) -> None:
         self._set_statuses()
         self._create_log_events()
         self._move_related_people_to_former()
@@ -29,10 +27,11 @@ class GroupFinishProcessor(GroupActionProcessor):
             coordinator_log_event_type=CoordinatorLogEventType.GROUP_FINISHED,
             group_log_event_type=GroupLogEventType.FINISHED,
             from_group=self.group,
+            writer=self.log_event_writer,
         )
 
     def _set_coordinators_status(self) -> None:
-        StatusSetter.update_statuses_of_active_coordinators(self.timestamp)
+        StatusSetter.update_statuses_of_coordinators(self.group.coordinators.all(), self.timestamp)
 
     def _set_group_status(self) -> None:
         StatusSetter.set_status(obj=self.group, project_status=GroupProjectStatus.FINISHED, status_since=self.timestamp)
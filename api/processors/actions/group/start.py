@@ -18,10 +18,11 @@ class GroupStartProcessor(GroupActionProcessor):
             teacher_log_event_type=TeacherLogEventType.STUDY_START,
             coordinator_log_event_type=CoordinatorLogEventType.TOOK_NEW_GROUP,
             group_log_event_type=GroupLogEventType.STARTED,
+            writer=self.log_event_writer,
         )
 
     def _set_coordinators_status(self) -> None:
-        StatusSetter.update_statuses_of_active_coordinators(self.timestamp)
+        StatusSetter.update_statuses_of_coordinators(self.group.coordinators.all(), self.timestamp)
 
     def _set_group_status(self) -> None:
         StatusSetter.set_status(obj=self.group, project_status=GroupProjectStatus.WORKING, status_since=self.timestamp)
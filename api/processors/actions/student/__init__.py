@@ -1,18 +1,29 @@
 import abc
 
+from django.conf import settings
 from django.db import transaction
 from django.utils import timezone
 
 from api.models import Student
+from api.models.bot_notification import BotNotification
+from api.processors.auxil.log_event_writer import LogEventWriter
+from api.tasks import match_new_student
 
 
 class StudentActionProcessor(abc.ABC):
     def __init__(self, student: Student):
         self.student = student
         self.timestamp = timezone.now()
+        self.log_event_writer = LogEventWriter()
 
     @transaction.atomic
     def process(self) -> None:
+        self._process()
+        # log events are collected by `_create_log_events` and written together at the end of the transaction
+        log_events = self.log_event_writer.flush()
+        BotNotification.objects.enqueue_for_log_events(log_events)
+
+    def _process(self) -> None:
         self._create_log_events()
         self._set_statuses()
 
@@ -23,3 +34,9 @@ class StudentActionProcessor(abc.ABC):
     @abc.abstractmethod
     def _set_statuses(self) -> None:
         pass
+
+    def _schedule_matching(self) -> None:
+        """Try to offer a group to the student right after the transaction is committed."""
+        if settings.INCREMENTAL_MATCHING_ENABLED:
+            student_id = self.student.pk
+            transaction.on_commit(lambda: match_new_student.delay(student_id))
@@ -1,5 +1,3 @@
-from django.db import transaction
-
 from api.models import Coordinator, Group, Student
 from api.models.choices.log_event_type import CoordinatorLogEventType, StudentLogEventType
 from api.models.choices.status import StudentProjectStatus
@@ -15,8 +13,7 @@ class StudentAcceptedOfferedGroupProcessor(StudentActionProcessor):
         self.group = group
         super().__init__(student)
 
-    @transaction.atomic
-    def process(self) -> None:
+    def _process(self) -> None:
         self._create_log_events()
         self._set_statuses()
 
@@ -27,9 +24,13 @@ class StudentAcceptedOfferedGroupProcessor(StudentActionProcessor):
         self.student.save()
 
     def _create_log_events(self) -> None:
-        StudentLogEvent.objects.create(student=self.student, to_group=self.group, type=StudentLogEventType.STUDY_START)
-        CoordinatorLogEvent.objects.create(
-            coordinator=self.coordinator,
-            group=self.group,
-            type=CoordinatorLogEventType.ADDED_STUDENT_TO_EXISTING_GROUP,
+        self.log_event_writer.add(
+            [
+                StudentLogEvent(student=self.student, to_group=self.group, type=StudentLogEventType.STUDY_START),
+                CoordinatorLogEvent(
+                    coordinator=self.coordinator,
+                    group=self.group,
+                    type=CoordinatorLogEventType.ADDED_STUDENT_TO_EXISTING_GROUP,
+                ),
+            ]
         )
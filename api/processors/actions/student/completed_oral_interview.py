@@ -1,5 +1,3 @@
-from django.db import transaction
-
 from api.models import Student
 from api.models.choices.log_event_type import StudentLogEventType
 from api.models.choices.status.project import StudentProjectStatus
@@ -14,8 +12,7 @@ class StudentCompletedOralInterviewProcessor(StudentActionProcessor):
         self.language_and_level = language_and_level
         super().__init__(student)
 
-    @transaction.atomic
-    def process(self) -> None:
+    def _process(self) -> None:
         self._add_language_and_level()
         self._set_statuses()
         self._create_log_events()
@@ -30,7 +27,12 @@ class StudentCompletedOralInterviewProcessor(StudentActionProcessor):
         self.student.save()
 
     def _create_log_events(self) -> None:
-        StudentLogEvent.objects.create(
-            student=self.student,
-            type=StudentLogEventType.AWAITING_OFFER,
+        self.log_event_writer.add(
+            [
+                StudentLogEvent(
+                    student=self.student,
+                    type=StudentLogEventType.AWAITING_OFFER,
+                )
+            ]
         )
+        self._schedule_matching()
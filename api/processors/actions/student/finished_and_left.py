@@ -1,5 +1,3 @@
-from django.db import transaction
-
 from api.models import Student
 from api.models.choices.log_event_type import StudentLogEventType
 from api.models.choices.status import StudentProjectStatus
@@ -13,8 +11,7 @@ class StudentFinishedAndLeftProcessor(StudentActionProcessor):
     def __init__(self, student: Student):
         super().__init__(student)
 
-    @transaction.atomic
-    def process(self) -> None:
+    def _process(self) -> None:
         self._create_log_events()
         self._set_statuses()
 
@@ -24,4 +21,6 @@ class StudentFinishedAndLeftProcessor(StudentActionProcessor):
         self.student.save()
 
     def _create_log_events(self) -> None:
-        StudentLogEvent.objects.create(student=self.student, type=StudentLogEventType.FINISHED_AND_LEAVING)
+        self.log_event_writer.add(
+            [StudentLogEvent(student=self.student, type=StudentLogEventType.FINISHED_AND_LEAVING)]
+        )
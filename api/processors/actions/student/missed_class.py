@@ -1,7 +1,5 @@
 from datetime import timedelta
 
-from django.db import transaction
-
 from api.models import Group, Student
 from api.models.auxil.constants import STUDENT_CLASS_MISS_LIMIT
 from api.models.choices.log_event_type import StudentLogEventType
@@ -16,8 +14,7 @@ class StudentMissedClassProcessor(StudentActionProcessor):
         self.group = group
         super().__init__(student)
 
-    @transaction.atomic
-    def process(self) -> None:
+    def _process(self) -> None:
         self._create_log_events()
         self._set_statuses()
 
@@ -28,6 +25,9 @@ class StudentMissedClassProcessor(StudentActionProcessor):
             type=StudentLogEventType.MISSED_CLASS_SILENTLY,
             student=self.student,
         ).count()
+        # the event of this miss is saved only at the end of the transaction
+        if not self.notified:
+            student_class_misses_count += 1
         return student_class_misses_count >= STUDENT_CLASS_MISS_LIMIT
 
     def _set_statuses(self) -> None:
@@ -40,6 +40,6 @@ class StudentMissedClassProcessor(StudentActionProcessor):
         event_type = (
             StudentLogEventType.MISSED_CLASS_NOTIFIED if self.notified else StudentLogEventType.MISSED_CLASS_SILENTLY
         )
-        StudentLogEvent.objects.create(
-            student=self.student, from_group=self.group, to_group=self.group, type=event_type
+        self.log_event_writer.add(
+            [StudentLogEvent(student=self.student, from_group=self.group, to_group=self.group, type=event_type)]
         )
@@ -1,5 +1,3 @@
-from django.db import transaction
-
 from api.models import Group, Student
 from api.models.choices.log_event_type import StudentLogEventType
 from api.models.choices.status.situational import StudentSituationalStatus
@@ -12,8 +10,7 @@ class StudentOfferJoinGroupProcessor(StudentActionProcessor):
         self.to_group = to_group
         super().__init__(student)
 
-    @transaction.atomic
-    def process(self) -> None:
+    def _process(self) -> None:
         self._set_statuses()
         self._create_log_events()
 
@@ -23,8 +20,12 @@ class StudentOfferJoinGroupProcessor(StudentActionProcessor):
         self.student.save()
 
     def _create_log_events(self) -> None:
-        StudentLogEvent.objects.create(
-            student=self.student,
-            to_group=self.to_group,
-            type=StudentLogEventType.GROUP_OFFERED,
+        self.log_event_writer.add(
+            [
+                StudentLogEvent(
+                    student=self.student,
+                    to_group=self.to_group,
+                    type=StudentLogEventType.GROUP_OFFERED,
+                )
+            ]
         )
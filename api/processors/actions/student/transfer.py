@@ -1,5 +1,3 @@
-from django.db import transaction
-
 from api.models import Group, Student
 from api.models.choices.log_event_type import StudentLogEventType
 from api.models.choices.status.project import StudentProjectStatus
@@ -13,8 +11,7 @@ class StudentTransferProcessor(StudentActionProcessor):
         self.from_group = from_group
         super().__init__(student)
 
-    @transaction.atomic
-    def process(self) -> None:
+    def _process(self) -> None:
         self._transfer()
         self._set_statuses()
         self._create_log_events()
@@ -31,9 +28,13 @@ class StudentTransferProcessor(StudentActionProcessor):
         self.student.save()
 
     def _create_log_events(self) -> None:
-        StudentLogEvent.objects.create(
-            student=self.student,
-            from_group=self.from_group,
-            to_group=self.to_group,
-            type=StudentLogEventType.TRANSFERRED,
+        self.log_event_writer.add(
+            [
+                StudentLogEvent(
+                    student=self.student,
+                    from_group=self.from_group,
+                    to_group=self.to_group,
+                    type=StudentLogEventType.TRANSFERRED,
+                )
+            ]
         )
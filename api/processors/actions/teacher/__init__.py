@@ -4,15 +4,24 @@ from django.db import transaction
 from django.utils import timezone
 
 from api.models import Teacher
+from api.models.bot_notification import BotNotification
+from api.processors.auxil.log_event_writer import LogEventWriter
 
 
 class TeacherActionProcessor(abc.ABC):
     def __init__(self, teacher: Teacher):
         self.teacher = teacher
         self.timestamp = timezone.now()
+        self.log_event_writer = LogEventWriter()
 
     @transaction.atomic
     def process(self) -> None:
+        self._process()
+        # log events are collected by `_create_log_events` and written together at the end of the transaction
+        log_events = self.log_event_writer.flush()
+        BotNotification.objects.enqueue_for_log_events(log_events)
+
+    def _process(self) -> None:
         self._create_log_events()
         self._set_statuses()
 
@@ -1,5 +1,3 @@
-from django.db import transaction
-
 from api.models import Teacher
 from api.models.choices.log_event_type import TeacherLogEventType
 from api.models.log_event import TeacherLogEvent
@@ -10,12 +8,11 @@ class TeacherCreateProcessor(TeacherActionProcessor):
     def __init__(self, teacher: Teacher):
         super().__init__(teacher)
 
-    @transaction.atomic
-    def process(self) -> None:
+    def _process(self) -> None:
         self._create_log_events()
 
     def _set_statuses(self) -> None:
         pass
 
     def _create_log_events(self) -> None:
-        TeacherLogEvent.objects.create(teacher=self.teacher, type=TeacherLogEventType.REGISTERED)
+        self.log_event_writer.add([TeacherLogEvent(teacher=self.teacher, type=TeacherLogEventType.REGISTERED)])
@@ -1,7 +1,5 @@
 from datetime import timedelta
 
-from django.db import transaction
-
 from api.models import Teacher
 from api.models.choices.log_event_type import TeacherLogEventType
 from api.models.choices.status import TeacherProjectStatus
@@ -13,8 +11,7 @@ class TeacherFinishedAndLeavingProcessor(TeacherActionProcessor):
     def __init__(self, teacher: Teacher):
         super().__init__(teacher)
 
-    @transaction.atomic
-    def process(self) -> None:
+    def _process(self) -> None:
         self._check_groups()
         self._create_log_events()
         self._set_statuses()
@@ -30,13 +27,17 @@ class TeacherFinishedAndLeavingProcessor(TeacherActionProcessor):
         self.teacher.save()
 
     def _create_log_events(self) -> None:
-        TeacherLogEvent.objects.create(
-            teacher=self.teacher,
-            type=TeacherLogEventType.ACCESS_REVOKED,
-            date_time=self.timestamp - timedelta(seconds=1),
-        )
-        TeacherLogEvent.objects.create(
-            teacher=self.teacher,
-            type=TeacherLogEventType.FINISHED_AND_LEAVING,
-            date_time=self.timestamp,
+        self.log_event_writer.add(
+            [
+                TeacherLogEvent(
+                    teacher=self.teacher,
+                    type=TeacherLogEventType.ACCESS_REVOKED,
+                    date_time=self.timestamp - timedelta(seconds=1),
+                ),
+                TeacherLogEvent(
+                    teacher=self.teacher,
+                    type=TeacherLogEventType.FINISHED_AND_LEAVING,
+                    date_time=self.timestamp,
+                ),
+            ]
         )
@@ -1,5 +1,3 @@
-from django.db import transaction
-
 from api.models import Teacher
 from api.models.choices.log_event_type import TeacherLogEventType
 from api.models.choices.status.project import TeacherProjectStatus
@@ -11,8 +9,7 @@ class TeacherFinishedStudiesButStaysInProjectProcessor(TeacherActionProcessor):
     def __init__(self, teacher: Teacher):
         super().__init__(teacher)
 
-    @transaction.atomic
-    def process(self) -> None:
+    def _process(self) -> None:
         self._check_groups()
         self._create_log_events()
         self._set_statuses()
@@ -27,4 +24,6 @@ class TeacherFinishedStudiesButStaysInProjectProcessor(TeacherActionProcessor):
         self.teacher.save()
 
     def _create_log_events(self) -> None:
-        TeacherLogEvent.objects.create(teacher=self.teacher, type=TeacherLogEventType.FINISHED_AND_STAYING)
+        self.log_event_writer.add(
+            [TeacherLogEvent(teacher=self.teacher, type=TeacherLogEventType.FINISHED_AND_STAYING)]
+        )
@@ -1,5 +1,3 @@
-from django.db import transaction
-
 from api.models import Group, Teacher
 from api.models.choices.log_event_type import TeacherLogEventType
 from api.models.choices.status.project import TeacherProjectStatus
@@ -13,8 +11,7 @@ class TeacherTransferProcessor(TeacherActionProcessor):
         self.from_group = from_group
         super().__init__(teacher)
 
-    @transaction.atomic
-    def process(self) -> None:
+    def _process(self) -> None:
         self._transfer()
         self._set_statuses()
         self._create_log_events()
@@ -31,9 +28,13 @@ class TeacherTransferProcessor(TeacherActionProcessor):
         self.teacher.save()
 
     def _create_log_events(self) -> None:
-        TeacherLogEvent.objects.create(
-            teacher=self.teacher,
-            from_group=self.from_group,
-            to_group=self.to_group,
-            type=TeacherLogEventType.TRANSFERRED,
+        self.log_event_writer.add(
+            [
+                TeacherLogEvent(
+                    teacher=self.teacher,
+                    from_group=self.from_group,
+                    to_group=self.to_group,
+                    type=TeacherLogEventType.TRANSFERRED,
+                )
+            ]
         )
@@ -1,5 +1,3 @@
-from django.db import transaction
-
 from api.models import Teacher
 from api.models.choices.log_event_type import TeacherLogEventType
 from api.models.choices.status.project import TeacherProjectStatus
@@ -11,8 +9,7 @@ class TeacherWentOnLeaveProcessor(TeacherActionProcessor):
     def __init__(self, teacher: Teacher):
         super().__init__(teacher)
 
-    @transaction.atomic
-    def process(self) -> None:
+    def _process(self) -> None:
         self._create_log_events()
         self._set_statuses()
 
@@ -22,4 +19,4 @@ class TeacherWentOnLeaveProcessor(TeacherActionProcessor):
         self.teacher.save()
 
     def _create_log_events(self) -> None:
-        TeacherLogEvent.objects.create(teacher=self.teacher, type=TeacherLogEventType.GONE_ON_LEAVE)
+        self.log_event_writer.add([TeacherLogEvent(teacher=self.teacher, type=TeacherLogEventType.GONE_ON_LEAVE)])
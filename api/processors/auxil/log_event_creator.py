@@ -1,6 +1,18 @@
+from dataclasses import dataclass, field
+
+from django.contrib.postgres.expressions import ArraySubquery
 from django.db import transaction
+from django.db.models import OuterRef
 
-from api.models import Coordinator, CoordinatorLogEvent, Group, GroupLogEvent, StudentLogEvent, TeacherLogEvent
+from alerts.utils import mark_objects_dirty
+from api.models import (
+    Coordinator,
+    CoordinatorLogEvent,
+    Group,
+    GroupLogEvent,
+    StudentLogEvent,
+    TeacherLogEvent,
+)
 from api.models.auxil.constants import CoordinatorGroupLimit
 from api.models.auxil.status_setter import StatusSetter
 from api.models.choices.log_event_type import (
@@ -11,6 +23,35 @@ from api.models.choices.log_event_type import (
 )
 from api.models.choices.status import CoordinatorProjectStatus
 from api.models.choices.status.situational import CoordinatorSituationalStatusOrEmpty
+from api.models.log_event import LogEvent
+from api.processors.auxil.log_event_writer import LogEventWriter
+
+
+@dataclass
+class GroupMembers:
+    """IDs of people in a group, for writing their log events without loading them."""
+
+    coordinator_ids: list[int] = field(default_factory=list)
+    student_ids: list[int] = field(default_factory=list)
+    teacher_ids: list[int] = field(default_factory=list)
+
+    @classmethod
+    def load(cls, group: Group) -> "GroupMembers":
+        """Read IDs of all members with one query."""
+
+        def member_ids(m2m_field: str, member_field: str) -> ArraySubquery:
+            through = getattr(Group, m2m_field).through
+            return ArraySubquery(through.objects.filter(group=OuterRef("pk")).values(member_field))
+
+        return cls(
+            *Group.objects.filter(pk=group.pk)
+            .values_list(
+                member_ids("coordinators", "coordinator_id"),
+                member_ids("students", "student_id"),
+                member_ids("teachers", "teacher_id"),
+            )
+            .get()
+        )
 
 
 class GroupLogEventCreator:
@@ -24,41 +65,57 @@ class GroupLogEventCreator:
         from_group: Group | None = None,
         to_group: Group | None = None,
         comment: str = "",
+        members: GroupMembers | None = None,
+        writer: LogEventWriter | None = None,
     ) -> None:
+        """Create log events of the group and of everyone in it.
+
+        Pass `members` if IDs of the members are already known, otherwise they are read from the database.
+        Pass `writer` to only collect the events and save them later with `LogEventWriter.flush`.
+        """
+        if members is None:
+            members = GroupMembers.load(group)
+        events: list[LogEvent] = []
         if group_log_event_type is not None:
-            GroupLogEvent.objects.create(group=group, type=group_log_event_type, comment=comment)
+            events.append(GroupLogEvent(group=group, type=group_log_event_type, comment=comment))
         if coordinator_log_event_type is not None:
-            CoordinatorLogEvent.objects.bulk_create(
+            events.extend(
                 CoordinatorLogEvent(
-                    coordinator=coordinator,
+                    coordinator_id=coordinator_id,
                     group=group,
                     type=coordinator_log_event_type,
                     comment=comment,
                 )
-                for coordinator in group.coordinators.iterator()
+                for coordinator_id in members.coordinator_ids
             )
-        StudentLogEvent.objects.bulk_create(
+        events.extend(
             StudentLogEvent(
-                student=student,
+                student_id=student_id,
                 type=student_log_event_type,
                 from_group=from_group,
                 to_group=to_group,
                 comment=comment,
             )
-            for student in group.students.iterator()
+            for student_id in members.student_ids
         )
-
-        TeacherLogEvent.objects.bulk_create(
+        events.extend(
             TeacherLogEvent(
-                teacher=teacher,
+                teacher_id=teacher_id,
                 type=teacher_log_event_type,
                 from_group=from_group,
                 to_group=to_group,
                 comment=comment,
             )
-            for teacher in group.teachers.iterator()
+            for teacher_id in members.teacher_ids
         )
 
+        if writer is None:
+            writer = LogEventWriter()
+            writer.add(events)
+            writer.flush()
+        else:
+            writer.add(events)
+
 
 class CoordinatorAdminLogEventCreator:
     @staticmethod
@@ -132,6 +189,8 @@ class CoordinatorAdminLogEventCreator:
             comment=comment,
             group=group,
         )
+        # e.g. a transfer request or its cancellation changes alerts without changing statuses
+        mark_objects_dirty(Coordinator, [coordinator.pk])
         project_status, situational_status = cls._get_statuses_by_event_type(
             coordinator=coordinator,
             event_type=log_event_type,
@@ -0,0 +1,36 @@
+from collections import defaultdict
+from collections.abc import Iterable
+
+from django.contrib.contenttypes.models import ContentType
+
+from alerts.utils import mark_objects_of_content_types_dirty
+from api.models.log_event import LatestLogEvent, LogEvent
+
+
+class LogEventWriter:
+    """Collects log events of any kind and saves them together.
+
+    Events go to the database with one INSERT per log table, followed by one upsert into `LatestLogEvent`
+    and one INSERT marking objects of the events dirty for alert checks, however many events there are.
+    """
+
+    def __init__(self) -> None:
+        self._events: dict[type[LogEvent], list[LogEvent]] = defaultdict(list)
+
+    def add(self, events: Iterable[LogEvent]) -> None:
+        for event in events:
+            self._events[type(event)].append(event)
+
+    def flush(self) -> list[LogEvent]:
+        """Save collected events and forget them.  Returns saved events."""
+        saved_events: list[LogEvent] = []
+        object_ids: dict[ContentType, list[int]] = {}
+        for model, events in self._events.items():
+            saved_events.extend(model.objects.bulk_create(events))  # type: ignore[attr-defined]
+            object_ids[model.get_object_content_type()] = [event.object_id for event in events]
+        self._events.clear()
+
+        if saved_events:
+            LatestLogEvent.objects.record(saved_events)
+            mark_objects_of_content_types_dirty(object_ids)
+        return saved_events
@@ -0,0 +1,160 @@
+# DO NOT USE IN PROD, WORK IN PROGRESS
+import datetime
+import logging
+from collections.abc import Collection
+
+from django.db import transaction
+from django.utils import timezone
+
+from alerts.utils import mark_objects_dirty
+from api.models import Group, GroupLogEvent, Student, StudentLogEvent, Teacher, TeacherLogEvent
+from api.models.bot_notification import BotNotification
+from api.models.choices.log_event_type import GroupLogEventType, StudentLogEventType, TeacherLogEventType
+from api.models.choices.status import (
+    GroupProjectStatus,
+    StudentSituationalStatus,
+    TeacherSituationalStatus,
+)
+from api.models.log_event import LatestLogEvent, LogEvent
+from api.models.teacher import TeacherQuerySet
+from api.processors.services.group_builder import GroupBuilder, GroupCandidate
+from api.processors.services.group_solvers import GreedyGroupSolver, GroupSolver
+from api.processors.services.simulation import SimulationMeter, SimulationReport
+from api.processors.services.student_matching_index import StudentMatchingIndex
+
+logger = logging.getLogger(__name__)
+
+
+class BatchGroupBuilder:
+    """Builds groups for many teachers at once.
+
+    Teachers and students are loaded once, all groups are planned in memory
+    (students that were put into a planned group are not offered to the next teachers),
+    then the whole plan is saved in one transaction using bulk queries.
+    Planning is delegated to a `GroupSolver`, greedy by default.
+    """
+
+    @staticmethod
+    def create_and_save_groups(
+        teacher_ids: Collection[int] | None = None, solver: GroupSolver | None = None
+    ) -> list[Group]:
+        """Plan and save groups for given teachers or, if not specified, for all available teachers."""
+        group_candidates = BatchGroupBuilder.plan_groups(teacher_ids, solver)
+        return BatchGroupBuilder.save_groups(group_candidates)
+
+    @staticmethod
+    def plan_groups(
+        teacher_ids: Collection[int] | None = None, solver: GroupSolver | None = None
+    ) -> list[GroupCandidate]:
+        teachers = BatchGroupBuilder._get_teachers(teacher_ids)
+        student_index = StudentMatchingIndex.load()
+        return (solver or GreedyGroupSolver()).solve(teachers, student_index)
+
+    @staticmethod
+    def simulate(teacher_ids: Collection[int] | None = None, solver: GroupSolver | None = None) -> SimulationReport:
+        """Plan groups and measure the planning without saving anything."""
+        with SimulationMeter(SimulationReport()) as report:
+            report.group_candidates = BatchGroupBuilder.plan_groups(teacher_ids, solver)
+        return report
+
+    @staticmethod
+    @transaction.atomic
+    def save_groups(group_candidates: Collection[GroupCandidate]) -> list[Group]:
+        """Save planned groups.
+
+        Candidates whose teacher or students were taken by another worker since planning are skipped.
+        """
+        group_candidates = BatchGroupBuilder._claim_group_candidates(group_candidates)
+        if not group_candidates:
+            return []
+
+        timestamp = timezone.now()
+        groups = []
+        for group_candidate in group_candidates:
+            group = GroupBuilder._make_group(group_candidate)
+            group.project_status = GroupProjectStatus.PENDING
+            group.status_since = timestamp
+            # `save()` is not called by `bulk_create()`
+            group.schedule_bitmask = group.get_schedule_bitmask()
+            groups.append(group)
+        Group.objects.bulk_create(groups)
+
+        Group.teachers.through.objects.bulk_create(
+            Group.teachers.through(group_id=group.pk, teacher_id=group_candidate.teacher.pk)
+            for group, group_candidate in zip(groups, group_candidates)
+        )
+        Group.students.through.objects.bulk_create(
+            Group.students.through(group_id=group.pk, student_id=student.pk)
+            for group, group_candidate in zip(groups, group_candidates)
+            for student in group_candidate.students
+        )
+
+        teacher_ids = [group_candidate.teacher.pk for group_candidate in group_candidates]
+        student_ids = [student.pk for group_candidate in group_candidates for student in group_candidate.students]
+        Teacher.objects.filter(pk__in=teacher_ids).update(
+            situational_status=TeacherSituationalStatus.GROUP_OFFERED, status_since=timestamp
+        )
+        Student.objects.filter(pk__in=student_ids).update(
+            situational_status=StudentSituationalStatus.GROUP_OFFERED, status_since=timestamp
+        )
+        mark_objects_dirty(Teacher, teacher_ids)
+        mark_objects_dirty(Student, student_ids)
+
+        log_events = BatchGroupBuilder._create_log_events(groups, group_candidates, timestamp)
+        BotNotification.objects.enqueue_for_log_events(log_events)
+        return groups
+
+    @staticmethod
+    def _claim_group_candidates(group_candidates: Collection[GroupCandidate]) -> list[GroupCandidate]:
+        """Lock teachers and students of the candidates, return candidates that were claimed entirely."""
+        claimed_teacher_ids = GroupBuilder._claim_teachers(c.teacher for c in group_candidates)
+        claimed_student_ids = GroupBuilder._claim_students(s for c in group_candidates for s in c.students)
+        claimed_group_candidates = [
+            group_candidate
+            for group_candidate in group_candidates
+            if group_candidate.teacher.pk in claimed_teacher_ids
+            and all(student.pk in claimed_student_ids for student in group_candidate.students)
+        ]
+        if len(claimed_group_candidates) < len(group_candidates):
+            logger.warning(
+                f"{len(group_candidates) - len(claimed_group_candidates)} planned groups were skipped: "
+                "their teachers or students were taken by another worker"
+            )
+        return claimed_group_candidates
+
+    @staticmethod
+    def _get_teachers(teacher_ids: Collection[int] | None) -> TeacherQuerySet:
+        if teacher_ids is None:
+            return GroupBuilder.get_available_teachers()
+        # teachers that have been waiting longer get students first
+        return Teacher.objects.filter(pk__in=teacher_ids).order_by("status_since", "pk").prefetch_for_matching()
+
+    @staticmethod
+    def _create_log_events(
+        groups: Collection[Group], group_candidates: Collection[GroupCandidate], timestamp: datetime.datetime
+    ) -> list[LogEvent]:
+        group_log_events = GroupLogEvent.objects.bulk_create(
+            GroupLogEvent(group=group, type=GroupLogEventType.FORMED, date_time=timestamp) for group in groups
+        )
+        teacher_log_events = TeacherLogEvent.objects.bulk_create(
+            TeacherLogEvent(
+                teacher=group_candidate.teacher,
+                type=TeacherLogEventType.GROUP_OFFERED,
+                to_group=group,
+                date_time=timestamp,
+            )
+            for group, group_candidate in zip(groups, group_candidates)
+        )
+        student_log_events = StudentLogEvent.objects.bulk_create(
+            StudentLogEvent(
+                student=student,
+                type=StudentLogEventType.GROUP_OFFERED,
+                to_group=group,
+                date_time=timestamp,
+            )
+            for group, group_candidate in zip(groups, group_candidates)
+            for student in group_candidate.students
+        )
+        log_events = [*group_log_events, *teacher_log_events, *student_log_events]
+        LatestLogEvent.objects.record(log_events)
+        return log_events
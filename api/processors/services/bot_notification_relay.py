@@ -0,0 +1,131 @@
+import datetime
+import json
+import logging
+import urllib.request
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from api.models.bot_notification import MAX_SEND_ATTEMPTS, BotNotification
+
+logger = logging.getLogger(__name__)
+
+
+class BotNotificationRelay:
+    """Sends queued `BotNotification`s to the bot webhook.
+
+    Notifications for the same chat are sent in one request, so a person whose group changed
+    several times since the last run gets one message.
+    """
+
+    BATCH_SIZE = 500
+    # delay before the next attempt doubles after every failure, up to the maximum
+    RETRY_DELAY = datetime.timedelta(seconds=30)
+    MAX_RETRY_DELAY = datetime.timedelta(hours=6)
+    # claimed notifications are not given to other relays for that long
+    CLAIM_TIMEOUT = datetime.timedelta(minutes=10)
+
+    @classmethod
+    def relay(cls, max_batches: int = 20) -> int:
+        """Send due notifications batch by batch until there are none left.  Returns number of sent notifications."""
+        if not settings.BOT_WEBHOOK_URL:
+            logger.warning("BOT_WEBHOOK_URL is not set, bot notifications are not sent")
+            return 0
+
+        sent_count = 0
+        for _ in range(max_batches):
+            sent_in_batch, batch_size = cls._relay_batch()
+            sent_count += sent_in_batch
+            if batch_size < cls.BATCH_SIZE:
+                break
+        return sent_count
+
+    @classmethod
+    def _relay_batch(cls) -> tuple[int, int]:
+        notifications, claim_expires_at = cls._claim_batch()
+        notifications_by_chat: dict[int, list[BotNotification]] = defaultdict(list)
+        for notification in notifications:
+            notifications_by_chat[notification.chat_id].append(notification)
+
+        sent_ids: list[int] = []
+        failed: list[BotNotification] = []
+        # results are saved even if sending is interrupted, so that notifications already sent are not sent again
+        try:
+            for chat_id, chat_notifications in notifications_by_chat.items():
+                # if the claim could expire while waiting for an answer, another relay might send the rest too
+                if timezone.now() + cls._get_request_timeout() >= claim_expires_at:
+                    break
+                chat_notifications.sort(key=lambda notification: (notification.created_at, notification.pk))
+                if cls._post(chat_id, chat_notifications):
+                    sent_ids.extend(notification.pk for notification in chat_notifications)
+                else:
+                    failed.extend(chat_notifications)
+        finally:
+            BotNotification.objects.filter(pk__in=sent_ids).delete()
+            cls._schedule_retries(failed)
+            tried_ids = {*sent_ids, *(notification.pk for notification in failed)}
+            cls._release([notification for notification in notifications if notification.pk not in tried_ids])
+        return len(sent_ids), len(notifications)
+
+    @classmethod
+    @transaction.atomic
+    def _claim_batch(cls) -> tuple[list[BotNotification], datetime.datetime]:
+        """Take due notifications for sending.  Returns them and the time until which they are taken.
+
+        Notifications are postponed by `CLAIM_TIMEOUT` in the same short transaction that locks them,
+        so other relays skip them while they are sent, but no lock is held during HTTP requests.
+        """
+        # rows locked by another relay are skipped, so relays running at the same time do not claim the same rows
+        notifications = list(
+            BotNotification.objects.filter_due()
+            .order_by("next_attempt_at", "pk")
+            .select_for_update(skip_locked=True)[: cls.BATCH_SIZE]
+        )
+        claim_expires_at = timezone.now() + cls.CLAIM_TIMEOUT
+        BotNotification.objects.filter(pk__in=[notification.pk for notification in notifications]).update(
+            next_attempt_at=claim_expires_at
+        )
+        return notifications, claim_expires_at
+
+    @staticmethod
+    def _release(notifications: list[BotNotification]) -> None:
+        """Make claimed notifications that were not tried to send due again, without counting an attempt."""
+        if notifications:
+            BotNotification.objects.filter(pk__in=[notification.pk for notification in notifications]).update(
+                next_attempt_at=timezone.now()
+            )
+
+    @staticmethod
+    def _get_request_timeout() -> datetime.timedelta:
+        return datetime.timedelta(seconds=settings.BOT_WEBHOOK_TIMEOUT_SECONDS)
+
+    @staticmethod
+    def _post(chat_id: int, notifications: list[BotNotification]) -> bool:
+        body = json.dumps(
+            {"chat_id": chat_id, "notifications": [notification.payload for notification in notifications]}
+        ).encode()
+        request = urllib.request.Request(
+            settings.BOT_WEBHOOK_URL, data=body, headers={"Content-Type": "application/json"}, method="POST"
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=settings.BOT_WEBHOOK_TIMEOUT_SECONDS):
+                return True
+        # besides network errors, e.g. `http.client.HTTPException` on a malformed answer: any failure of one request
+        # must not stop sending to other chats
+        except Exception:
+            logger.exception(f"Failed to send {len(notifications)} notifications to chat {chat_id}")
+            return False
+
+    @classmethod
+    def _schedule_retries(cls, notifications: list[BotNotification]) -> None:
+        now = timezone.now()
+        for notification in notifications:
+            notification.attempts += 1
+            notification.next_attempt_at = now + min(
+                cls.RETRY_DELAY * 2 ** (notification.attempts - 1), cls.MAX_RETRY_DELAY
+            )
+            if notification.attempts == MAX_SEND_ATTEMPTS:
+                logger.error(f"Giving up sending notification {notification.pk} to chat {notification.chat_id}")
+        BotNotification.objects.bulk_update(notifications, ["attempts", "next_attempt_at"])
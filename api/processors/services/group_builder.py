@@ -1,38 +1,47 @@
 # DO NOT USE IN PROD, WORK IN PROGRESS
 import functools
-import itertools
 import logging
+import time as time_module
 from collections.abc import Collection, Iterable, Iterator
 from dataclasses import dataclass
 from datetime import time, timedelta
 
+from django.db import transaction
 from django.utils import timezone
 
 from api.models import AgeRange, Group, Student, Teacher
+from api.models.auxil.availability_bitmask import AvailabilityBitmask
 from api.models.auxil.constants import (
     DEFAULT_LESSON_DURATION_MIN,
     MAX_AGE_KIDS_GROUP,
     MAX_AGE_TEEN_GROUP,
-    MIN_DAYS_BETWEEN_LESSONS,
 )
 from api.models.auxil.status_setter import StatusSetter
+from api.models.bot_notification import BotNotification
 from api.models.choices.communication_language_mode import CommunicationLanguageMode
 from api.models.choices.log_event_type import GroupLogEventType, StudentLogEventType, TeacherLogEventType
 from api.models.choices.status import (
     GroupProjectStatus,
     StudentProjectStatus,
     StudentSituationalStatus,
-    TeacherProjectStatus,
     TeacherSituationalStatus,
 )
 from api.models.day_and_time_slot import DayAndTimeSlot
 from api.models.language_and_level import LanguageAndLevel
-from api.processors.auxil.log_event_creator import GroupLogEventCreator
+from api.models.teacher import TeacherQuerySet
+from api.processors.auxil.log_event_creator import GroupLogEventCreator, GroupMembers
+from api.processors.auxil.log_event_writer import LogEventWriter
+from api.processors.services.lesson_time_table import LessonTimeTable
+from api.processors.services.simulation import QueryCounter, SimulationMeter, SimulationReport, TeacherSearchStats
+from api.processors.services.student_matching_index import StudentMatchingIndex
 
 logger = logging.getLogger(__name__)
 
 MAX_WAITING_TIME = timedelta(weeks=4)
 LEVEL_DIFFERENCE_THRESHOLD = 2
+# with at least one free day between lessons, no more than 3 lessons fit into a week
+MIN_LESSONS_PER_WEEK = 2
+MAX_LESSONS_PER_WEEK = 3
 
 
 @dataclass
@@ -71,33 +80,34 @@ class GroupCandidate:
 
 class GroupBuilder:
     @staticmethod
-    def get_available_teachers() -> Iterator[Teacher]:
-        return filter(
-            lambda t: t.can_take_more_groups,
-            Teacher.objects.filter(
-                project_status__in=(
-                    TeacherProjectStatus.NO_GROUP_YET,
-                    TeacherProjectStatus.WORKING,
-                ),
-                situational_status="",
-            ),
-        )
+    def get_available_teachers() -> TeacherQuerySet:
+        """Teachers that can take more groups, loaded in one query plus prefetches, ready for matching."""
+        return Teacher.objects.filter_available_for_matching().prefetch_for_matching()
 
     @staticmethod
-    def create_and_save_group(teacher_id: int) -> Group | None:
-        group_candidate = GroupBuilder._get_best_group_candidate(teacher_id)
+    @transaction.atomic
+    def create_and_save_group(teacher_id: int, student_index: StudentMatchingIndex | None = None) -> Group | None:
+        """Create a group for the teacher from the best candidate, if there is one.
+
+        Pass `student_index` to reuse already loaded students between calls for several teachers.
+        """
+        if student_index is None:
+            student_index = StudentMatchingIndex.load()
+        teacher = Teacher.objects.prefetch_for_matching().get(pk=teacher_id)
+        group_candidate = GroupBuilder._find_and_claim_group_candidate(teacher, student_index)
         if group_candidate is None:
             # No suitable groups found
             # TODO: log something to the bot eventually?
             return None
 
-        datetime_kwargs = GroupBuilder._get_datetime_kwargs(group_candidate.day_time_slots)
-        group = Group(
-            language_and_level=group_candidate.language_and_level,
-            communication_language_mode=group_candidate.communication_language_mode,
-            lesson_duration_in_minutes=DEFAULT_LESSON_DURATION_MIN,
-            **datetime_kwargs,
-        )
+        group = GroupBuilder.save_group(group_candidate)
+        student_index.remove(group_candidate.students)
+        return group
+
+    @staticmethod
+    def save_group(group_candidate: GroupCandidate) -> Group:
+        """Save the candidate as a pending group and offer it to its teacher and students."""
+        group = GroupBuilder._make_group(group_candidate)
 
         group_creation_timestamp = timezone.now()
         StatusSetter.set_status(
@@ -114,16 +124,50 @@ class GroupBuilder:
             status_since=group_creation_timestamp,
         )
 
-        for student in group_candidate.students:
-            StatusSetter.set_status(
-                obj=student,
-                situational_status=StudentSituationalStatus.GROUP_OFFERED,
-                status_since=group_creation_timestamp,
-            )
-        GroupBuilder._create_log_events(group)
-        # TODO: post to bot webhook
+        StatusSetter.set_statuses(
+            group_candidate.students,
+            situational_status=StudentSituationalStatus.GROUP_OFFERED,
+            status_since=group_creation_timestamp,
+        )
+        GroupBuilder._create_log_events(group, group_candidate)
         return group
 
+    @staticmethod
+    def simulate(teacher_ids: Iterable[int]) -> SimulationReport:
+        """Find group candidates for teachers one by one the way `create_and_save_group` does, saving nothing.
+
+        Students of a found candidate are not offered to the next teachers, as in a real run.
+        """
+        with SimulationMeter(SimulationReport()) as report:
+            student_index = StudentMatchingIndex.load()
+            for teacher_id in teacher_ids:
+                start = time_module.perf_counter()
+                with QueryCounter() as query_counter:
+                    group_candidate = GroupBuilder._get_best_group_candidate(teacher_id, student_index)
+                report.teacher_stats.append(
+                    TeacherSearchStats(
+                        teacher_id=teacher_id,
+                        group_candidate=group_candidate,
+                        duration=timedelta(seconds=time_module.perf_counter() - start),
+                        query_count=query_counter.count,
+                    )
+                )
+                if group_candidate is not None:
+                    student_index.remove(group_candidate.students)
+                    report.group_candidates.append(group_candidate)
+        return report
+
+    @staticmethod
+    def _make_group(group_candidate: GroupCandidate) -> Group:
+        """Make an unsaved group with the schedule, language and level of the candidate."""
+        datetime_kwargs = GroupBuilder._get_datetime_kwargs(group_candidate.day_time_slots)
+        return Group(
+            language_and_level=group_candidate.language_and_level,
+            communication_language_mode=group_candidate.communication_language_mode,
+            lesson_duration_in_minutes=DEFAULT_LESSON_DURATION_MIN,
+            **datetime_kwargs,
+        )
+
     @staticmethod
     def _get_allowed_group_size(age_range: AgeRange) -> GroupSizeRestriction:
         if MAX_AGE_TEEN_GROUP < age_range.age_from <= age_range.age_to:
@@ -136,21 +180,87 @@ class GroupBuilder:
         raise ValueError(f"Group age range is inconsistent with boundaries: {age_range}")
 
     @staticmethod
-    def _get_best_group_candidate(teacher_id: int) -> GroupCandidate | None:
-        teacher = Teacher.objects.get(pk=teacher_id)
+    def _find_and_claim_group_candidate(
+        teacher: Teacher, student_index: StudentMatchingIndex, required_student: Student | None = None
+    ) -> GroupCandidate | None:
+        """Find the best candidate and lock its teacher and students until the end of the current transaction.
+
+        Since the index was loaded, other workers may have offered a group to some of the students
+        or may be doing it right now.  Such students are dropped from the index and the search is repeated.
+        """
+        if not GroupBuilder._claim_teachers([teacher]):
+            logger.debug(f"{teacher} is taken by another worker or is not available anymore")
+            return None
+        while (
+            group_candidate := GroupBuilder._find_best_group_candidate(teacher, student_index, required_student)
+        ) is not None:
+            claimed_student_ids = GroupBuilder._claim_students(group_candidate.students)
+            unclaimed_students = [s for s in group_candidate.students if s.pk not in claimed_student_ids]
+            if not unclaimed_students:
+                return group_candidate
+            logger.debug(f"{len(unclaimed_students)} students are taken by another worker, searching again")
+            student_index.remove(unclaimed_students)
+        return None
+
+    @staticmethod
+    def _claim_teachers(teachers: Iterable[Teacher]) -> set[int]:
+        """Lock teachers that can still be offered a group and return their ids.
+
+        Teachers locked by another transaction are skipped instead of waited for.
+        Locks are held until the end of the current transaction.
+        """
+        return set(
+            Teacher.objects.select_for_update(skip_locked=True)
+            .filter(pk__in=[teacher.pk for teacher in teachers], situational_status="")
+            .values_list("pk", flat=True)
+        )
+
+    @staticmethod
+    def _claim_students(students: Iterable[Student]) -> set[int]:
+        """Lock students that are still waiting for a group and return their ids.
+
+        Students locked by another transaction are skipped instead of waited for.
+        Locks are held until the end of the current transaction.
+        """
+        return set(
+            Student.objects.select_for_update(skip_locked=True)
+            .filter(
+                pk__in=[student.pk for student in students],
+                project_status=StudentProjectStatus.NO_GROUP_YET,
+                situational_status="",
+            )
+            .values_list("pk", flat=True)
+        )
+
+    @staticmethod
+    def _get_best_group_candidate(teacher_id: int, student_index: StudentMatchingIndex) -> GroupCandidate | None:
+        teacher = Teacher.objects.prefetch_for_matching().get(pk=teacher_id)
+        return GroupBuilder._find_best_group_candidate(teacher, student_index)
+
+    @staticmethod
+    def _find_best_group_candidate(
+        teacher: Teacher, student_index: StudentMatchingIndex, required_student: Student | None = None
+    ) -> GroupCandidate | None:
+        """Find the best candidate for a teacher loaded with `TeacherQuerySet.prefetch_for_matching`.
+
+        If `required_student` is given, only candidates with this student are considered.
+        """
         group_candidates: list[GroupCandidate] = []
 
         for language_and_level in teacher.teaching_languages_and_levels.all():
             logger.debug(language_and_level)
-            for first_time_slot, second_time_slot in GroupBuilder._iterate_lesson_times(teacher):
+            for day_time_slots in GroupBuilder._iterate_lesson_times(teacher):
                 for age_range in teacher.student_age_ranges.all():
                     group_candidate = GroupBuilder._build_group_candidate(
+                        student_index=student_index,
                         teacher=teacher,
                         age_range=age_range,
                         language_and_level=language_and_level,
-                        day_time_slots=(first_time_slot, second_time_slot),
+                        day_time_slots=day_time_slots,
                     )
-                    if group_candidate is not None:
+                    if group_candidate is None:
+                        continue
+                    if required_student is None or required_student in group_candidate.students:
                         group_candidates.append(group_candidate)
 
         if len(group_candidates) == 0:
@@ -161,6 +271,7 @@ class GroupBuilder:
 
     @staticmethod
     def _build_group_candidate(
+        student_index: StudentMatchingIndex,
         teacher: Teacher,
         age_range: AgeRange,
         language_and_level: LanguageAndLevel,
@@ -168,7 +279,7 @@ class GroupBuilder:
     ) -> GroupCandidate | None:
         restrictions = GroupBuilder._get_allowed_group_size(age_range)
         communication_language = CommunicationLanguageMode(teacher.personal_info.communication_language_mode)
-        students = GroupBuilder._get_students(
+        students = student_index.get_students(
             language_and_level=language_and_level,
             age_range=age_range,
             communication_language=communication_language,
@@ -189,50 +300,21 @@ class GroupBuilder:
         )
 
     @staticmethod
-    def _get_students(
-        language_and_level: LanguageAndLevel,
-        age_range: AgeRange,
-        communication_language: CommunicationLanguageMode,
-        day_time_slots: Iterable[DayAndTimeSlot],
-        max_students_num: int,
-    ) -> list[Student]:
-        # TODO: handle age ranges properly (add more ranges when necessary)
-        student_manager = Student.objects.filter(
-            project_status=StudentProjectStatus.NO_GROUP_YET,
-            teaching_languages_and_levels=language_and_level,
-            personal_info__communication_language_mode=communication_language,
-            age_range__age_from__gte=age_range.age_from,
-            age_range__age_to__lte=age_range.age_to,
-        )
-        for time_slot in day_time_slots:
-            student_manager = student_manager.filter(availability_slots=time_slot)
-
-        return list(student_manager.order_by("status_since")[:max_students_num])
-
-    @staticmethod
-    def _iterate_lesson_times(teacher: Teacher) -> Iterator[tuple[DayAndTimeSlot, DayAndTimeSlot]]:
+    def _iterate_lesson_times(teacher: Teacher) -> Iterator[tuple[DayAndTimeSlot, ...]]:
         """
-        Iterate over tuples of available time slots.
+        Iterate over tuples of available time slots, one slot per weekly lesson.
         There should be at least one free day between lessons.
         """
-        teacher_availability_slots = teacher.availability_slots.all()
-        for first_availability, second_availability in itertools.product(teacher_availability_slots, repeat=2):
-            if GroupBuilder._availability_slots_have_break(first_availability, second_availability):
-                yield first_availability, second_availability
-
-    @staticmethod
-    def _availability_slots_have_break(first_availability: DayAndTimeSlot, second_availability: DayAndTimeSlot) -> bool:
-        """
-        Check that second availability slot is strictly after first, but not too soon after.
-        """
-        first_day = first_availability.day_of_week_index
-        second_day = second_availability.day_of_week_index
+        slots_by_bit_number = {}
+        for slot in teacher.availability_slots.all():
+            bit_number = AvailabilityBitmask.get_bit_number(slot.day_of_week_index, slot.time_slot.from_utc_hour)
+            if bit_number is not None:
+                slots_by_bit_number[bit_number] = slot
+        availability_bitmask = sum(1 << bit_number for bit_number in slots_by_bit_number)
 
-        if first_day >= second_day:
-            return False
-
-        days_between_two_weekdays = min((second_day - first_day) % 7, (first_day - second_day) % 7)
-        return days_between_two_weekdays > MIN_DAYS_BETWEEN_LESSONS
+        lesson_count = min(max(teacher.weekly_frequency_per_group, MIN_LESSONS_PER_WEEK), MAX_LESSONS_PER_WEEK)
+        for combination in LessonTimeTable.iterate_combinations(availability_bitmask, lesson_count):
+            yield tuple(slots_by_bit_number[bit_number] for bit_number in combination)
 
     @staticmethod
     def _get_datetime_kwargs(day_time_slots: Iterable[DayAndTimeSlot]) -> dict[str, time]:
@@ -253,13 +335,20 @@ class GroupBuilder:
         return datetime_kwargs
 
     @staticmethod
-    def _create_log_events(group: Group) -> None:
+    def _create_log_events(group: Group, group_candidate: GroupCandidate) -> None:
+        log_event_writer = LogEventWriter()
         GroupLogEventCreator.create(
             group=group,
             student_log_event_type=StudentLogEventType.GROUP_OFFERED,
             teacher_log_event_type=TeacherLogEventType.GROUP_OFFERED,
             group_log_event_type=GroupLogEventType.FORMED,
+            members=GroupMembers(
+                student_ids=[student.pk for student in group_candidate.students],
+                teacher_ids=[group_candidate.teacher.pk],
+            ),
+            writer=log_event_writer,
         )
+        BotNotification.objects.enqueue_for_log_events(log_event_writer.flush())
 
     @staticmethod
     def _compare_groups_priority(group1: GroupCandidate, group2: GroupCandidate) -> int:
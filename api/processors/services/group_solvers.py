@@ -0,0 +1,346 @@
+# DO NOT USE IN PROD, WORK IN PROGRESS
+"""Backends that decide which groups to form for a pool of teachers and students."""
+
+import abc
+import datetime
+import itertools
+import logging
+import time
+from collections.abc import Collection, Iterable, Sequence
+from dataclasses import dataclass
+
+from api.models import AgeRange, Student, Teacher
+from api.models.choices.communication_language_mode import CommunicationLanguageMode
+from api.models.day_and_time_slot import DayAndTimeSlot
+from api.models.language_and_level import LanguageAndLevel
+from api.processors.services.group_builder import GroupBuilder, GroupCandidate, GroupSizeRestriction
+from api.processors.services.student_matching_index import StudentMatchingIndex
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOLVER_TIME_BUDGET = datetime.timedelta(seconds=30)
+# an option keeps at most that many candidates per seat, the longest waiting ones
+MAX_CANDIDATES_PER_SEAT = 3
+
+
+class GroupSolver(abc.ABC):
+    """Decides which groups to form.  At most one group is formed per teacher."""
+
+    @abc.abstractmethod
+    def solve(self, teachers: Iterable[Teacher], student_index: StudentMatchingIndex) -> list[GroupCandidate]:
+        """Return group candidates with disjoint sets of students.
+
+        Teachers must be loaded with `TeacherQuerySet.prefetch_for_matching`.
+        """
+
+
+class GreedyGroupSolver(GroupSolver):
+    """Takes teachers one by one and gives each the best candidate according to `GroupBuilder`."""
+
+    def solve(self, teachers: Iterable[Teacher], student_index: StudentMatchingIndex) -> list[GroupCandidate]:
+        group_candidates = []
+        for teacher in teachers:
+            group_candidate = GroupBuilder._find_best_group_candidate(teacher, student_index)
+            if group_candidate is None:
+                continue
+            logger.debug(f"Planned group for {teacher}: {len(group_candidate.students)} students")
+            student_index.remove(group_candidate.students)
+            group_candidates.append(group_candidate)
+        return group_candidates
+
+
+@dataclass(eq=False)
+class GroupOption:
+    """A group that a teacher could form, with the longest waiting students that would fit in it."""
+
+    teacher: Teacher
+    language_and_level: LanguageAndLevel
+    age_range: AgeRange
+    communication_language_mode: CommunicationLanguageMode
+    day_time_slots: tuple[DayAndTimeSlot, ...]
+    size: GroupSizeRestriction
+    students: Sequence[Student]
+
+    def to_group_candidate(self, students: Collection[Student]) -> GroupCandidate:
+        return GroupCandidate(
+            language_and_level=self.language_and_level,
+            communication_language_mode=self.communication_language_mode,
+            age_range=self.age_range,
+            teacher=self.teacher,
+            students=students,
+            day_time_slots=self.day_time_slots,
+        )
+
+
+Assignment = dict[GroupOption, list[Student]]
+
+
+class MaxPlacementGroupSolver(GroupSolver):
+    """Treats group formation as a global assignment problem, maximizing the number of placed students.
+
+    For a fixed choice of one option per teacher, the best assignment of students
+    is a maximum flow (source -> option -> student -> sink) in which the minimum group size
+    is a lower bound on the flow into an option.  If no flow fills every option to its minimum,
+    an option is dropped and the flow is recalculated.  The choice of
+    options starts greedy and is then improved by local search, swapping one teacher's option
+    at a time, until no swap helps or the time budget runs out.
+
+    The time budget is checked while options are collected and while flows are calculated.
+    When it runs out, the best assignment found so far is used, at least the greedy one
+    for the teachers whose options were collected.  Other teachers are left for the next run.
+    """
+
+    def __init__(self, time_budget: datetime.timedelta = DEFAULT_SOLVER_TIME_BUDGET):
+        self.time_budget = time_budget
+
+    def solve(self, teachers: Iterable[Teacher], student_index: StudentMatchingIndex) -> list[GroupCandidate]:
+        deadline = time.monotonic() + self.time_budget.total_seconds()
+        deadline_hit = False
+
+        options_by_teacher = {}
+        try:
+            for teacher in teachers:
+                options = self._get_options(teacher, student_index, deadline)
+                if options:
+                    options_by_teacher[teacher] = options
+        except _TimeBudgetExceededError:
+            deadline_hit = True
+
+        # Most constrained teachers choose first
+        teachers_by_option_count = sorted(options_by_teacher, key=lambda t: len(options_by_teacher[t]))
+        # the greedy pass is the fallback, so it is not interrupted: it only reads the capped candidate lists
+        best_assignment = self._assign_greedily([options_by_teacher[t] for t in teachers_by_option_count])
+        selection = {option.teacher: option for option in best_assignment}
+        try:
+            flow_assignment = self._assign_optimally(selection.values(), deadline)
+            if _count_students(flow_assignment) > _count_students(best_assignment):
+                best_assignment = flow_assignment
+            best_score = _count_students(best_assignment)
+
+            improved = True
+            while improved:
+                improved = False
+                for teacher in teachers_by_option_count:
+                    for option in options_by_teacher[teacher]:
+                        if selection.get(teacher) is option:
+                            continue
+                        trial_selection = {**selection, teacher: option}
+                        assignment = self._assign_optimally(trial_selection.values(), deadline)
+                        score = _count_students(assignment)
+                        if score > best_score:
+                            selection, best_assignment, best_score = trial_selection, assignment, score
+                            improved = True
+        except _TimeBudgetExceededError:
+            deadline_hit = True
+
+        if deadline_hit:
+            logger.warning(f"Group solver stopped by time budget ({self.time_budget}), result may be suboptimal")
+        for students in best_assignment.values():
+            student_index.remove(students)
+        return [option.to_group_candidate(students) for option, students in best_assignment.items()]
+
+    @staticmethod
+    def _get_options(teacher: Teacher, student_index: StudentMatchingIndex, deadline: float) -> list[GroupOption]:
+        communication_language = CommunicationLanguageMode(teacher.personal_info.communication_language_mode)
+        options = []
+        for language_and_level in teacher.teaching_languages_and_levels.all():
+            for day_time_slots in GroupBuilder._iterate_lesson_times(teacher):
+                for age_range in teacher.student_age_ranges.all():
+                    _check_deadline(deadline)
+                    size = GroupBuilder._get_allowed_group_size(age_range)
+                    students = list(
+                        itertools.islice(
+                            student_index.iterate_students(
+                                language_and_level=language_and_level,
+                                age_range=age_range,
+                                communication_language=communication_language,
+                                day_time_slots=day_time_slots,
+                            ),
+                            size.max * MAX_CANDIDATES_PER_SEAT,
+                        )
+                    )
+                    if len(students) >= size.min:
+                        options.append(
+                            GroupOption(
+                                teacher=teacher,
+                                language_and_level=language_and_level,
+                                age_range=age_range,
+                                communication_language_mode=communication_language,
+                                day_time_slots=day_time_slots,
+                                size=size,
+                                students=students,
+                            )
+                        )
+        return options
+
+    @staticmethod
+    def _assign_greedily(options_per_teacher: Iterable[Collection[GroupOption]]) -> Assignment:
+        """For each teacher, take the option with the most students that are not taken yet."""
+        assignment: Assignment = {}
+        taken_student_ids: set[int] = set()
+        for options in options_per_teacher:
+            best_option: GroupOption | None = None
+            best_students: list[Student] = []
+            for option in options:
+                free_students = [s for s in option.students if s.pk not in taken_student_ids][: option.size.max]
+                if len(free_students) >= option.size.min and len(free_students) > len(best_students):
+                    best_option, best_students = option, free_students
+            if best_option is not None:
+                assignment[best_option] = best_students
+                taken_student_ids.update(s.pk for s in best_students)
+        return assignment
+
+    @staticmethod
+    def _assign_optimally(options: Iterable[GroupOption], deadline: float) -> Assignment:
+        """Assign as many students as possible to the options, respecting group sizes."""
+        options = list(options)
+        while options:
+            assignment = _FlowNetwork(options).get_max_assignment(deadline)
+            if assignment is not None:
+                return assignment
+            # not all options can be filled: drop the one that gets fewest students when minimums are ignored
+            relaxed_assignment = _FlowNetwork(options, respect_min_size=False).get_max_assignment(deadline)
+            if relaxed_assignment is None:
+                raise RuntimeError("Flow without minimum group sizes must always be feasible")
+            too_small = [o for o in options if len(relaxed_assignment[o]) < o.size.min]
+            options.remove(min(too_small, key=lambda o: len(relaxed_assignment[o])))
+        return {}
+
+
+class _TimeBudgetExceededError(Exception):
+    pass
+
+
+def _check_deadline(deadline: float) -> None:
+    if time.monotonic() >= deadline:
+        raise _TimeBudgetExceededError
+
+
+def _count_students(assignment: Assignment) -> int:
+    return sum(len(students) for students in assignment.values())
+
+
+class _FlowNetwork:
+    """Bipartite flow network: source -> group option (capacity: max size) -> student -> sink (capacity 1).
+
+    The flow into an option must be at least its minimum size.  Such lower bounds are handled the usual way:
+    the minimum is routed from an extra "demand" source straight into the option and from the source into
+    an extra "demand" sink, and the sink is connected back to the source.  A flow that saturates the demand
+    source gives a feasible assignment, which is then extended by a maximum flow from the source to the sink.
+    """
+
+    _SOURCE = 0
+    _SINK = 1
+    _DEMAND_SOURCE = 2
+    _DEMAND_SINK = 3
+
+    def __init__(self, options: Sequence[GroupOption], respect_min_size: bool = True):
+        self._options = options
+        self._option_nodes: list[int] = []
+        self._students: dict[int, Student] = {}
+        node_by_student_id: dict[int, int] = {}
+        # each edge is [target node, remaining capacity, index of reverse edge in target's list]
+        self._edges: list[list[list[int]]] = [[], [], [], []]
+
+        self._total_min_size = 0
+        for option in options:
+            option_node = self._add_node()
+            self._option_nodes.append(option_node)
+            min_size = option.size.min if respect_min_size else 0
+            self._total_min_size += min_size
+            self._add_edge(self._SOURCE, option_node, option.size.max - min_size)
+            self._add_edge(self._DEMAND_SOURCE, option_node, min_size)
+            # students are ordered by waiting time: the longest waiting get places first
+            for student in option.students:
+                if student.pk not in node_by_student_id:
+                    student_node = self._add_node()
+                    node_by_student_id[student.pk] = student_node
+                    self._students[student_node] = student
+                    self._add_edge(student_node, self._SINK, 1)
+                self._add_edge(option_node, node_by_student_id[student.pk], 1)
+        self._add_edge(self._SOURCE, self._DEMAND_SINK, self._total_min_size)
+        self._add_edge(self._SINK, self._SOURCE, len(self._students))
+
+    def _add_node(self) -> int:
+        self._edges.append([])
+        return len(self._edges) - 1
+
+    def _add_edge(self, source: int, target: int, capacity: int) -> None:
+        self._edges[source].append([target, capacity, len(self._edges[target])])
+        self._edges[target].append([source, 0, len(self._edges[source]) - 1])
+
+    def get_max_assignment(self, deadline: float) -> Assignment | None:
+        """Return students assigned to each option, or `None` if options cannot all be filled to their minimum.
+
+        Raises `_TimeBudgetExceededError` once `deadline` (in `time.monotonic()` seconds) has passed.
+        """
+        if self._get_max_flow(self._DEMAND_SOURCE, self._DEMAND_SINK, deadline) < self._total_min_size:
+            return None
+        # cut the sink -> source edge: the flow through it stays, but cannot be pushed back
+        sink_to_source_edge = self._edges[self._SINK][-1]
+        sink_to_source_edge[1] = 0
+        self._edges[self._SOURCE][sink_to_source_edge[2]][1] = 0
+        self._get_max_flow(self._SOURCE, self._SINK, deadline)
+
+        assignment: Assignment = {}
+        for option_node, option in zip(self._option_nodes, self._options):
+            assignment[option] = [
+                self._students[target]
+                for target, capacity, _ in self._edges[option_node]
+                if target in self._students and capacity == 0
+            ]
+        return assignment
+
+    def _get_max_flow(self, source: int, sink: int, deadline: float) -> int:
+        """Run Dinic's algorithm.  Returns the value of the added flow."""
+        flow = 0
+        _check_deadline(deadline)
+        while (levels := self._get_levels(source, sink)) is not None:
+            next_edge_indices = [0] * len(self._edges)
+            while self._push_unit(source, sink, levels, next_edge_indices):
+                flow += 1
+                _check_deadline(deadline)
+        return flow
+
+    def _get_levels(self, source: int, sink: int) -> list[int] | None:
+        """Breadth-first search in the residual network.  Returns `None` if the sink is unreachable."""
+        levels = [-1] * len(self._edges)
+        levels[source] = 0
+        queue = [source]
+        for node in queue:
+            for target, capacity, _ in self._edges[node]:
+                if capacity > 0 and levels[target] < 0:
+                    levels[target] = levels[node] + 1
+                    queue.append(target)
+        return levels if levels[sink] >= 0 else None
+
+    def _push_unit(self, source: int, sink: int, levels: list[int], next_edge_indices: list[int]) -> bool:
+        """Find one augmenting path in the level graph and push a unit of flow along it.
+
+        Capacities are integers, so pushing one unit at a time still gives the maximum flow.
+        Most paths go through a student -> sink edge with capacity 1 and cannot carry more anyway.
+        """
+        path: list[tuple[int, int]] = []
+        node = source
+        while node != sink:
+            edges = self._edges[node]
+            while next_edge_indices[node] < len(edges):
+                target, capacity, _ = edges[next_edge_indices[node]]
+                if capacity > 0 and levels[target] == levels[node] + 1:
+                    break
+                next_edge_indices[node] += 1
+            else:
+                # dead end: step back and skip the edge that led here
+                if not path:
+                    return False
+                node, _ = path.pop()
+                next_edge_indices[node] += 1
+                continue
+            path.append((node, next_edge_indices[node]))
+            node = edges[next_edge_indices[node]][0]
+
+        for node, edge_index in path:
+            edge = self._edges[node][edge_index]
+            edge[1] -= 1
+            self._edges[edge[0]][edge[2]][1] += 1
+        return True
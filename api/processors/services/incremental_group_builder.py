@@ -0,0 +1,52 @@
+# DO NOT USE IN PROD, WORK IN PROGRESS
+import logging
+
+from django.db import transaction
+
+from api.models import Group, Student
+from api.models.choices.status import StudentProjectStatus
+from api.processors.services.group_builder import GroupBuilder
+from api.processors.services.student_matching_index import StudentMatchingIndex
+from api.processors.services.teacher_matching_index import TeacherMatchingIndex
+
+logger = logging.getLogger(__name__)
+
+
+class IncrementalGroupBuilder:
+    """Tries to form a group with one student as soon as they start waiting for a group.
+
+    Only teachers that can match the student are checked, and only students learning
+    the same languages and levels are loaded, so this is cheap enough to run on every registration.
+    """
+
+    @staticmethod
+    @transaction.atomic
+    def create_group_for_student(student_id: int) -> Group | None:
+        student = (
+            Student.objects.filter(
+                pk=student_id, project_status=StudentProjectStatus.NO_GROUP_YET, situational_status=""
+            )
+            .select_related("personal_info", "age_range")
+            .prefetch_related("teaching_languages_and_levels")
+            .first()
+        )
+        if student is None:
+            # student has been offered a group or is not waiting for one anymore
+            return None
+
+        language_and_level_ids = [
+            language_and_level.pk for language_and_level in student.teaching_languages_and_levels.all()
+        ]
+        teachers = TeacherMatchingIndex.load(language_and_level_ids).get_teachers(student)
+        if not teachers:
+            return None
+
+        student_index = StudentMatchingIndex.load(language_and_level_ids)
+        for teacher in teachers:
+            group_candidate = GroupBuilder._find_and_claim_group_candidate(
+                teacher, student_index, required_student=student
+            )
+            if group_candidate is not None:
+                logger.debug(f"Found group for {student} with {teacher}")
+                return GroupBuilder.save_group(group_candidate)
+        return None
@@ -0,0 +1,58 @@
+"""Valid combinations of weekly lesson slots.
+
+The catalogue of day and time slots is static, so which slots may follow each other
+is computed once per process.  Slots are identified by their bit numbers in `AvailabilityBitmask`,
+which lets a teacher's valid combinations be found by intersecting bitmasks.
+"""
+
+import functools
+from collections.abc import Iterator
+
+from api.models.auxil.availability_bitmask import AvailabilityBitmask
+from api.models.auxil.constants import MIN_DAYS_BETWEEN_LESSONS
+
+DAYS_IN_WEEK = 7
+
+
+class LessonTimeTable:
+    @staticmethod
+    def days_have_break(first_day: int, second_day: int) -> bool:
+        """Check that second day is strictly after first, but not too soon after (including across weeks)."""
+        if first_day >= second_day:
+            return False
+        days_between_two_weekdays = min(
+            (second_day - first_day) % DAYS_IN_WEEK, (first_day - second_day) % DAYS_IN_WEEK
+        )
+        return days_between_two_weekdays > MIN_DAYS_BETWEEN_LESSONS
+
+    @staticmethod
+    @functools.cache
+    def get_next_lesson_bitmasks() -> tuple[int, ...]:
+        """For every slot bit number, the bitmask of slots that may hold the next lesson of the same group."""
+        next_lesson_bitmasks = []
+        for bit_number in range(AvailabilityBitmask.BIT_COUNT):
+            day = AvailabilityBitmask.get_day_of_week_index(bit_number)
+            bitmask = 0
+            for next_bit_number in range(AvailabilityBitmask.BIT_COUNT):
+                if LessonTimeTable.days_have_break(day, AvailabilityBitmask.get_day_of_week_index(next_bit_number)):
+                    bitmask |= 1 << next_bit_number
+            next_lesson_bitmasks.append(bitmask)
+        return tuple(next_lesson_bitmasks)
+
+    @staticmethod
+    def iterate_combinations(availability_bitmask: int, lesson_count: int) -> Iterator[tuple[int, ...]]:
+        """Iterate over combinations of `lesson_count` slots within availability, every two of them with a break.
+
+        Combinations are tuples of bit numbers, in ascending order of the first slot, then of the second and so on.
+        """
+        next_lesson_bitmasks = LessonTimeTable.get_next_lesson_bitmasks()
+
+        def extend(combination: tuple[int, ...], candidates_bitmask: int) -> Iterator[tuple[int, ...]]:
+            if len(combination) == lesson_count:
+                yield combination
+                return
+            for bit_number in AvailabilityBitmask.iterate_bit_numbers(candidates_bitmask):
+                # next slots must have a break after every previous lesson, not only after the last one
+                yield from extend(combination + (bit_number,), candidates_bitmask & next_lesson_bitmasks[bit_number])
+
+        yield from extend((), availability_bitmask)
@@ -0,0 +1,247 @@
+# DO NOT USE IN PROD, WORK IN PROGRESS
+"""Group planning split into independent partitions of teachers, evaluated in a process pool."""
+
+import logging
+from collections import defaultdict
+from collections.abc import Collection, Iterable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import django
+from django.db import connections
+
+from api.models import AgeRange, DayAndTimeSlot, Group, LanguageAndLevel, Student, Teacher
+from api.models.choices.communication_language_mode import CommunicationLanguageMode
+from api.models.choices.status import StudentProjectStatus
+from api.processors.services.batch_group_builder import BatchGroupBuilder
+from api.processors.services.group_builder import GroupBuilder, GroupCandidate
+from api.processors.services.group_solvers import GreedyGroupSolver, GroupSolver
+from api.processors.services.simulation import SimulationMeter, SimulationReport
+from api.processors.services.student_matching_index import StudentMatchingIndex
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Partition:
+    """Teachers that are planned together, and languages and levels of students they may get."""
+
+    teacher_ids: tuple[int, ...]
+    language_and_level_ids: tuple[int, ...]
+
+
+@dataclass(frozen=True)
+class PlannedGroup:
+    """Group candidate reduced to ids, so that it can be passed between processes."""
+
+    teacher_id: int
+    student_ids: tuple[int, ...]
+    language_and_level_id: int
+    age_range_id: int
+    communication_language_mode: str
+    day_time_slot_ids: tuple[int, ...]
+
+    @classmethod
+    def from_group_candidate(cls, group_candidate: GroupCandidate) -> "PlannedGroup":
+        return cls(
+            teacher_id=group_candidate.teacher.pk,
+            student_ids=tuple(student.pk for student in group_candidate.students),
+            language_and_level_id=group_candidate.language_and_level.pk,
+            age_range_id=group_candidate.age_range.pk,
+            communication_language_mode=group_candidate.communication_language_mode,
+            day_time_slot_ids=tuple(slot.pk for slot in group_candidate.day_time_slots),
+        )
+
+
+class ParallelGroupBuilder:
+    """Plans groups for partitions of teachers in parallel, then merges and saves the plans in one transaction.
+
+    Partitions are either languages or connected components of the graph where teachers and students
+    are linked through languages and levels they share.  Components never compete for students;
+    languages may (a student can learn two languages), which is resolved when the plans are merged.
+    """
+
+    PARTITION_BY_LANGUAGE = "language"
+    PARTITION_BY_COMPONENT = "component"
+
+    @staticmethod
+    def create_and_save_groups(
+        teacher_ids: Collection[int] | None = None,
+        solver: GroupSolver | None = None,
+        max_workers: int = 1,
+        partition_by: str = PARTITION_BY_COMPONENT,
+    ) -> list[Group]:
+        group_candidates = ParallelGroupBuilder.plan_groups(teacher_ids, solver, max_workers, partition_by)
+        return BatchGroupBuilder.save_groups(group_candidates)
+
+    @staticmethod
+    def plan_groups(
+        teacher_ids: Collection[int] | None = None,
+        solver: GroupSolver | None = None,
+        max_workers: int = 1,
+        partition_by: str = PARTITION_BY_COMPONENT,
+    ) -> list[GroupCandidate]:
+        """Plan groups for all partitions and merge the plans.  Nothing is saved."""
+        partitions = ParallelGroupBuilder.get_partitions(teacher_ids, partition_by)
+        solver = solver or GreedyGroupSolver()
+        logger.debug(f"Planning {len(partitions)} partitions in {max_workers} processes")
+
+        if max_workers == 1:
+            planned_groups_per_partition = [ParallelGroupBuilder._plan_partition(p, solver) for p in partitions]
+        else:
+            # every worker must open its own database connection instead of sharing an inherited one
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker) as executor:
+                planned_groups_per_partition = list(
+                    executor.map(ParallelGroupBuilder._plan_partition, partitions, [solver] * len(partitions))
+                )
+
+        planned_groups = ParallelGroupBuilder.merge(planned_groups_per_partition)
+        return ParallelGroupBuilder._to_group_candidates(planned_groups)
+
+    @staticmethod
+    def simulate(
+        teacher_ids: Collection[int] | None = None,
+        solver: GroupSolver | None = None,
+        max_workers: int = 1,
+        partition_by: str = PARTITION_BY_COMPONENT,
+    ) -> SimulationReport:
+        """Plan groups the way `create_and_save_groups` does and measure the planning without saving anything.
+
+        Queries and memory of worker processes are not counted, only of the current one.
+        """
+        with SimulationMeter(SimulationReport()) as report:
+            report.group_candidates = ParallelGroupBuilder.plan_groups(teacher_ids, solver, max_workers, partition_by)
+        return report
+
+    @staticmethod
+    def get_partitions(teacher_ids: Collection[int] | None, partition_by: str) -> list[Partition]:
+        teachers = BatchGroupBuilder._get_teachers(teacher_ids)
+        teacher_levels = Teacher.teaching_languages_and_levels.through.objects.filter(
+            teacher__in=teachers.values("pk")
+        ).values_list("teacher_id", "languageandlevel_id", "languageandlevel__language_id")
+
+        if partition_by == ParallelGroupBuilder.PARTITION_BY_LANGUAGE:
+            get_partition_key = ParallelGroupBuilder._get_language_keys(teacher_levels)
+        elif partition_by == ParallelGroupBuilder.PARTITION_BY_COMPONENT:
+            get_partition_key = ParallelGroupBuilder._get_component_keys(teacher_levels)
+        else:
+            raise ValueError(f"Unknown partitioning: {partition_by}")
+
+        teacher_ids_by_key: dict[object, set[int]] = defaultdict(set)
+        level_ids_by_key: dict[object, set[int]] = defaultdict(set)
+        for teacher_id, language_and_level_id, language_id in teacher_levels:
+            key = get_partition_key[(language_and_level_id, language_id)]
+            teacher_ids_by_key[key].add(teacher_id)
+            level_ids_by_key[key].add(language_and_level_id)
+        return [
+            Partition(
+                teacher_ids=tuple(sorted(teacher_ids_by_key[key])),
+                language_and_level_ids=tuple(sorted(level_ids_by_key[key])),
+            )
+            for key in teacher_ids_by_key
+        ]
+
+    @staticmethod
+    def _get_language_keys(teacher_levels: Iterable[tuple[int, int, str]]) -> dict[tuple[int, str], object]:
+        return {(level_id, language_id): language_id for _, level_id, language_id in teacher_levels}
+
+    @staticmethod
+    def _get_component_keys(teacher_levels: Iterable[tuple[int, int, str]]) -> dict[tuple[int, str], object]:
+        """Find connected components of languages and levels linked by teachers or students having several of them."""
+        parents: dict[int, int] = {}
+
+        def find(level_id: int) -> int:
+            parents.setdefault(level_id, level_id)
+            while parents[level_id] != level_id:
+                parents[level_id] = parents[parents[level_id]]
+                level_id = parents[level_id]
+            return level_id
+
+        def union(level_ids: Iterable[int]) -> None:
+            roots = [find(level_id) for level_id in level_ids]
+            for root in roots[1:]:
+                parents[root] = roots[0]
+
+        level_ids_by_person: dict[tuple[str, int], list[int]] = defaultdict(list)
+        languages: dict[int, str] = {}
+        for teacher_id, level_id, language_id in teacher_levels:
+            level_ids_by_person[("teacher", teacher_id)].append(level_id)
+            languages[level_id] = language_id
+        for student_id, level_id in Student.teaching_languages_and_levels.through.objects.filter(
+            student__project_status=StudentProjectStatus.NO_GROUP_YET,
+            student__situational_status="",
+            languageandlevel__in=languages.keys(),
+        ).values_list("student_id", "languageandlevel_id"):
+            level_ids_by_person[("student", student_id)].append(level_id)
+        for level_ids in level_ids_by_person.values():
+            union(level_ids)
+        return {(level_id, language_id): find(level_id) for level_id, language_id in languages.items()}
+
+    @staticmethod
+    def _plan_partition(partition: Partition, solver: GroupSolver) -> list[PlannedGroup]:
+        teachers = BatchGroupBuilder._get_teachers(partition.teacher_ids)
+        student_index = StudentMatchingIndex.load(partition.language_and_level_ids)
+        return [PlannedGroup.from_group_candidate(c) for c in solver.solve(teachers, student_index)]
+
+    @staticmethod
+    def merge(planned_groups_per_partition: Iterable[Iterable[PlannedGroup]]) -> list[PlannedGroup]:
+        """Resolve conflicts between plans of different partitions.
+
+        Partitions are taken in order; a teacher gets only the first group planned for them,
+        and students that are already taken are removed from later groups.
+        Groups that become too small are dropped.
+        """
+        age_ranges = AgeRange.objects.in_bulk()
+        taken_teacher_ids: set[int] = set()
+        taken_student_ids: set[int] = set()
+        merged_groups = []
+        for planned_groups in planned_groups_per_partition:
+            for planned_group in planned_groups:
+                if planned_group.teacher_id in taken_teacher_ids:
+                    continue
+                student_ids = tuple(pk for pk in planned_group.student_ids if pk not in taken_student_ids)
+                if len(student_ids) < GroupBuilder._get_allowed_group_size(age_ranges[planned_group.age_range_id]).min:
+                    logger.debug(f"Dropped conflicting group planned for teacher {planned_group.teacher_id}")
+                    continue
+                taken_teacher_ids.add(planned_group.teacher_id)
+                taken_student_ids.update(student_ids)
+                merged_groups.append(
+                    PlannedGroup(
+                        teacher_id=planned_group.teacher_id,
+                        student_ids=student_ids,
+                        language_and_level_id=planned_group.language_and_level_id,
+                        age_range_id=planned_group.age_range_id,
+                        communication_language_mode=planned_group.communication_language_mode,
+                        day_time_slot_ids=planned_group.day_time_slot_ids,
+                    )
+                )
+        return merged_groups
+
+    @staticmethod
+    def _to_group_candidates(planned_groups: Collection[PlannedGroup]) -> list[GroupCandidate]:
+        teachers = Teacher.objects.in_bulk([g.teacher_id for g in planned_groups])
+        students = Student.objects.in_bulk([pk for g in planned_groups for pk in g.student_ids])
+        languages_and_levels = LanguageAndLevel.objects.select_related("language", "level").in_bulk(
+            [g.language_and_level_id for g in planned_groups]
+        )
+        age_ranges = AgeRange.objects.in_bulk([g.age_range_id for g in planned_groups])
+        slots = DayAndTimeSlot.objects.select_related("time_slot").in_bulk(
+            [pk for g in planned_groups for pk in g.day_time_slot_ids]
+        )
+        return [
+            GroupCandidate(
+                language_and_level=languages_and_levels[g.language_and_level_id],
+                communication_language_mode=CommunicationLanguageMode(g.communication_language_mode),
+                age_range=age_ranges[g.age_range_id],
+                teacher=teachers[g.teacher_id],
+                students=[students[pk] for pk in g.student_ids],
+                day_time_slots=[slots[pk] for pk in g.day_time_slot_ids],
+            )
+            for g in planned_groups
+        ]
+
+
+def _init_worker() -> None:
+    # with the "spawn" start method the worker starts with a fresh interpreter
+    django.setup()
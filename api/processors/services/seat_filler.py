@@ -0,0 +1,180 @@
+# DO NOT USE IN PROD, WORK IN PROGRESS
+import datetime
+import logging
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from django.db import transaction
+from django.db.models import Prefetch
+from django.utils import timezone
+
+from api.models import AgeRange, Group, Student, StudentLogEvent
+from api.models.bot_notification import BotNotification
+from api.models.choices.log_event_type import StudentLogEventType
+from api.models.choices.status import GroupProjectStatus, StudentSituationalStatus
+from api.models.log_event import LogEvent
+from api.processors.auxil.log_event_writer import LogEventWriter
+from api.processors.services.group_builder import GroupBuilder
+from api.processors.services.student_matching_index import StudentMatchingIndex
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(eq=False)
+class OpenGroup:
+    """Group that may take more students, as seen by `SeatFiller`."""
+
+    group: Group
+    # age ranges of the group's teachers that include ages of all its students
+    age_ranges: list[AgeRange]
+    # students in the group plus students that were offered to join it and have not answered yet
+    taken_seats: int
+    proposed_students: list[Student] = field(default_factory=list)
+
+    def can_take(self, student: Student) -> bool:
+        if self.group.schedule_bitmask & student.availability_bitmask != self.group.schedule_bitmask:
+            return False
+        age_ranges = self._get_age_ranges_with(student)
+        if not age_ranges:
+            return False
+        max_size = max(GroupBuilder._get_allowed_group_size(age_range).max for age_range in age_ranges)
+        return self.taken_seats < max_size
+
+    def take(self, student: Student) -> None:
+        self.age_ranges = self._get_age_ranges_with(student)
+        self.taken_seats += 1
+        self.proposed_students.append(student)
+
+    def _get_age_ranges_with(self, student: Student) -> list[AgeRange]:
+        return [
+            age_range
+            for age_range in self.age_ranges
+            if age_range.age_from <= student.age_range.age_from and student.age_range.age_to <= age_range.age_to
+        ]
+
+
+class OpenGroupIndex:
+    """In-memory index of groups that are not finished, bucketed by language and level and communication mode."""
+
+    OPEN_STATUSES = (GroupProjectStatus.PENDING, GroupProjectStatus.AWAITING_START, GroupProjectStatus.WORKING)
+
+    def __init__(self, open_groups: Iterable[OpenGroup]):
+        self._buckets: dict[tuple[int, str], list[OpenGroup]] = defaultdict(list)
+        for open_group in open_groups:
+            group = open_group.group
+            self._buckets[(group.language_and_level_id, group.communication_language_mode)].append(open_group)
+
+    @classmethod
+    def load(cls) -> "OpenGroupIndex":
+        groups = (
+            Group.objects.filter(project_status__in=cls.OPEN_STATUSES, is_for_staff_only=False)
+            .exclude(schedule_bitmask=0)
+            .prefetch_related(
+                "teachers__student_age_ranges",
+                Prefetch("students", queryset=Student.objects.select_related("age_range")),
+            )
+            .order_by("status_since", "pk")
+        )
+        offered_student_ids = defaultdict(set)
+        for group_id, student_id in StudentLogEvent.objects.filter(
+            type=StudentLogEventType.GROUP_OFFERED,
+            to_group__project_status__in=cls.OPEN_STATUSES,
+            student__situational_status=StudentSituationalStatus.GROUP_OFFERED,
+        ).values_list("to_group_id", "student_id"):
+            offered_student_ids[group_id].add(student_id)
+
+        open_groups = []
+        for group in groups:
+            students = group.students.all()
+            age_ranges = [
+                age_range
+                for teacher in group.teachers.all()
+                for age_range in teacher.student_age_ranges.all()
+                if all(
+                    age_range.age_from <= student.age_range.age_from and student.age_range.age_to <= age_range.age_to
+                    for student in students
+                )
+            ]
+            if not age_ranges:
+                continue
+            taken_seats = len({student.pk for student in students} | offered_student_ids[group.pk])
+            open_groups.append(OpenGroup(group=group, age_ranges=age_ranges, taken_seats=taken_seats))
+        return cls(open_groups)
+
+    def find_group(self, student: Student) -> OpenGroup | None:
+        """Find a group with a free seat that fits the student.  Groups waiting longer are filled first."""
+        communication_language_mode = student.personal_info.communication_language_mode
+        for language_and_level in student.teaching_languages_and_levels.all():
+            for open_group in self._buckets.get((language_and_level.pk, communication_language_mode), ()):
+                if open_group.can_take(student):
+                    return open_group
+        return None
+
+
+class SeatFiller:
+    """Offers waiting students free seats in existing groups.
+
+    Filling existing groups uses capacity that is already there, so it should run before new groups are built.
+    """
+
+    @staticmethod
+    def fill_groups() -> dict[Group, list[Student]]:
+        """Offer free seats to waiting students.  Returns students offered to join each group."""
+        return SeatFiller.propose(SeatFiller.plan())
+
+    @staticmethod
+    def plan() -> dict[Group, list[Student]]:
+        group_index = OpenGroupIndex.load()
+        proposals = {}
+        # students that have been waiting longer are offered seats first
+        for student in StudentMatchingIndex.get_waiting_students().order_by("status_since", "pk"):
+            open_group = group_index.find_group(student)
+            if open_group is None:
+                continue
+            open_group.take(student)
+            proposals[open_group.group] = open_group.proposed_students
+        return proposals
+
+    @staticmethod
+    @transaction.atomic
+    def propose(proposals: dict[Group, list[Student]]) -> dict[Group, list[Student]]:
+        """Offer students to join groups, the same way `StudentOfferJoinGroupProcessor` does, in bulk.
+
+        Students taken by another worker since planning are skipped.  Returns students offered to join each group.
+        """
+        claimed_student_ids = GroupBuilder._claim_students(
+            student for students in proposals.values() for student in students
+        )
+        claimed_proposals = {
+            group: claimed_students
+            for group, students in proposals.items()
+            if (claimed_students := [student for student in students if student.pk in claimed_student_ids])
+        }
+        skipped_count = sum(len(students) for students in proposals.values()) - len(claimed_student_ids)
+        if skipped_count:
+            logger.warning(f"{skipped_count} planned offers were skipped: their students were taken by another worker")
+        if not claimed_proposals:
+            return {}
+
+        timestamp = timezone.now()
+        Student.objects.filter(pk__in=claimed_student_ids).update(
+            situational_status=StudentSituationalStatus.GROUP_OFFERED, status_since=timestamp
+        )
+        log_events = SeatFiller._create_log_events(claimed_proposals, timestamp)
+        BotNotification.objects.enqueue_for_log_events(log_events)
+        logger.debug(f"Offered {len(claimed_student_ids)} students to join {len(claimed_proposals)} groups")
+        return claimed_proposals
+
+    @staticmethod
+    def _create_log_events(proposals: dict[Group, list[Student]], timestamp: datetime.datetime) -> list[LogEvent]:
+        # the writer also marks the students dirty for alert checks
+        log_event_writer = LogEventWriter()
+        log_event_writer.add(
+            StudentLogEvent(
+                student=student, to_group=group, type=StudentLogEventType.GROUP_OFFERED, date_time=timestamp
+            )
+            for group, students in proposals.items()
+            for student in students
+        )
+        return log_event_writer.flush()
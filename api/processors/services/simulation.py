@@ -0,0 +1,96 @@
+"""Measurements for dry runs of group building: nothing is saved, only timings and resource usage are reported."""
+
+import datetime
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from types import TracebackType
+from typing import TYPE_CHECKING, Any
+
+from django.db import connection
+
+if TYPE_CHECKING:
+    from api.processors.services.group_builder import GroupCandidate
+
+
+class QueryCounter:
+    """Counts database queries executed inside the `with` block.
+
+    Unlike `CaptureQueriesContext`, does not store SQL, so it is safe to use on large runs.
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self._wrapper_context: Any = None
+
+    def __call__(self, execute: Callable[..., Any], sql: str, params: Any, many: bool, context: Any) -> Any:
+        self.count += 1
+        return execute(sql, params, many, context)
+
+    def __enter__(self) -> "QueryCounter":
+        self._wrapper_context = connection.execute_wrapper(self)
+        self._wrapper_context.__enter__()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self._wrapper_context.__exit__(exc_type, exc_value, traceback)
+
+
+@dataclass
+class TeacherSearchStats:
+    teacher_id: int
+    group_candidate: "GroupCandidate | None"
+    duration: datetime.timedelta
+    query_count: int
+
+
+@dataclass
+class SimulationReport:
+    group_candidates: list["GroupCandidate"] = field(default_factory=list)
+    # filled only when teachers are processed one by one
+    teacher_stats: list[TeacherSearchStats] = field(default_factory=list)
+    duration: datetime.timedelta = datetime.timedelta()
+    query_count: int = 0
+    peak_memory_bytes: int = 0
+
+    @property
+    def placed_student_count(self) -> int:
+        return sum(len(group_candidate.students) for group_candidate in self.group_candidates)
+
+
+class SimulationMeter:
+    """Measures wall time, query count and peak Python memory of the `with` block into `report`."""
+
+    def __init__(self, report: SimulationReport):
+        self.report = report
+        self._query_counter = QueryCounter()
+        self._started_tracing = False
+        self._start = 0.0
+
+    def __enter__(self) -> SimulationReport:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        tracemalloc.reset_peak()
+        self._query_counter.__enter__()
+        self._start = time.perf_counter()
+        return self.report
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.report.duration = datetime.timedelta(seconds=time.perf_counter() - self._start)
+        self._query_counter.__exit__(exc_type, exc_value, traceback)
+        self.report.query_count = self._query_counter.count
+        self.report.peak_memory_bytes = tracemalloc.get_traced_memory()[1]
+        if self._started_tracing:
+            tracemalloc.stop()
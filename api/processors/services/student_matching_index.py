@@ -0,0 +1,104 @@
+import itertools
+from collections import defaultdict
+from collections.abc import Collection, Iterable, Iterator
+from dataclasses import dataclass
+
+from django.db.models import QuerySet
+
+from api.models import AgeRange, Student
+from api.models.auxil.availability_bitmask import AvailabilityBitmask
+from api.models.choices.communication_language_mode import CommunicationLanguageMode
+from api.models.choices.status import StudentProjectStatus
+from api.models.day_and_time_slot import DayAndTimeSlot
+from api.models.language_and_level import LanguageAndLevel
+
+
+@dataclass(frozen=True)
+class IndexedStudent:
+    """Snapshot of the student attributes that matter for matching."""
+
+    student: Student
+    age_from: int
+    age_to: int
+    availability_bitmask: int
+
+
+class StudentMatchingIndex:
+    """In-memory index of students waiting for a group.
+
+    All students with `NO_GROUP_YET` status and no situational status are loaded once, together with their levels,
+    age range, communication mode and availability slots.  Candidate lookups are then
+    answered without touching the database, so the number of queries needed to search
+    groups for a teacher does not depend on the number of slot pairs they offer.
+    """
+
+    def __init__(self, students: Iterable[Student]):
+        self._buckets: dict[tuple[int, str], list[IndexedStudent]] = defaultdict(list)
+        self._removed_ids: set[int] = set()
+
+        for student in sorted(students, key=lambda s: (s.status_since, s.pk)):
+            indexed_student = IndexedStudent(
+                student=student,
+                age_from=student.age_range.age_from,
+                age_to=student.age_range.age_to,
+                availability_bitmask=student.availability_bitmask,
+            )
+            communication_language_mode = student.personal_info.communication_language_mode
+            for language_and_level in student.teaching_languages_and_levels.all():
+                self._buckets[(language_and_level.pk, communication_language_mode)].append(indexed_student)
+
+    @classmethod
+    def load(cls, language_and_level_ids: Collection[int] | None = None) -> "StudentMatchingIndex":
+        """Build the index from all students that are waiting for a group.
+
+        If `language_and_level_ids` are given, only students learning any of them are loaded.
+        """
+        return cls(cls.get_waiting_students(language_and_level_ids))
+
+    @staticmethod
+    def get_waiting_students(language_and_level_ids: Collection[int] | None = None) -> QuerySet[Student]:
+        """Students that can be offered a group, with everything needed for matching loaded."""
+        students = (
+            # students with any situational status (e.g. already offered a group) are not offered a new group
+            Student.objects.filter(project_status=StudentProjectStatus.NO_GROUP_YET, situational_status="")
+            .select_related("personal_info", "age_range")
+            .prefetch_related("teaching_languages_and_levels")
+        )
+        if language_and_level_ids is not None:
+            students = students.filter(teaching_languages_and_levels__in=language_and_level_ids).distinct()
+        return students
+
+    def get_students(
+        self,
+        language_and_level: LanguageAndLevel,
+        age_range: AgeRange,
+        communication_language: CommunicationLanguageMode,
+        day_time_slots: Iterable[DayAndTimeSlot],
+        max_students_num: int,
+    ) -> list[Student]:
+        """Return up to `max_students_num` matching students, longest waiting first."""
+        matching_students = self.iterate_students(language_and_level, age_range, communication_language, day_time_slots)
+        return list(itertools.islice(matching_students, max_students_num))
+
+    def iterate_students(
+        self,
+        language_and_level: LanguageAndLevel,
+        age_range: AgeRange,
+        communication_language: CommunicationLanguageMode,
+        day_time_slots: Iterable[DayAndTimeSlot],
+    ) -> Iterator[Student]:
+        """Iterate over all matching students, longest waiting first."""
+        required_bitmask = AvailabilityBitmask.from_slots(day_time_slots)
+        for indexed_student in self._buckets.get((language_and_level.pk, communication_language), []):
+            if indexed_student.student.pk in self._removed_ids:
+                continue
+            # TODO: handle age ranges properly (add more ranges when necessary)
+            if indexed_student.age_from < age_range.age_from or indexed_student.age_to > age_range.age_to:
+                continue
+            if indexed_student.availability_bitmask & required_bitmask != required_bitmask:
+                continue
+            yield indexed_student.student
+
+    def remove(self, students: Iterable[Student]) -> None:
+        """Exclude students (e.g. those that were just offered a group) from further lookups."""
+        self._removed_ids.update(student.pk for student in students)
@@ -0,0 +1,54 @@
+from collections import defaultdict
+from collections.abc import Collection, Iterable
+
+from api.models import AgeRange, Student, Teacher
+from api.processors.services.group_builder import GroupBuilder
+
+
+class TeacherMatchingIndex:
+    """In-memory index of teachers that can take more groups.
+
+    Teachers are bucketed by (language and level, age range of students they teach),
+    so teachers that might form a group with a given student are found without scanning everyone.
+    """
+
+    def __init__(self, teachers: Iterable[Teacher]):
+        self._buckets: dict[tuple[int, int], list[Teacher]] = defaultdict(list)
+        self._age_ranges: dict[int, AgeRange] = {}
+
+        for teacher in teachers:
+            for age_range in teacher.student_age_ranges.all():
+                self._age_ranges[age_range.pk] = age_range
+                for language_and_level in teacher.teaching_languages_and_levels.all():
+                    self._buckets[(language_and_level.pk, age_range.pk)].append(teacher)
+
+    @classmethod
+    def load(cls, language_and_level_ids: Collection[int] | None = None) -> "TeacherMatchingIndex":
+        """Build the index from available teachers, optionally only from those teaching given levels.
+
+        Teachers are loaded with `TeacherQuerySet.prefetch_for_matching`.
+        """
+        teachers = GroupBuilder.get_available_teachers()
+        if language_and_level_ids is not None:
+            teachers = teachers.filter(teaching_languages_and_levels__in=language_and_level_ids).distinct()
+        return cls(teachers)
+
+    def get_teachers(self, student: Student) -> list[Teacher]:
+        """Return teachers that might form a group with the student, the longest waiting first.
+
+        Student must be loaded with `personal_info`, `age_range` and `teaching_languages_and_levels`.
+        """
+        age_range_ids = [
+            age_range.pk
+            for age_range in self._age_ranges.values()
+            if age_range.age_from <= student.age_range.age_from and student.age_range.age_to <= age_range.age_to
+        ]
+        teachers = {
+            teacher.pk: teacher
+            for language_and_level in student.teaching_languages_and_levels.all()
+            for age_range_id in age_range_ids
+            for teacher in self._buckets.get((language_and_level.pk, age_range_id), ())
+            if teacher.personal_info.communication_language_mode == student.personal_info.communication_language_mode
+            and teacher.availability_bitmask & student.availability_bitmask
+        }
+        return sorted(teachers.values(), key=lambda t: (t.status_since, t.pk))
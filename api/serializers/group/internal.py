@@ -16,7 +16,7 @@ class GroupWriteSerializer(serializers.ModelSerializer[Group]):
 
     class Meta:
         model = Group
-        fields = "__all__"
+        exclude = ("schedule_bitmask",)
 
 
 class GroupReadSerializer(serializers.ModelSerializer[Group]):
@@ -33,7 +33,7 @@ class GroupReadSerializer(serializers.ModelSerializer[Group]):
 
     class Meta:
         model = Group
-        fields = "__all__"
+        exclude = ("schedule_bitmask",)
 
 
 class GroupDiscardSerializer(serializers.Serializer[Any]):
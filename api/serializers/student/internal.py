@@ -35,7 +35,7 @@ class StudentWriteSerializer(serializers.ModelSerializer[Student]):
 
     class Meta:
         model = Student
-        exclude = ("children",)
+        exclude = ("children", "availability_bitmask")
 
 
 class StudentReadSerializer(serializers.ModelSerializer[Student]):
@@ -45,4 +45,4 @@ class StudentReadSerializer(serializers.ModelSerializer[Student]):
 
     class Meta:
         model = Student
-        exclude = ("children",)
+        exclude = ("children", "availability_bitmask")
@@ -12,7 +12,7 @@ from api.serializers import (
 class TeacherWriteSerializer(serializers.ModelSerializer[Teacher]):
     class Meta:
         model = Teacher
-        fields = "__all__"
+        exclude = ("availability_bitmask",)
 
 
 class TeacherReadSerializer(serializers.ModelSerializer[Teacher]):
@@ -23,4 +23,4 @@ class TeacherReadSerializer(serializers.ModelSerializer[Teacher]):
 
     class Meta:
         model = Teacher
-        fields = "__all__"
+        exclude = ("availability_bitmask",)
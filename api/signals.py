@@ -0,0 +1,105 @@
+from collections.abc import Collection
+from typing import Any, TypeVar
+
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from api.models import (
+    CoordinatorLogEvent,
+    DayAndTimeSlot,
+    GroupLogEvent,
+    Student,
+    StudentLogEvent,
+    Teacher,
+    TeacherLogEvent,
+    TeacherUnder18LogEvent,
+)
+from api.models.auxil.availability_bitmask import AvailabilityBitmask
+from api.models.log_event import LatestLogEvent, LogEvent
+
+PersonWithAvailability = TypeVar("PersonWithAvailability", Student, Teacher)
+
+
+def refresh_availability_bitmasks(model: type[PersonWithAvailability], pks: Collection[int]) -> dict[int, int]:
+    """Recalculate `availability_bitmask` of given students or teachers from their availability slots.
+
+    Returns new bitmasks by primary key.
+    """
+    if not pks:
+        return {}
+    person_field = f"{model._meta.model_name}_id"
+    bitmasks = dict.fromkeys(pks, 0)
+    slot_rows = model.availability_slots.through.objects.filter(**{f"{person_field}__in": pks}).values_list(
+        person_field,
+        "dayandtimeslot__day_of_week_index",
+        "dayandtimeslot__time_slot__from_utc_hour",
+    )
+    for pk, day_of_week_index, from_utc_hour in slot_rows:
+        bitmasks[pk] |= AvailabilityBitmask.get_bit(day_of_week_index, from_utc_hour)
+
+    model.objects.bulk_update(
+        [model(pk=pk, availability_bitmask=bitmask) for pk, bitmask in bitmasks.items()],
+        ["availability_bitmask"],
+    )
+    return bitmasks
+
+
+def _sync_availability_bitmask(
+    model: type[PersonWithAvailability],
+    instance: Student | Teacher | DayAndTimeSlot,
+    action: str,
+    reverse: bool,
+    pk_set: set[int] | None,
+) -> None:
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if not reverse:
+        bitmasks = refresh_availability_bitmasks(model, [instance.pk])
+        # keep the in-memory object in sync, so that its later `save()` does not overwrite the bitmask
+        instance.availability_bitmask = bitmasks[instance.pk]  # type: ignore[union-attr]
+        return
+
+    if pk_set is None:
+        # Slot was removed from everyone: find people by the slot's bit, it is still set for them
+        slot_bit = AvailabilityBitmask.from_slots([instance])  # type: ignore[list-item]
+        if not slot_bit:
+            return
+        pk_set = set(model.objects.filter_available_at_all(slot_bit).values_list("pk", flat=True))
+    refresh_availability_bitmasks(model, pk_set)
+
+
+@receiver(m2m_changed, sender=Student.availability_slots.through)
+def sync_student_availability_bitmask(
+    instance: Student | DayAndTimeSlot, action: str, reverse: bool, pk_set: set[int] | None, **_: Any
+) -> None:
+    _sync_availability_bitmask(Student, instance, action, reverse, pk_set)
+
+
+@receiver(m2m_changed, sender=Teacher.availability_slots.through)
+def sync_teacher_availability_bitmask(
+    instance: Teacher | DayAndTimeSlot, action: str, reverse: bool, pk_set: set[int] | None, **_: Any
+) -> None:
+    _sync_availability_bitmask(Teacher, instance, action, reverse, pk_set)
+
+
+@receiver(post_save, sender=CoordinatorLogEvent)
+@receiver(post_save, sender=GroupLogEvent)
+@receiver(post_save, sender=StudentLogEvent)
+@receiver(post_save, sender=TeacherLogEvent)
+@receiver(post_save, sender=TeacherUnder18LogEvent)
+def sync_latest_log_event_on_save(sender: type[LogEvent], instance: LogEvent, created: bool, **_: Any) -> None:
+    if created:
+        LatestLogEvent.objects.record([instance])
+    else:
+        # type or date of the event may have changed, so the previous latest event may be the latest again
+        LatestLogEvent.objects.refresh(sender, [instance.object_id])
+
+
+@receiver(post_delete, sender=CoordinatorLogEvent)
+@receiver(post_delete, sender=GroupLogEvent)
+@receiver(post_delete, sender=StudentLogEvent)
+@receiver(post_delete, sender=TeacherLogEvent)
+@receiver(post_delete, sender=TeacherUnder18LogEvent)
+def sync_latest_log_event_on_delete(sender: type[LogEvent], instance: LogEvent, **_: Any) -> None:
+    LatestLogEvent.objects.refresh(sender, [instance.object_id])
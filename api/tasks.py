@@ -0,0 +1,17 @@
+from celery import shared_task
+
+from api.processors.services.bot_notification_relay import BotNotificationRelay
+from api.processors.services.incremental_group_builder import IncrementalGroupBuilder
+
+
+@shared_task(name="api.tasks.match_new_student")  # type: ignore[misc]
+def match_new_student(student_id: int) -> int | None:
+    """Try to offer a group to a student who has just started waiting for one.  Returns id of the new group."""
+    group = IncrementalGroupBuilder.create_group_for_student(student_id)
+    return group.pk if group is not None else None
+
+
+@shared_task(name="api.tasks.relay_bot_notifications")  # type: ignore[misc]
+def relay_bot_notifications() -> int:
+    """Send queued bot notifications to the bot webhook.  Returns number of sent notifications."""
+    return BotNotificationRelay.relay()
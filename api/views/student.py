@@ -10,7 +10,8 @@ from rest_framework.serializers import ListSerializer
 
 from api.exceptions import ConflictError
 from api.filters import StudentFilter
-from api.models import Student
+from api.models import DayAndTimeSlot, Student
+from api.models.auxil.availability_bitmask import AvailabilityBitmask
 from api.models.choices.status.project import StudentProjectStatus
 from api.processors import StudentProcessor
 from api.serializers import (
@@ -271,10 +272,13 @@ class DashboardStudentViewSet(
             data=request.query_params,
         )
         query_params_serializer.is_valid(raise_exception=True)
+        time_slot_ids = query_params_serializer.validated_data["time_slot_ids"]
+        slots_bitmask = AvailabilityBitmask.from_slots(
+            DayAndTimeSlot.objects.filter(pk__in=time_slot_ids).select_related("time_slot")
+        )
         matched_students = Student.objects.filter(
-            project_status=StudentProjectStatus.NO_GROUP_YET,
-            availability_slots__id__in=query_params_serializer.validated_data["time_slot_ids"],
-        ).distinct()
+            project_status=StudentProjectStatus.NO_GROUP_YET
+        ).filter_available_at_any(slots_bitmask)
         return Response(
             data=MinifiedStudentSerializer(matched_students, many=True).data,
             status=status.HTTP_200_OK,
@@ -7,12 +7,21 @@ os.environ.setdefault("DJANGO_SETTINGS_MODULE", "django_webapps.settings")
 
 app = Celery("django_webapps")
 app.config_from_object("django.conf:settings", namespace="CELERY")
-app.autodiscover_tasks(["celery_config", "alerts"])
+app.autodiscover_tasks(["celery_config", "alerts", "api"])
 
 app.conf.beat_schedule = {
-    "check-system-alerts-hourly": {
+    "check-changed-alerts": {
+        "task": "alerts.tasks.check_changed_alerts",
+        "schedule": crontab(minute="*/10"),
+    },
+    # consistency sweep: catches changes that were not marked as dirty (e.g. edits in admin)
+    "check-system-alerts-daily": {
         "task": "alerts.tasks.check_system_alerts",
-        "schedule": crontab(minute=0),
+        "schedule": crontab(minute=30, hour=3),
+    },
+    "relay-bot-notifications": {
+        "task": "api.tasks.relay_bot_notifications",
+        "schedule": crontab(),
     },
     # ...
 }
@@ -0,0 +1,314 @@
+import datetime
+import json
+import logging
+import platform
+import random
+import statistics
+import subprocess
+import time
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import connection, transaction
+from django.utils import timezone
+from model_bakery.recipe import Recipe
+
+from api.models import AgeRange, DayAndTimeSlot, LanguageAndLevel, PersonalInfo, Student, Teacher
+from api.models.auxil.constants import TIME_SLOTS
+from api.models.choices.age_range_type import AgeRangeType
+from api.models.choices.communication_language_mode import CommunicationLanguageMode
+from api.models.choices.status import StudentProjectStatus, TeacherProjectStatus
+from api.processors.services.batch_group_builder import BatchGroupBuilder
+from api.processors.services.group_builder import GroupBuilder
+from api.processors.services.simulation import QueryCounter, SimulationMeter, SimulationReport
+from api.processors.services.student_matching_index import StudentMatchingIndex
+from api.signals import refresh_availability_bitmasks
+
+DEFAULT_STUDENT_COUNTS = (1000,)
+DEFAULT_TEACHER_COUNTS = (100,)
+# _get_best_group_candidate is timed for this many teachers of every pool
+SAMPLED_TEACHER_COUNT = 20
+BULK_BATCH_SIZE = 2000
+
+# most people are available in the evening and on weekends
+TIME_SLOT_WEIGHTS = (1, 2, 2, 3, 6)
+DAY_WEIGHTS = (3, 3, 3, 3, 3, 5, 5)
+# English is learned much more often than other languages
+ENGLISH_WEIGHT = 10
+# most students and teachers are adults
+ADULT_AGE_WEIGHT = 5
+ADULT_AGE_FROM = 18
+ADULT_AGE_TO = 65
+COMMUNICATION_LANGUAGE_MODE_WEIGHTS = {
+    CommunicationLanguageMode.RU_ONLY: 4,
+    CommunicationLanguageMode.UA_ONLY: 3,
+    CommunicationLanguageMode.RU_OR_UA: 3,
+    CommunicationLanguageMode.L2_ONLY: 1,
+}
+
+personal_info_recipe = Recipe(PersonalInfo)
+student_recipe = Recipe(
+    Student,
+    project_status=StudentProjectStatus.NO_GROUP_YET,
+    situational_status="",
+)
+teacher_recipe = Recipe(
+    Teacher,
+    project_status=TeacherProjectStatus.NO_GROUP_YET,
+    situational_status="",
+)
+
+
+class PoolGenerator:
+    """Generates waiting students and available teachers with realistic levels and availability."""
+
+    def __init__(self, seed: int):
+        self.random = random.Random(seed)
+        self.languages_and_levels = list(LanguageAndLevel.objects.all())
+        self.language_and_level_weights = [
+            ENGLISH_WEIGHT if language_and_level.language_id == "en" else 1
+            for language_and_level in self.languages_and_levels
+        ]
+        self.student_age_ranges = list(AgeRange.objects.filter(type=AgeRangeType.STUDENT))
+        self.student_age_range_weights = self._get_age_range_weights(self.student_age_ranges)
+        self.teacher_age_ranges = list(AgeRange.objects.filter(type=AgeRangeType.TEACHER))
+        self.teacher_age_range_weights = self._get_age_range_weights(self.teacher_age_ranges)
+        self.slots_by_day_and_hour = {
+            (slot.day_of_week_index, slot.time_slot.from_utc_hour.hour): slot
+            for slot in DayAndTimeSlot.objects.select_related("time_slot")
+        }
+
+    def generate(self, student_count: int, teacher_count: int) -> None:
+        student_infos = self._make_personal_infos(student_count)
+        students = [
+            student_recipe.prepare(
+                personal_info=personal_info,
+                age_range=self.random.choices(self.student_age_ranges, weights=self.student_age_range_weights)[0],
+                status_since=self._get_status_since(),
+            )
+            for personal_info in student_infos
+        ]
+        Student.objects.bulk_create(students, batch_size=BULK_BATCH_SIZE)
+        self._set_levels_and_slots(Student, students, max_level_count=2)
+
+        teacher_infos = self._make_personal_infos(teacher_count)
+        teachers = [
+            teacher_recipe.prepare(
+                personal_info=personal_info,
+                simultaneous_groups=self.random.choice((1, 1, 2)),
+                weekly_frequency_per_group=self.random.choice((2, 2, 2, 3)),
+                status_since=self._get_status_since(),
+            )
+            for personal_info in teacher_infos
+        ]
+        Teacher.objects.bulk_create(teachers, batch_size=BULK_BATCH_SIZE)
+        self._set_levels_and_slots(Teacher, teachers, max_level_count=3)
+        Teacher.student_age_ranges.through.objects.bulk_create(
+            (
+                Teacher.student_age_ranges.through(teacher_id=teacher.pk, agerange_id=age_range.pk)
+                for teacher in teachers
+                for age_range in set(
+                    self.random.choices(
+                        self.teacher_age_ranges, weights=self.teacher_age_range_weights, k=self.random.randint(1, 2)
+                    )
+                )
+            ),
+            batch_size=BULK_BATCH_SIZE,
+        )
+
+    @staticmethod
+    def _get_age_range_weights(age_ranges: Sequence[AgeRange]) -> list[int]:
+        return [
+            ADULT_AGE_WEIGHT if age_range.age_from >= ADULT_AGE_FROM and age_range.age_to <= ADULT_AGE_TO else 1
+            for age_range in age_ranges
+        ]
+
+    def _make_personal_infos(self, count: int) -> list[PersonalInfo]:
+        modes = list(COMMUNICATION_LANGUAGE_MODE_WEIGHTS)
+        weights = list(COMMUNICATION_LANGUAGE_MODE_WEIGHTS.values())
+        personal_infos = [
+            personal_info_recipe.prepare(communication_language_mode=self.random.choices(modes, weights=weights)[0])
+            for _ in range(count)
+        ]
+        return PersonalInfo.objects.bulk_create(personal_infos, batch_size=BULK_BATCH_SIZE)
+
+    def _get_status_since(self) -> datetime.datetime:
+        return timezone.now() - datetime.timedelta(hours=self.random.randint(0, 24 * 60))
+
+    def _get_availability_slots(self) -> list[DayAndTimeSlot]:
+        """A few days a week, one or two adjacent time slots on each of them."""
+        days = set(self.random.choices(range(7), weights=DAY_WEIGHTS, k=self.random.randint(2, 5)))
+        slots = []
+        for day in days:
+            slot_index = self.random.choices(range(len(TIME_SLOTS)), weights=TIME_SLOT_WEIGHTS)[0]
+            for index in {slot_index, min(slot_index + self.random.randint(0, 1), len(TIME_SLOTS) - 1)}:
+                slot = self.slots_by_day_and_hour.get((day, TIME_SLOTS[index][0]))
+                if slot is not None:
+                    slots.append(slot)
+        return slots
+
+    def _set_levels_and_slots(
+        self, model: type[Student] | type[Teacher], people: Sequence[Student | Teacher], max_level_count: int
+    ) -> None:
+        person_field = f"{model._meta.model_name}_id"
+        model.teaching_languages_and_levels.through.objects.bulk_create(
+            (
+                model.teaching_languages_and_levels.through(
+                    **{person_field: person.pk, "languageandlevel_id": language_and_level.pk}
+                )
+                for person in people
+                for language_and_level in set(
+                    self.random.choices(
+                        self.languages_and_levels,
+                        weights=self.language_and_level_weights,
+                        k=self.random.randint(1, max_level_count),
+                    )
+                )
+            ),
+            batch_size=BULK_BATCH_SIZE,
+        )
+        model.availability_slots.through.objects.bulk_create(
+            (
+                model.availability_slots.through(**{person_field: person.pk, "dayandtimeslot_id": slot.pk})
+                for person in people
+                for slot in self._get_availability_slots()
+            ),
+            batch_size=BULK_BATCH_SIZE,
+        )
+        # bulk_create does not send m2m_changed
+        refresh_availability_bitmasks(model, [person.pk for person in people])
+
+
+class Command(BaseCommand):
+    """
+    Measures how group building scales with the number of students and teachers.
+    For every combination of --students and --teachers, a synthetic pool is generated,
+    then `_get_best_group_candidate`, the per-teacher `create_groups` run and the batch run are measured.
+    Everything is rolled back afterwards, results are written as JSON.
+    """
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--students", nargs="+", type=int, default=DEFAULT_STUDENT_COUNTS)
+        parser.add_argument("--teachers", nargs="+", type=int, default=DEFAULT_TEACHER_COUNTS)
+        parser.add_argument("--seed", type=int, default=0, help="Seed for generating pools")
+        parser.add_argument("--output", type=Path, help="JSON file for results (default: print to stdout)")
+
+    def handle(self, *_: str, **options: Any) -> None:
+        # debug logging of group building would dominate the timings
+        logging.disable(logging.DEBUG)
+        try:
+            results = {
+                "created_at": timezone.now().isoformat(),
+                # what was measured, so that results of different commits can be matched and compared
+                "environment": self.get_environment(),
+                "parameters": {
+                    "students": options["students"],
+                    "teachers": options["teachers"],
+                    "seed": options["seed"],
+                },
+                "scenarios": [
+                    self.run_scenario(student_count, teacher_count, options["seed"])
+                    for student_count in options["students"]
+                    for teacher_count in options["teachers"]
+                ],
+            }
+        finally:
+            logging.disable(logging.NOTSET)
+        output = json.dumps(results, indent=2)
+        if options["output"]:
+            options["output"].write_text(output)
+            self.stdout.write(f"Results written to {options['output']}")
+        else:
+            self.stdout.write(output)
+
+    @staticmethod
+    def get_environment() -> dict[str, Any]:
+        with connection.cursor() as cursor:
+            cursor.execute("SHOW server_version")
+            (postgres_version,) = cursor.fetchone()
+        return {
+            "git_revision": Command.get_git_revision(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "postgres": postgres_version,
+        }
+
+    @staticmethod
+    def get_git_revision() -> str | None:
+        """Revision of the checked out commit, with "-dirty" if the tree has uncommitted changes."""
+        try:
+            revision = subprocess.run(
+                ["git", "rev-parse", "HEAD"], cwd=settings.BASE_DIR, capture_output=True, text=True, check=True
+            ).stdout.strip()
+            changes = subprocess.run(
+                ["git", "status", "--porcelain", "--untracked-files=no"],
+                cwd=settings.BASE_DIR,
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout
+        except (OSError, subprocess.CalledProcessError):
+            return None
+        return f"{revision}-dirty" if changes else revision
+
+    def run_scenario(self, student_count: int, teacher_count: int, seed: int) -> dict[str, Any]:
+        self.stderr.write(f"Benchmarking {student_count} students, {teacher_count} teachers...")
+        with transaction.atomic():
+            start = time.perf_counter()
+            PoolGenerator(seed).generate(student_count, teacher_count)
+            result: dict[str, Any] = {
+                "students": student_count,
+                "teachers": teacher_count,
+                "generation_seconds": time.perf_counter() - start,
+                "best_group_candidate": self.measure_best_group_candidate(),
+                "create_groups": self.measure_and_roll_back(self.create_groups_per_teacher),
+                "create_groups_batch": self.measure_and_roll_back(BatchGroupBuilder.create_and_save_groups),
+            }
+            transaction.set_rollback(True)
+        return result
+
+    @staticmethod
+    def measure_best_group_candidate() -> dict[str, Any]:
+        student_index = StudentMatchingIndex.load()
+        teacher_ids = list(BatchGroupBuilder._get_teachers(None).values_list("pk", flat=True)[:SAMPLED_TEACHER_COUNT])
+        durations = []
+        query_counts = []
+        for teacher_id in teacher_ids:
+            start = time.perf_counter()
+            with QueryCounter() as query_counter:
+                GroupBuilder._get_best_group_candidate(teacher_id, student_index)
+            durations.append(time.perf_counter() - start)
+            query_counts.append(query_counter.count)
+        return {
+            "teachers_sampled": len(teacher_ids),
+            "mean_seconds": statistics.fmean(durations) if durations else None,
+            "max_seconds": max(durations, default=None),
+            "queries_per_teacher": max(query_counts, default=None),
+        }
+
+    @staticmethod
+    def create_groups_per_teacher() -> int:
+        """The default path of `create_groups`: teachers one by one with a shared student index."""
+        student_index = StudentMatchingIndex.load()
+        groups = [
+            GroupBuilder.create_and_save_group(teacher.pk, student_index)
+            for teacher in GroupBuilder.get_available_teachers()
+        ]
+        return sum(group is not None for group in groups)
+
+    @staticmethod
+    def measure_and_roll_back(run: Any) -> dict[str, Any]:
+        with transaction.atomic():
+            with SimulationMeter(SimulationReport()) as report:
+                created = run()
+            transaction.set_rollback(True)
+        return {
+            "groups_created": created if isinstance(created, int) else len(created),
+            "seconds": report.duration.total_seconds(),
+            "queries": report.query_count,
+            "peak_memory_bytes": report.peak_memory_bytes,
+        }
@@ -1,3 +1,4 @@
+import datetime
 import logging
 from collections.abc import Collection, Iterable
 from typing import Any
@@ -5,7 +6,18 @@ from typing import Any
 from django.core.management.base import BaseCommand, CommandError, CommandParser
 
 from api.models import Teacher
+from api.processors.services.batch_group_builder import BatchGroupBuilder
 from api.processors.services.group_builder import GroupBuilder
+from api.processors.services.group_solvers import (
+    DEFAULT_SOLVER_TIME_BUDGET,
+    GreedyGroupSolver,
+    GroupSolver,
+    MaxPlacementGroupSolver,
+)
+from api.processors.services.parallel_group_builder import ParallelGroupBuilder
+from api.processors.services.seat_filler import SeatFiller
+from api.processors.services.simulation import SimulationReport
+from api.processors.services.student_matching_index import StudentMatchingIndex
 
 logger = logging.getLogger(__name__)
 # TODO: remove
@@ -16,29 +28,120 @@ class Command(BaseCommand):
     """
     Triggers automatic group creation.
     If teacher_ids are not specified, triggers for all available teachers.
+    With --batch, plans groups for all teachers at once and saves them in one transaction.
+    With --batch --solver max_placement, places as many students as possible within --time_budget seconds.
+    With --batch --workers N, partitions of teachers are planned in N processes.
+    With --fill_seats, first offers free seats in existing groups to waiting students.
+    With --dry_run, saves nothing and reports groups that would be formed, timings, query counts and peak memory.
+    A dry run plans the same way as the real one, including --workers and --partition.
     """
 
+    SOLVERS = ("greedy", "max_placement")
+
     def add_arguments(self, parser: CommandParser) -> None:
         parser.add_argument("--teacher_ids", nargs="*", type=int)
+        parser.add_argument(
+            "--batch",
+            action="store_true",
+            help="Plan groups for all teachers in memory and save them in one transaction",
+        )
+        parser.add_argument("--solver", choices=self.SOLVERS, default="greedy", help="Planning backend for --batch")
+        parser.add_argument(
+            "--time_budget",
+            type=float,
+            default=DEFAULT_SOLVER_TIME_BUDGET.total_seconds(),
+            help="Time budget of the max_placement solver, in seconds",
+        )
+        parser.add_argument("--workers", type=int, default=1, help="Number of planning processes for --batch")
+        parser.add_argument(
+            "--partition",
+            choices=(ParallelGroupBuilder.PARTITION_BY_COMPONENT, ParallelGroupBuilder.PARTITION_BY_LANGUAGE),
+            default=ParallelGroupBuilder.PARTITION_BY_COMPONENT,
+            help="How teachers are split between --workers",
+        )
+        parser.add_argument(
+            "--fill_seats",
+            action="store_true",
+            help="Offer free seats in existing groups before forming new ones",
+        )
+        parser.add_argument(
+            "--dry_run",
+            action="store_true",
+            help="Do not save anything, report what would be done",
+        )
 
     def handle(self, *_: str, **options: Any) -> None:
         teachers: Iterable[Teacher]
         custom_teacher_ids = options.get("teacher_ids")
+        if options["fill_seats"]:
+            proposals = SeatFiller.plan() if options["dry_run"] else SeatFiller.fill_groups()
+            seat_count = sum(len(students) for students in proposals.values())
+            self.stdout.write(f"Free seats offered: {seat_count} in {len(proposals)} groups")
+
+        if options["batch"]:
+            teacher_ids = [t.pk for t in self.get_teacher_ids(custom_teacher_ids)] if custom_teacher_ids else None
+            if options["dry_run"]:
+                if options["workers"] > 1:
+                    report = ParallelGroupBuilder.simulate(
+                        teacher_ids,
+                        self.get_solver(options),
+                        max_workers=options["workers"],
+                        partition_by=options["partition"],
+                    )
+                else:
+                    report = BatchGroupBuilder.simulate(teacher_ids, self.get_solver(options))
+                self.write_report(report)
+                return
+            if options["workers"] > 1:
+                groups = ParallelGroupBuilder.create_and_save_groups(
+                    teacher_ids,
+                    self.get_solver(options),
+                    max_workers=options["workers"],
+                    partition_by=options["partition"],
+                )
+            else:
+                groups = BatchGroupBuilder.create_and_save_groups(teacher_ids, self.get_solver(options))
+            self.stdout.write(f"Groups created: {len(groups)}")
+            return
+
         # Get all available teachers if none specified
         teachers = (
             self.get_teacher_ids(custom_teacher_ids) if custom_teacher_ids else GroupBuilder.get_available_teachers()
         )
+        if options["dry_run"]:
+            self.write_report(GroupBuilder.simulate([teacher.pk for teacher in teachers]))
+            return
 
+        student_index = StudentMatchingIndex.load()
         for teacher in teachers:
             logger.debug(teacher)
-            GroupBuilder.create_and_save_group(teacher.pk)
+            GroupBuilder.create_and_save_group(teacher.pk, student_index)
+
+    def write_report(self, report: SimulationReport) -> None:
+        for stats in report.teacher_stats:
+            found = f"{len(stats.group_candidate.students)} students" if stats.group_candidate else "no group"
+            self.stdout.write(
+                f"Teacher {stats.teacher_id}: {found}, "
+                f"{stats.duration.total_seconds():.3f} s, {stats.query_count} queries"
+            )
+        self.stdout.write(f"Groups that would be created: {len(report.group_candidates)}")
+        self.stdout.write(f"Students that would be offered a group: {report.placed_student_count}")
+        self.stdout.write(f"Total time: {report.duration.total_seconds():.3f} s")
+        self.stdout.write(f"Total queries: {report.query_count}")
+        self.stdout.write(f"Peak memory: {report.peak_memory_bytes / 2**20:.1f} MiB")
+
+    @staticmethod
+    def get_solver(options: dict[str, Any]) -> GroupSolver:
+        if options["solver"] == "max_placement":
+            return MaxPlacementGroupSolver(time_budget=datetime.timedelta(seconds=options["time_budget"]))
+        return GreedyGroupSolver()
 
     @staticmethod
     def get_teacher_ids(teacher_ids: Iterable[int]) -> Collection[Teacher]:
         teachers = []
         for teacher_id in teacher_ids:
             try:
-                teacher = Teacher.objects.get(pk=teacher_id)
+                teacher = Teacher.objects.annotate_with_free_group_capacity().get(pk=teacher_id)
             except Teacher.DoesNotExist:
                 raise CommandError(f"Teacher id does not exist: {teacher_id}")
             if not teacher.can_take_more_groups:
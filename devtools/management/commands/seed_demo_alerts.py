@@ -4,7 +4,6 @@ from typing import Any
 
 from django.contrib.contenttypes.models import ContentType
 from django.core.management.base import BaseCommand, CommandError
-from django.db import transaction
 
 from alerts.config import AlertConfig
 from alerts.models import Alert
@@ -78,16 +77,20 @@ class Command(BaseCommand):
                 self.stdout.write(self.style.SUCCESS(f"Enqueued demo alerts via Celery. Task id: {async_result.id}"))
             return
 
-        with transaction.atomic():
-            created = 0
-            for spec in alert_specs:
-                Alert.objects.create(
-                    alert_type=str(spec["alert_type"]),
-                    content_type_id=int(spec["content_type_id"]),
-                    object_id=int(spec["object_id"]),
-                    details=str(spec.get("details", "")),
-                )
-                created += 1
+        # objects that already have an active alert of the same type are skipped
+        created = len(
+            Alert.objects.create_missing(
+                [
+                    Alert(
+                        alert_type=str(spec["alert_type"]),
+                        content_type_id=int(spec["content_type_id"]),
+                        object_id=int(spec["object_id"]),
+                        details=str(spec.get("details", "")),
+                    )
+                    for spec in alert_specs
+                ]
+            )
+        )
         self.stdout.write(self.style.SUCCESS(f"Created {created} demo alert(s)."))
 
     def _build_specs(self, model: type[Any], obj_id: int | None, alert_type: str) -> list[dict[str, str | int]]:
@@ -129,6 +129,14 @@ CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = os.getenv("CELERY_TIMEZONE", "Europe/Berlin")
 
+# Try to form a group for a student as soon as they start waiting for one (see `api.tasks.match_new_student`)
+INCREMENTAL_MATCHING_ENABLED = os.getenv("INCREMENTAL_MATCHING_ENABLED", "False") == "True"
+
+# Bot endpoint that receives queued notifications (see `api.tasks.relay_bot_notifications`).
+# Notifications are kept in the queue while it is empty.
+BOT_WEBHOOK_URL = os.getenv("BOT_WEBHOOK_URL", "")
+BOT_WEBHOOK_TIMEOUT_SECONDS = float(os.getenv("BOT_WEBHOOK_TIMEOUT_SECONDS", "10"))
+
 CACHES = {
     "default": {
         "BACKEND": "django_redis.cache.RedisCache",
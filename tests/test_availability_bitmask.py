@@ -0,0 +1,56 @@
+import datetime
+
+from model_bakery import baker
+
+from api.models import DayAndTimeSlot, Group, Student, Teacher
+from api.models.auxil.availability_bitmask import AvailabilityBitmask
+
+
+def _get_slots(*day_of_week_indices: int) -> list[DayAndTimeSlot]:
+    return list(
+        DayAndTimeSlot.objects.filter(day_of_week_index__in=day_of_week_indices, time_slot__from_utc_hour__hour=8)
+    )
+
+
+def test_student_bitmask_follows_availability_slots():
+    monday, wednesday = _get_slots(0, 2)
+    student = baker.make(Student, availability_slots=[monday])
+    assert student.availability_bitmask == AvailabilityBitmask.from_slots([monday])
+
+    student.availability_slots.add(wednesday)
+    student.refresh_from_db()
+    assert student.availability_bitmask == AvailabilityBitmask.from_slots([monday, wednesday])
+
+    student.availability_slots.remove(monday)
+    student.refresh_from_db()
+    assert student.availability_bitmask == AvailabilityBitmask.from_slots([wednesday])
+
+
+def test_teacher_bitmask_follows_reverse_side_of_relation():
+    monday, wednesday = _get_slots(0, 2)
+    teacher = baker.make(Teacher, availability_slots=[monday, wednesday])
+
+    monday.teacher_set.clear()
+    teacher.refresh_from_db()
+    assert teacher.availability_bitmask == AvailabilityBitmask.from_slots([wednesday])
+
+
+def test_filter_available_at_all_and_any():
+    monday, wednesday, friday = _get_slots(0, 2, 4)
+    student_monday_wednesday = baker.make(Student, availability_slots=[monday, wednesday])
+    student_friday = baker.make(Student, availability_slots=[friday])
+    monday_and_friday = AvailabilityBitmask.from_slots([monday, friday])
+
+    assert not Student.objects.filter_available_at_all(monday_and_friday).exists()
+    assert set(Student.objects.filter_available_at_any(monday_and_friday)) == {
+        student_monday_wednesday,
+        student_friday,
+    }
+
+
+def test_group_schedule_bitmask_matches_slots_of_lesson_times():
+    group = baker.make(Group, monday=datetime.time(9, 30), thursday=datetime.time(18, 0))
+
+    monday_slot = DayAndTimeSlot.objects.get(day_of_week_index=0, time_slot__from_utc_hour__hour=8)
+    thursday_slot = DayAndTimeSlot.objects.get(day_of_week_index=3, time_slot__from_utc_hour__hour=17)
+    assert group.schedule_bitmask == AvailabilityBitmask.from_slots([monday_slot, thursday_slot])
@@ -0,0 +1,154 @@
+import json
+import threading
+import urllib.request
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from django.utils import timezone
+from model_bakery import baker
+
+from api.models import Coordinator, Group, PersonalInfo, Student, Teacher
+from api.models.bot_notification import BotNotification
+from api.models.choices.log_event_type import StudentLogEventType
+from api.models.choices.status import GroupProjectStatus
+from api.processors.actions.group.start import GroupStartProcessor
+from api.processors.actions.student.offer_join_group import StudentOfferJoinGroupProcessor
+from api.processors.services.bot_notification_relay import BotNotificationRelay
+
+
+class StubBot(BaseHTTPRequestHandler):
+    """Webhook of the bot that records received requests and answers with `response_status`."""
+
+    requests: list[dict] = []
+    response_status = HTTPStatus.OK
+
+    def do_POST(self):
+        self.requests.append(json.loads(self.rfile.read(int(self.headers["Content-Length"]))))
+        self.send_response(self.response_status)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_bot(settings):
+    StubBot.requests = []
+    StubBot.response_status = HTTPStatus.OK
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubBot)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    settings.BOT_WEBHOOK_URL = f"http://127.0.0.1:{server.server_port}/notifications"
+    yield StubBot
+    server.shutdown()
+    server.server_close()
+
+
+def _make_person(model, chat_id):
+    return baker.make(model, personal_info=baker.make(PersonalInfo, registration_telegram_bot_chat_id=chat_id))
+
+
+def test_group_processor_queues_notifications_for_people_with_chat():
+    student_with_chat = _make_person(Student, chat_id=101)
+    student_without_chat = _make_person(Student, chat_id=None)
+    teacher = _make_person(Teacher, chat_id=201)
+    group = baker.make(
+        Group,
+        _fill_optional=True,
+        project_status=GroupProjectStatus.AWAITING_START,
+        coordinators=[_make_person(Coordinator, chat_id=None)],
+        students=[student_with_chat, student_without_chat],
+        teachers=[teacher],
+    )
+
+    GroupStartProcessor(group).process()
+
+    notifications = {notification.chat_id: notification for notification in BotNotification.objects.all()}
+    assert set(notifications) == {101, 201}
+    assert notifications[101].event_type == StudentLogEventType.STUDY_START
+    assert notifications[101].payload["object"] == "student"
+    assert notifications[101].payload["object_id"] == student_with_chat.pk
+
+
+def test_student_processor_queues_notification():
+    student = _make_person(Student, chat_id=101)
+    group = baker.make(Group, _fill_optional=True)
+
+    StudentOfferJoinGroupProcessor(student, group).process()
+
+    notification = BotNotification.objects.get()
+    assert notification.chat_id == student.personal_info.registration_telegram_bot_chat_id
+    assert notification.event_type == StudentLogEventType.GROUP_OFFERED
+    assert notification.payload["to_group_id"] == group.pk
+
+
+def test_relay_sends_notifications_for_one_chat_in_one_request(stub_bot):
+    notifications = [
+        baker.make(BotNotification, chat_id=chat_id, event_type=event_type, payload={"type": event_type})
+        for chat_id, event_type in ((101, "first"), (101, "second"), (201, "other"))
+    ]
+
+    assert BotNotificationRelay.relay() == len(notifications)
+
+    assert sorted(stub_bot.requests, key=lambda request: request["chat_id"]) == [
+        {"chat_id": 101, "notifications": [{"type": "first"}, {"type": "second"}]},
+        {"chat_id": 201, "notifications": [{"type": "other"}]},
+    ]
+    assert not BotNotification.objects.exists()
+
+
+def test_relay_retries_failed_notifications_later(stub_bot):
+    stub_bot.response_status = HTTPStatus.SERVICE_UNAVAILABLE
+    notification = baker.make(BotNotification, chat_id=101, payload={"type": "first"})
+
+    assert BotNotificationRelay.relay() == 0
+    notification.refresh_from_db()
+    assert notification.attempts == 1
+    assert notification.next_attempt_at > timezone.now()
+
+    stub_bot.response_status = HTTPStatus.OK
+    assert BotNotificationRelay.relay() == 0
+    assert len(stub_bot.requests) == 1
+
+
+def test_relay_does_not_claim_notifications_claimed_by_another_relay():
+    baker.make(BotNotification, chat_id=101, payload={"type": "first"})
+
+    claimed, claim_expires_at = BotNotificationRelay._claim_batch()
+
+    assert len(claimed) == 1
+    assert BotNotification.objects.get().next_attempt_at == claim_expires_at
+    assert BotNotificationRelay._claim_batch()[0] == []
+
+
+def test_relay_keeps_results_of_batch_when_one_request_fails_unexpectedly(stub_bot, monkeypatch):
+    sent_chat_id, failing_chat_id = 101, 201
+    for chat_id in (sent_chat_id, failing_chat_id):
+        baker.make(BotNotification, chat_id=chat_id, payload={"type": "first"})
+    urlopen = urllib.request.urlopen
+
+    def fail_for_second_chat(request, timeout):
+        if json.loads(request.data)["chat_id"] == failing_chat_id:
+            raise ValueError("unexpected")
+        return urlopen(request, timeout=timeout)
+
+    monkeypatch.setattr(urllib.request, "urlopen", fail_for_second_chat)
+
+    assert BotNotificationRelay.relay() == 1
+    assert [request["chat_id"] for request in stub_bot.requests] == [sent_chat_id]
+    notification = BotNotification.objects.get()
+    assert notification.chat_id == failing_chat_id
+    assert notification.attempts == 1
+
+
+def test_relay_leaves_notifications_it_has_no_time_to_send_due(stub_bot, settings):
+    settings.BOT_WEBHOOK_TIMEOUT_SECONDS = BotNotificationRelay.CLAIM_TIMEOUT.total_seconds()
+    notification = baker.make(BotNotification, chat_id=101, payload={"type": "first"})
+
+    assert BotNotificationRelay._relay_batch() == (0, 1)
+
+    assert not stub_bot.requests
+    notification.refresh_from_db()
+    assert notification.attempts == 0
+    assert notification.next_attempt_at <= timezone.now()
@@ -1,12 +1,54 @@
 import copy
+import io
+import itertools
+import json
+import math
+from unittest import mock
 
 import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 from model_bakery import baker
 
-from api.models import AgeRange, LanguageAndLevel, Student, Teacher
+from api.models import (
+    AgeRange,
+    DayAndTimeSlot,
+    Group,
+    GroupLogEvent,
+    LanguageAndLevel,
+    Student,
+    StudentLogEvent,
+    Teacher,
+)
+from api.models.auxil.availability_bitmask import AvailabilityBitmask
+from api.models.choices.age_range_type import AgeRangeType
 from api.models.choices.communication_language_mode import CommunicationLanguageMode
+from api.models.choices.status import (
+    GroupProjectStatus,
+    StudentProjectStatus,
+    StudentSituationalStatus,
+    TeacherProjectStatus,
+    TeacherSituationalStatus,
+)
+from api.processors.actions import StudentPutInWaitingQueueProcessor
+from api.processors.services.batch_group_builder import BatchGroupBuilder
 from api.processors.services.group_builder import MAX_WAITING_TIME, GroupBuilder, GroupCandidate
+from api.processors.services.group_solvers import (
+    MAX_CANDIDATES_PER_SEAT,
+    GreedyGroupSolver,
+    MaxPlacementGroupSolver,
+    _TimeBudgetExceededError,
+)
+from api.processors.services.lesson_time_table import LessonTimeTable
+from api.processors.services.parallel_group_builder import ParallelGroupBuilder, PlannedGroup
+from api.processors.services.seat_filler import SeatFiller
+from api.processors.services.simulation import SimulationReport
+from api.processors.services.student_matching_index import StudentMatchingIndex
+from api.processors.services.teacher_matching_index import TeacherMatchingIndex
+from api.tasks import match_new_student
 
 
 @pytest.fixture
@@ -58,4 +100,490 @@ def test_compare_priority_with_more_waiting_students(group_candidate):
     assert GroupBuilder._compare_groups_priority(group_candidate, other_group_candidate) == -1
 
 
+def _make_teacher(language_and_level, availability_slots) -> Teacher:
+    return baker.make(
+        Teacher,
+        personal_info__communication_language_mode=CommunicationLanguageMode.RU_ONLY,
+        project_status=TeacherProjectStatus.NO_GROUP_YET,
+        situational_status="",
+        simultaneous_groups=1,
+        weekly_frequency_per_group=2,
+        teaching_languages_and_levels=[language_and_level],
+        student_age_ranges=[AgeRange.objects.get(type=AgeRangeType.TEACHER, age_from=18, age_to=65)],
+        availability_slots=availability_slots,
+    )
+
+
+def _make_students(language_and_level, availability_slots, quantity, **kwargs) -> list[Student]:
+    return baker.make(
+        Student,
+        personal_info__communication_language_mode=CommunicationLanguageMode.RU_ONLY,
+        project_status=StudentProjectStatus.NO_GROUP_YET,
+        situational_status="",
+        age_range=AgeRange.objects.get(type=AgeRangeType.STUDENT, age_from=21, age_to=25),
+        teaching_languages_and_levels=[language_and_level],
+        availability_slots=availability_slots,
+        _quantity=quantity,
+        **kwargs,
+    )
+
+
+@pytest.fixture
+def language_and_level():
+    return LanguageAndLevel.objects.get(level_id="B1", language_id="en")
+
+
+@pytest.fixture
+def lesson_slots():
+    """Monday and Wednesday slots at the same time of day: a valid pair for two lessons a week."""
+    return list(DayAndTimeSlot.objects.filter(day_of_week_index__in=(0, 2)).order_by("time_slot")[:2])
+
+
+def test_create_and_save_group_offers_group_to_matching_students(language_and_level, lesson_slots):
+    teacher = _make_teacher(language_and_level, lesson_slots)
+    students = _make_students(language_and_level, lesson_slots, quantity=6)
+    # students with another level must not be offered the group
+    _make_students(LanguageAndLevel.objects.get(level_id="A1", language_id="en"), lesson_slots, quantity=6)
+
+    group = GroupBuilder.create_and_save_group(teacher.pk)
+
+    assert group is not None
+    assert group.project_status == GroupProjectStatus.PENDING
+    assert set(group.students.all()) == set(students)
+    for student in students:
+        student.refresh_from_db()
+        assert student.situational_status == StudentSituationalStatus.GROUP_OFFERED
+
+
+def test_create_and_save_group_returns_none_without_enough_students(language_and_level, lesson_slots):
+    teacher = _make_teacher(language_and_level, lesson_slots)
+    _make_students(language_and_level, lesson_slots[:1], quantity=6)
+
+    assert GroupBuilder.create_and_save_group(teacher.pk) is None
+
+
+def test_student_index_skips_removed_students(language_and_level, lesson_slots):
+    students = _make_students(language_and_level, lesson_slots, quantity=6)
+    student_index = StudentMatchingIndex.load()
+    student_index.remove(students[:2])
+
+    found_students = student_index.get_students(
+        language_and_level=language_and_level,
+        age_range=AgeRange.objects.get(type=AgeRangeType.TEACHER, age_from=18, age_to=65),
+        communication_language=CommunicationLanguageMode.RU_ONLY,
+        day_time_slots=lesson_slots,
+        max_students_num=10,
+    )
+
+    assert set(found_students) == set(students[2:])
+
+
+def test_best_group_candidate_query_count_does_not_depend_on_slot_count(language_and_level, lesson_slots):
+    _make_students(language_and_level, lesson_slots, quantity=6)
+    teacher_with_few_slots = _make_teacher(language_and_level, lesson_slots)
+    teacher_with_all_slots = _make_teacher(language_and_level, list(DayAndTimeSlot.objects.all()))
+    student_index = StudentMatchingIndex.load()
+
+    with CaptureQueriesContext(connection) as few_slots_queries:
+        GroupBuilder._get_best_group_candidate(teacher_with_few_slots.pk, student_index)
+    with CaptureQueriesContext(connection) as all_slots_queries:
+        GroupBuilder._get_best_group_candidate(teacher_with_all_slots.pk, student_index)
+
+    assert len(few_slots_queries) == len(all_slots_queries)
+
+
+def test_batch_builder_offers_each_student_only_once(language_and_level, lesson_slots):
+    teachers = [_make_teacher(language_and_level, lesson_slots) for _ in range(3)]
+    students = _make_students(language_and_level, lesson_slots, quantity=15)
+
+    groups = BatchGroupBuilder.create_and_save_groups()
+
+    # 15 students are enough for one full group (10) and one more group with 5 students
+    expected_group_count = 2
+    assert len(groups) == expected_group_count
+    grouped_students = [student for group in groups for student in group.students.all()]
+    assert len(grouped_students) == len(set(grouped_students)) == len(students)
+    assert {teacher for group in groups for teacher in group.teachers.all()} < set(teachers)
+    assert GroupLogEvent.objects.filter(group__in=groups).count() == expected_group_count
+    assert StudentLogEvent.objects.filter(to_group__in=groups).count() == len(students)
+    for group in groups:
+        assert group.project_status == GroupProjectStatus.PENDING
+        assert group.schedule_bitmask == group.get_schedule_bitmask() != 0
+        assert group.teachers.get().situational_status == TeacherSituationalStatus.GROUP_OFFERED
+
+
+def test_batch_builder_query_count_does_not_depend_on_teacher_count(language_and_level, lesson_slots):
+    _make_teacher(language_and_level, lesson_slots)
+    _make_students(language_and_level, lesson_slots, quantity=5)
+    with CaptureQueriesContext(connection) as one_teacher_queries:
+        BatchGroupBuilder.create_and_save_groups()
+
+    teacher_count = 3
+    for _ in range(teacher_count):
+        _make_teacher(language_and_level, lesson_slots)
+    _make_students(language_and_level, lesson_slots, quantity=10 * teacher_count)
+    with CaptureQueriesContext(connection) as many_teachers_queries:
+        groups = BatchGroupBuilder.create_and_save_groups()
+
+    assert len(groups) == teacher_count
+    assert len(one_teacher_queries) == len(many_teachers_queries)
+
+
+def test_get_available_teachers_counts_groups_in_one_query(language_and_level, lesson_slots):
+    free_teacher, busy_teacher, teacher_with_free_seat = (
+        _make_teacher(language_and_level, lesson_slots) for _ in range(3)
+    )
+    teacher_with_free_seat.simultaneous_groups = 2
+    teacher_with_free_seat.save()
+    for teacher in (busy_teacher, teacher_with_free_seat):
+        baker.make(Group, _fill_optional=True, teachers=[teacher])
+
+    with CaptureQueriesContext(connection) as one_teacher_queries:
+        list(GroupBuilder.get_available_teachers().filter(pk=free_teacher.pk))
+    with CaptureQueriesContext(connection) as all_teachers_queries:
+        teachers = list(GroupBuilder.get_available_teachers())
+        assert all(teacher.can_take_more_groups for teacher in teachers)
+
+    assert set(teachers) == {free_teacher, teacher_with_free_seat}
+    assert len(one_teacher_queries) == len(all_teachers_queries)
+
+
+@pytest.fixture
+def teachers_competing_for_students(language_and_level, lesson_slots):
+    """The teacher who has waited longer can teach at any time, the other one only on Monday and Wednesday.
+
+    If the first teacher takes the larger Monday and Wednesday group, the other one is left without students.
+    """
+    other_lesson_slots = list(DayAndTimeSlot.objects.filter(day_of_week_index__in=(1, 3)).order_by("time_slot")[:2])
+    flexible_teacher = _make_teacher(language_and_level, lesson_slots + other_lesson_slots)
+    _make_teacher(language_and_level, lesson_slots)
+    _make_students(language_and_level, lesson_slots, quantity=10)
+    _make_students(language_and_level, other_lesson_slots, quantity=5)
+    return flexible_teacher
+
+
+@pytest.mark.usefixtures("teachers_competing_for_students")
+def test_greedy_solver_gives_first_teacher_the_largest_group():
+    group_candidates = BatchGroupBuilder.plan_groups(solver=GreedyGroupSolver())
+
+    placed_students = 10
+    assert [len(group_candidate.students) for group_candidate in group_candidates] == [placed_students]
+
+
+@pytest.mark.usefixtures("teachers_competing_for_students")
+def test_max_placement_solver_places_more_students_than_greedy():
+    group_candidates = BatchGroupBuilder.plan_groups(solver=MaxPlacementGroupSolver())
+
+    placed_students = 15
+    assert sum(len(group_candidate.students) for group_candidate in group_candidates) == placed_students
+    assert len({group_candidate.teacher for group_candidate in group_candidates}) == len(group_candidates)
+    grouped_students = [student for group_candidate in group_candidates for student in group_candidate.students]
+    assert len(grouped_students) == len(set(grouped_students))
+
+
+def test_max_placement_solver_respects_group_size(language_and_level, lesson_slots):
+    for _ in range(2):
+        _make_teacher(language_and_level, lesson_slots)
+    # one full group leaves too few students for a second one, but two smaller groups take everyone
+    students = _make_students(language_and_level, lesson_slots, quantity=13)
+
+    group_candidates = BatchGroupBuilder.plan_groups(solver=MaxPlacementGroupSolver())
+
+    min_group_size, max_group_size = 5, 10
+    group_sizes = [len(group_candidate.students) for group_candidate in group_candidates]
+    assert sum(group_sizes) == len(students)
+    assert all(min_group_size <= size <= max_group_size for size in group_sizes)
+
+
+@pytest.mark.usefixtures("teachers_competing_for_students")
+def test_max_placement_solver_falls_back_to_greedy_assignment_when_time_runs_out(monkeypatch, caplog):
+    monkeypatch.setattr(MaxPlacementGroupSolver, "_assign_optimally", mock.Mock(side_effect=_TimeBudgetExceededError))
+
+    group_candidates = BatchGroupBuilder.plan_groups(solver=MaxPlacementGroupSolver())
+
+    # the most constrained teacher chooses first, so the greedy pass places everyone here too
+    placed_students = 15
+    assert sum(len(group_candidate.students) for group_candidate in group_candidates) == placed_students
+    assert "stopped by time budget" in caplog.text
+
+
+def test_max_placement_solver_caps_candidates_of_option(language_and_level, lesson_slots):
+    teacher = _make_teacher(language_and_level, lesson_slots)
+    _make_students(language_and_level, lesson_slots, quantity=35)
+    teacher = Teacher.objects.prefetch_for_matching().get(pk=teacher.pk)
+
+    options = MaxPlacementGroupSolver._get_options(teacher, StudentMatchingIndex.load(), deadline=math.inf)
+
+    assert options
+    assert all(len(option.students) == option.size.max * MAX_CANDIDATES_PER_SEAT for option in options)
+
+
+def test_simulation_saves_nothing(language_and_level, lesson_slots):
+    teachers = [_make_teacher(language_and_level, lesson_slots) for _ in range(2)]
+    students = _make_students(language_and_level, lesson_slots, quantity=6)
+
+    report = GroupBuilder.simulate([teacher.pk for teacher in teachers])
+
+    # the second teacher gets nothing: all students were taken by the first one
+    assert [stats.group_candidate is not None for stats in report.teacher_stats] == [True, False]
+    assert report.placed_student_count == len(students)
+    assert all(stats.query_count > 0 for stats in report.teacher_stats)
+    assert report.query_count > sum(stats.query_count for stats in report.teacher_stats)
+    assert report.peak_memory_bytes > 0
+    assert not Group.objects.exists()
+    assert not StudentLogEvent.objects.exists()
+    assert not Student.objects.exclude(situational_status="").exists()
+
+
+@pytest.mark.usefixtures("teachers_competing_for_students")
+def test_batch_simulation_saves_nothing():
+    report = BatchGroupBuilder.simulate(solver=MaxPlacementGroupSolver())
+
+    placed_students = 15
+    assert report.placed_student_count == placed_students
+    assert report.query_count > 0
+    assert not Group.objects.exists()
+
+
+def test_lesson_time_table_pairs_match_pairwise_check():
+    all_slots_bitmask = (1 << AvailabilityBitmask.BIT_COUNT) - 1
+    expected_pairs = [
+        (first, second)
+        for first, second in itertools.product(range(AvailabilityBitmask.BIT_COUNT), repeat=2)
+        if LessonTimeTable.days_have_break(
+            AvailabilityBitmask.get_day_of_week_index(first), AvailabilityBitmask.get_day_of_week_index(second)
+        )
+    ]
+
+    assert list(LessonTimeTable.iterate_combinations(all_slots_bitmask, lesson_count=2)) == expected_pairs
+
+
+def test_iterate_lesson_times_gives_triples_for_three_lessons_a_week(language_and_level):
+    slots = list(DayAndTimeSlot.objects.filter(day_of_week_index__in=(0, 2, 4, 6), time_slot__from_utc_hour__hour=8))
+    monday, wednesday, friday, sunday = slots
+    teacher = _make_teacher(language_and_level, slots)
+    teacher.weekly_frequency_per_group = 3
+
+    lesson_times = list(GroupBuilder._iterate_lesson_times(teacher))
+
+    # Monday, Friday and Sunday do not fit: Sunday is too close to Monday of the next week
+    assert lesson_times == [(monday, wednesday, friday), (wednesday, friday, sunday)]
+
+
+def test_match_new_student_offers_group_with_this_student(language_and_level, lesson_slots):
+    _make_teacher(LanguageAndLevel.objects.get(level_id="A1", language_id="en"), lesson_slots)
+    teacher = _make_teacher(language_and_level, lesson_slots)
+    waiting_students = _make_students(language_and_level, lesson_slots, quantity=4)
+    new_student = _make_students(language_and_level, lesson_slots, quantity=1)[0]
+
+    group = Group.objects.get(pk=match_new_student(new_student.pk))
+
+    assert group.teachers.get() == teacher
+    assert set(group.students.all()) == {new_student, *waiting_students}
+
+
+def test_match_new_student_does_nothing_for_offered_student(language_and_level, lesson_slots):
+    _make_teacher(language_and_level, lesson_slots)
+    _make_students(language_and_level, lesson_slots, quantity=4)
+    offered_student = _make_students(language_and_level, lesson_slots, quantity=1)[0]
+    offered_student.situational_status = StudentSituationalStatus.GROUP_OFFERED
+    offered_student.save()
+
+    assert match_new_student(offered_student.pk) is None
+    assert not Group.objects.exists()
+
+
+def test_teacher_index_returns_only_teachers_matching_student(language_and_level, lesson_slots):
+    matching_teacher = _make_teacher(language_and_level, lesson_slots)
+    _make_teacher(language_and_level, list(DayAndTimeSlot.objects.filter(day_of_week_index=6)))
+    _make_teacher(LanguageAndLevel.objects.get(level_id="A1", language_id="en"), lesson_slots)
+    teen_teacher = _make_teacher(language_and_level, lesson_slots)
+    teen_teacher.student_age_ranges.set(AgeRange.objects.filter(type=AgeRangeType.TEACHER, age_to__lte=17))
+    student = _make_students(language_and_level, lesson_slots, quantity=1)[0]
+
+    assert TeacherMatchingIndex.load().get_teachers(student) == [matching_teacher]
+
+
+@override_settings(INCREMENTAL_MATCHING_ENABLED=True)
+def test_put_in_waiting_queue_schedules_matching(language_and_level, lesson_slots, django_capture_on_commit_callbacks):
+    student = _make_students(language_and_level, lesson_slots, quantity=1)[0]
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        StudentPutInWaitingQueueProcessor(student).process()
+
+    assert len(callbacks) == 1
+
+
+def test_seat_filler_offers_free_seats_in_existing_group(language_and_level, lesson_slots):
+    teacher = _make_teacher(language_and_level, lesson_slots)
+    _make_students(language_and_level, lesson_slots, quantity=5)
+    group = GroupBuilder.create_and_save_group(teacher.pk)
+    waiting_students = _make_students(language_and_level, lesson_slots, quantity=7)
+    _make_students(LanguageAndLevel.objects.get(level_id="A1", language_id="en"), lesson_slots, quantity=3)
+
+    proposals = SeatFiller.fill_groups()
+
+    # an adult group takes up to 10 students, the longest waiting are offered seats first
+    free_seats = 5
+    assert proposals == {group: waiting_students[:free_seats]}
+    assert StudentLogEvent.objects.filter(to_group=group, student__in=waiting_students).count() == free_seats
+    for student in waiting_students[:free_seats]:
+        student.refresh_from_db()
+        assert student.situational_status == StudentSituationalStatus.GROUP_OFFERED
+    # offers that are not answered yet keep their seats
+    assert SeatFiller.fill_groups() == {}
+
+
+def test_seat_filler_skips_students_taken_after_planning(language_and_level, lesson_slots):
+    teacher = _make_teacher(language_and_level, lesson_slots)
+    _make_students(language_and_level, lesson_slots, quantity=5)
+    group = GroupBuilder.create_and_save_group(teacher.pk)
+    waiting_students = _make_students(language_and_level, lesson_slots, quantity=2)
+    proposals = SeatFiller.plan()
+    # another worker offers a group to one of the students after planning
+    taken_student, free_student = waiting_students
+    Student.objects.filter(pk=taken_student.pk).update(situational_status=StudentSituationalStatus.GROUP_OFFERED)
+
+    assert SeatFiller.propose(proposals) == {group: [free_student]}
+    assert not StudentLogEvent.objects.filter(to_group=group, student=taken_student).exists()
+
+
+def test_create_and_save_group_skips_students_taken_after_index_was_loaded(language_and_level, lesson_slots):
+    teacher = _make_teacher(language_and_level, lesson_slots)
+    students = _make_students(language_and_level, lesson_slots, quantity=7)
+    student_index = StudentMatchingIndex.load()
+    # another worker offers a group to some of the students after the index was loaded
+    taken_students = students[:2]
+    Student.objects.filter(pk__in=[s.pk for s in taken_students]).update(
+        situational_status=StudentSituationalStatus.GROUP_OFFERED
+    )
+
+    group = GroupBuilder.create_and_save_group(teacher.pk, student_index)
+
+    assert group is not None
+    assert set(group.students.all()) == set(students[2:])
+
+
+def test_batch_builder_skips_candidates_with_taken_teachers(language_and_level, lesson_slots):
+    teachers = [_make_teacher(language_and_level, lesson_slots) for _ in range(2)]
+    _make_students(language_and_level, lesson_slots, quantity=10)
+    group_candidates = BatchGroupBuilder.plan_groups()
+    Teacher.objects.filter(pk=teachers[0].pk).update(situational_status=TeacherSituationalStatus.GROUP_OFFERED)
+
+    assert BatchGroupBuilder.save_groups(group_candidates) == []
+
+
+def test_parallel_builder_partitions_teachers_by_connected_component(language_and_level, lesson_slots):
+    other_level_of_same_language = LanguageAndLevel.objects.get(level_id="A1", language_id="en")
+    other_language = LanguageAndLevel.objects.get(level_id="A1", language_id="de")
+    teacher = _make_teacher(language_and_level, lesson_slots)
+    other_level_teacher = _make_teacher(other_level_of_same_language, lesson_slots)
+    other_language_teacher = _make_teacher(other_language, lesson_slots)
+    # the student links both English levels into one component
+    student = _make_students(language_and_level, lesson_slots, quantity=1)[0]
+    student.teaching_languages_and_levels.add(other_level_of_same_language)
+
+    partitions = ParallelGroupBuilder.get_partitions(None, ParallelGroupBuilder.PARTITION_BY_COMPONENT)
+
+    assert {p.teacher_ids for p in partitions} == {
+        tuple(sorted((teacher.pk, other_level_teacher.pk))),
+        (other_language_teacher.pk,),
+    }
+
+
+def test_parallel_builder_merge_drops_conflicting_students():
+    age_range = AgeRange.objects.get(type=AgeRangeType.TEACHER, age_from=18, age_to=65)
+    first, second, third = (
+        PlannedGroup(
+            teacher_id=teacher_id,
+            student_ids=student_ids,
+            language_and_level_id=1,
+            age_range_id=age_range.pk,
+            communication_language_mode=CommunicationLanguageMode.RU_ONLY,
+            day_time_slot_ids=(),
+        )
+        for teacher_id, student_ids in ((1, (1, 2, 3, 4, 5)), (2, (5, 6, 7, 8, 9, 10)), (3, (1, 11, 12, 13, 14)))
+    )
+
+    merged_groups = ParallelGroupBuilder.merge([[first], [second, third]])
+
+    # the third group is left with 4 students, fewer than the minimum for adults
+    assert [g.student_ids for g in merged_groups] == [first.student_ids, (6, 7, 8, 9, 10)]
+
+
+def test_parallel_builder_saves_groups_of_all_partitions(language_and_level, lesson_slots):
+    other_language = LanguageAndLevel.objects.get(level_id="A1", language_id="de")
+    _make_teacher(language_and_level, lesson_slots)
+    _make_teacher(other_language, lesson_slots)
+    students = [
+        *_make_students(language_and_level, lesson_slots, quantity=5),
+        *_make_students(other_language, lesson_slots, quantity=5),
+    ]
+
+    groups = ParallelGroupBuilder.create_and_save_groups(partition_by=ParallelGroupBuilder.PARTITION_BY_LANGUAGE)
+
+    assert {student for group in groups for student in group.students.all()} == set(students)
+
+
+def test_parallel_builder_simulation_saves_nothing(language_and_level, lesson_slots):
+    _make_teacher(language_and_level, lesson_slots)
+    students = _make_students(language_and_level, lesson_slots, quantity=5)
+
+    report = ParallelGroupBuilder.simulate(partition_by=ParallelGroupBuilder.PARTITION_BY_LANGUAGE)
+
+    assert report.placed_student_count == len(students)
+    assert not Group.objects.exists()
+
+
+def test_create_groups_dry_run_simulates_parallel_run(monkeypatch):
+    simulate = mock.Mock(return_value=SimulationReport())
+    monkeypatch.setattr(ParallelGroupBuilder, "simulate", simulate)
+    worker_count = 2
+
+    call_command(
+        "create_groups",
+        "--batch",
+        "--dry_run",
+        "--workers",
+        str(worker_count),
+        "--partition",
+        ParallelGroupBuilder.PARTITION_BY_LANGUAGE,
+        stdout=io.StringIO(),
+    )
+
+    simulate.assert_called_once()
+    assert simulate.call_args.kwargs == {
+        "max_workers": worker_count,
+        "partition_by": ParallelGroupBuilder.PARTITION_BY_LANGUAGE,
+    }
+
+
+def test_benchmark_writes_results_as_json(tmp_path):
+    output = tmp_path / "results.json"
+    student_count = 30
+    teacher_count = 3
+
+    call_command(
+        "benchmark_group_builder",
+        "--students",
+        str(student_count),
+        "--teachers",
+        str(teacher_count),
+        "--output",
+        str(output),
+        stderr=io.StringIO(),
+        stdout=io.StringIO(),
+    )
+
+    results = json.loads(output.read_text())
+    assert results["parameters"] == {"students": [student_count], "teachers": [teacher_count], "seed": 0}
+    assert {"git_revision", "python", "django", "postgres"} <= results["environment"].keys()
+    (scenario,) = results["scenarios"]
+    assert scenario["students"] == student_count
+    assert scenario["teachers"] == teacher_count
+    assert {"seconds", "queries", "peak_memory_bytes"} <= scenario["create_groups_batch"].keys()
+    # generated pools are rolled back
+    assert not Student.objects.exists()
+
+
 # TODO: add more tests on building functionality
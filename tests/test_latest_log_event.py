@@ -0,0 +1,120 @@
+import datetime
+import re
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from model_bakery import baker
+
+from api.models import (
+    Coordinator,
+    CoordinatorLogEvent,
+    Group,
+    GroupLogEvent,
+    Student,
+    StudentLogEvent,
+    Teacher,
+    TeacherLogEvent,
+)
+from api.models.choices.log_event_type import (
+    CoordinatorLogEventType,
+    GroupLogEventType,
+    StudentLogEventType,
+    TeacherLogEventType,
+)
+from api.models.choices.status import GroupProjectStatus
+from api.models.log_event import LatestLogEvent
+from api.processors.actions.group.start import GroupStartProcessor
+from api.processors.auxil.log_event_creator import GroupLogEventCreator
+
+
+def _get_latest(obj, event_type):
+    return LatestLogEvent.objects.get(
+        content_type=ContentType.objects.get_for_model(obj), object_id=obj.pk, type=event_type
+    )
+
+
+def test_latest_log_event_keeps_later_event_of_type():
+    student = baker.make(Student)
+    now = timezone.now()
+    offer = StudentLogEvent.objects.create(student=student, type=StudentLogEventType.GROUP_OFFERED, date_time=now)
+    StudentLogEvent.objects.create(
+        student=student, type=StudentLogEventType.GROUP_OFFERED, date_time=now - datetime.timedelta(days=3)
+    )
+    declined = StudentLogEvent.objects.create(student=student, type=StudentLogEventType.DECLINED_OFFER)
+
+    latest_offer = _get_latest(student, StudentLogEventType.GROUP_OFFERED)
+    assert (latest_offer.event_id, latest_offer.date_time) == (offer.pk, offer.date_time)
+    assert _get_latest(student, StudentLogEventType.DECLINED_OFFER).event_id == declined.pk
+
+
+def test_latest_log_event_falls_back_to_previous_event_when_latest_is_deleted_or_changed():
+    student = baker.make(Student)
+    now = timezone.now()
+    earlier = StudentLogEvent.objects.create(
+        student=student, type=StudentLogEventType.GROUP_OFFERED, date_time=now - datetime.timedelta(days=3)
+    )
+    later = StudentLogEvent.objects.create(student=student, type=StudentLogEventType.GROUP_OFFERED, date_time=now)
+
+    later.type = StudentLogEventType.DECLINED_OFFER
+    later.save()
+    assert _get_latest(student, StudentLogEventType.GROUP_OFFERED).event_id == earlier.pk
+    assert _get_latest(student, StudentLogEventType.DECLINED_OFFER).event_id == later.pk
+
+    later.delete()
+    assert not LatestLogEvent.objects.filter(type=StudentLogEventType.DECLINED_OFFER).exists()
+
+
+def test_group_log_event_creator_records_latest_events_of_everyone_in_group():
+    students = baker.make(Student, _quantity=2)
+    teacher = baker.make(Teacher)
+    group = baker.make(Group, _fill_optional=True, students=students, teachers=[teacher])
+
+    GroupLogEventCreator.create(
+        group=group,
+        student_log_event_type=StudentLogEventType.GROUP_CONFIRMED,
+        teacher_log_event_type=TeacherLogEventType.GROUP_CONFIRMED,
+        group_log_event_type=GroupLogEventType.CONFIRMED,
+    )
+
+    for student in students:
+        event = StudentLogEvent.objects.get(student=student, type=StudentLogEventType.GROUP_CONFIRMED)
+        assert _get_latest(student, StudentLogEventType.GROUP_CONFIRMED).event_id == event.pk
+    event = TeacherLogEvent.objects.get(teacher=teacher, type=TeacherLogEventType.GROUP_CONFIRMED)
+    assert _get_latest(teacher, TeacherLogEventType.GROUP_CONFIRMED).event_id == event.pk
+    assert _get_latest(group, GroupLogEventType.CONFIRMED).date_time <= timezone.now()
+
+
+def test_group_processor_writes_log_events_of_all_kinds_together():
+    coordinator = baker.make(Coordinator)
+    students = baker.make(Student, _quantity=3)
+    teachers = baker.make(Teacher, _quantity=2)
+    group = baker.make(
+        Group,
+        _fill_optional=True,
+        project_status=GroupProjectStatus.AWAITING_START,
+        coordinators=[coordinator],
+        students=students,
+        teachers=teachers,
+    )
+
+    with CaptureQueriesContext(connection) as queries:
+        GroupStartProcessor(group).process()
+
+    log_tables = [
+        model._meta.db_table for model in (CoordinatorLogEvent, GroupLogEvent, StudentLogEvent, TeacherLogEvent)
+    ]
+    inserted_tables = [
+        re.match(r'INSERT INTO "?(\w+)', query["sql"]).group(1)
+        for query in queries
+        if query["sql"].startswith("INSERT INTO")
+    ]
+    assert sorted(table for table in inserted_tables if table in log_tables) == sorted(log_tables)
+    assert inserted_tables.count(LatestLogEvent._meta.db_table) == 1
+    assert _get_latest(coordinator, CoordinatorLogEventType.TOOK_NEW_GROUP)
+    assert _get_latest(group, GroupLogEventType.STARTED)
+    for student in students:
+        assert _get_latest(student, StudentLogEventType.STUDY_START)
+    for teacher in teachers:
+        assert _get_latest(teacher, TeacherLogEventType.STUDY_START)
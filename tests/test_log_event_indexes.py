@@ -0,0 +1,103 @@
+import pytest
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.utils import timezone
+
+from alerts.handlers.coordinator import CoordinatorOverdueLeaveHandler
+from alerts.handlers.student import StudentNoGroup30DaysHandler
+from alerts.handlers.teacher import TeacherNoGroup45DaysHandler
+from api.models import (
+    Coordinator,
+    CoordinatorLogEvent,
+    GroupLogEvent,
+    Student,
+    StudentLogEvent,
+    Teacher,
+    TeacherLogEvent,
+    TeacherUnder18LogEvent,
+)
+from api.models.choices.log_event_type import (
+    CoordinatorLogEventType,
+    GroupLogEventType,
+    StudentLogEventType,
+    TeacherLogEventType,
+    TeacherUnder18LogEventType,
+)
+from api.models.log_event import LatestLogEvent
+
+
+@pytest.fixture
+def plain_index_scans():
+    """Test tables are tiny, so the planner would rather scan them sequentially or build a bitmap and sort."""
+    with connection.cursor() as cursor:
+        cursor.execute("SET LOCAL enable_seqscan = off")
+        cursor.execute("SET LOCAL enable_bitmapscan = off")
+
+
+@pytest.fixture
+def analyzed_latest_log_events():
+    """Statistics of an empty table, e.g. after autovacuum has analyzed it, make all its indexes look equally good."""
+    now = timezone.now()
+    LatestLogEvent.objects.bulk_create(
+        LatestLogEvent(
+            content_type=ContentType.objects.get_for_model(model),
+            object_id=object_id,
+            type=StudentLogEventType.GROUP_OFFERED,
+            date_time=now,
+            event_id=object_id,
+        )
+        for model in (Coordinator, Student, Teacher)
+        for object_id in range(1, 1001)
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(f"ANALYZE {LatestLogEvent._meta.db_table}")
+
+
+@pytest.mark.usefixtures("plain_index_scans", "analyzed_latest_log_events")
+@pytest.mark.parametrize(
+    "handler_class",
+    [CoordinatorOverdueLeaveHandler, StudentNoGroup30DaysHandler, TeacherNoGroup45DaysHandler],
+)
+def test_alert_handlers_look_up_latest_event_by_key(handler_class):
+    plan = handler_class()._get_threshold_qs().explain()
+    assert "using latest_log_event_unique" in plan
+    assert "Sort" not in plan
+
+
+@pytest.mark.usefixtures("plain_index_scans")
+@pytest.mark.parametrize(
+    ("model", "object_field", "event_type", "index_name"),
+    [
+        (
+            CoordinatorLogEvent,
+            "coordinator",
+            CoordinatorLogEventType.REQUESTED_TRANSFER,
+            "coordinator_log_type_date_idx",
+        ),
+        (GroupLogEvent, "group", GroupLogEventType.FORMED, "group_log_type_date_idx"),
+        (StudentLogEvent, "student", StudentLogEventType.GROUP_OFFERED, "student_log_type_date_idx"),
+        (TeacherLogEvent, "teacher", TeacherLogEventType.GROUP_OFFERED, "teacher_log_type_date_idx"),
+        (TeacherUnder18LogEvent, "teacher", TeacherUnder18LogEventType.REGISTERED, "teacher18_log_type_date_idx"),
+    ],
+)
+def test_latest_event_of_type_is_looked_up_by_index(model, object_field, event_type, index_name):
+    plan = model.objects.filter(**{f"{object_field}_id": 1, "type": event_type}).order_by("-date_time")[:1].explain()
+    assert f"Index Scan using {index_name}" in plan
+    assert "Sort" not in plan
+
+
+@pytest.mark.usefixtures("plain_index_scans")
+@pytest.mark.parametrize(
+    ("model", "object_field", "index_name"),
+    [
+        (CoordinatorLogEvent, "coordinator", "coordinator_log_date_idx"),
+        (GroupLogEvent, "group", "group_log_date_idx"),
+        (StudentLogEvent, "student", "student_log_date_idx"),
+        (TeacherLogEvent, "teacher", "teacher_log_date_idx"),
+        (TeacherUnder18LogEvent, "teacher", "teacher18_log_date_idx"),
+    ],
+)
+def test_event_history_of_object_is_read_by_index(model, object_field, index_name):
+    plan = model.objects.filter(**{f"{object_field}_id": 1}).order_by("-date_time").explain()
+    assert f"Index Scan using {index_name}" in plan
+    assert "Sort" not in plan
@@ -1,11 +1,15 @@
 import datetime
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from model_bakery import baker
 
-from api.models import Group, Student, Teacher
+from api.models import Coordinator, Group, Student, Teacher
+from api.models.auxil.constants import CoordinatorGroupLimit
 from api.models.auxil.status_setter import StatusSetter
 from api.models.choices.status import (
+    CoordinatorProjectStatus,
     GroupProjectStatus,
     GroupSituationalStatus,
     StudentProjectStatus,
@@ -154,3 +158,135 @@ def test_group_abort_keeps_students_with_other_groups_studying(timestamp, availa
     group_two.refresh_from_db()
     assert student.project_status == StudentProjectStatus.STUDYING
     assert group_two.project_status == GroupProjectStatus.WORKING
+
+
+@pytest.mark.django_db
+def test_situational_statuses_are_recalculated_without_loading_people(timestamp, availability_slots):
+    pending_teacher, awaiting_teacher, unchanged_teacher = (
+        baker.make(Teacher, project_status=TeacherProjectStatus.NO_GROUP_YET, situational_status="") for _ in range(3)
+    )
+    teacher_without_groups = baker.make(
+        Teacher,
+        project_status=TeacherProjectStatus.NO_GROUP_YET,
+        situational_status=TeacherSituationalStatus.AWAITING_START,
+        status_since=timestamp - datetime.timedelta(days=1),
+    )
+    offered_student, student_without_groups = baker.make(
+        Student,
+        project_status=StudentProjectStatus.NO_GROUP_YET,
+        situational_status=StudentSituationalStatus.GROUP_OFFERED,
+        _quantity=2,
+    )
+    _make_group(
+        availability_slots=availability_slots,
+        timestamp=timestamp,
+        teachers=[pending_teacher],
+        students=[offered_student],
+        project_status=GroupProjectStatus.PENDING,
+    )
+    _make_group(
+        availability_slots=availability_slots,
+        timestamp=timestamp,
+        teachers=[awaiting_teacher],
+        students=[],
+        project_status=GroupProjectStatus.AWAITING_START,
+    )
+
+    with CaptureQueriesContext(connection) as queries:
+        StatusSetter.update_related_statuses_for_people(
+            teachers=Teacher.objects.all(), students=Student.objects.all(), timestamp=timestamp
+        )
+
+    # only primary keys of people whose status changes are read
+    selected = {
+        query["sql"].split(" FROM ")[0]
+        for query in queries
+        if query["sql"].startswith("SELECT") and "django_content_type" not in query["sql"]
+    }
+    assert selected == {
+        'SELECT "api_teacher"."personal_info_id" AS "pk"',
+        'SELECT "api_student"."personal_info_id" AS "pk"',
+    }
+    statuses = dict(Teacher.objects.values_list("pk", "situational_status"))
+    assert statuses == {
+        pending_teacher.pk: TeacherSituationalStatus.GROUP_OFFERED,
+        awaiting_teacher.pk: TeacherSituationalStatus.AWAITING_START,
+        unchanged_teacher.pk: "",
+        teacher_without_groups.pk: "",
+    }
+    unchanged_teacher.refresh_from_db()
+    teacher_without_groups.refresh_from_db()
+    assert unchanged_teacher.status_since != timestamp
+    assert teacher_without_groups.status_since == timestamp
+    offered_student.refresh_from_db()
+    student_without_groups.refresh_from_db()
+    assert offered_student.situational_status == StudentSituationalStatus.GROUP_OFFERED
+    assert student_without_groups.situational_status == ""
+
+
+@pytest.mark.django_db
+def test_coordinator_statuses_are_updated_only_for_given_coordinators_whose_bucket_changes(timestamp):
+    long_ago = timestamp - datetime.timedelta(days=1)
+    reaching_min, staying_below, not_given = baker.make(
+        Coordinator,
+        project_status=CoordinatorProjectStatus.WORKING_BELOW_THRESHOLD,
+        status_since=long_ago,
+        _quantity=3,
+    )
+    monday = datetime.time(10, 0)
+    baker.make(Group, monday=monday, coordinators=[reaching_min, not_given], _quantity=CoordinatorGroupLimit.MIN)
+    baker.make(Group, monday=monday, coordinators=[staying_below])
+
+    StatusSetter.update_statuses_of_coordinators(
+        Coordinator.objects.filter(pk__in=[reaching_min.pk, staying_below.pk]), timestamp
+    )
+
+    for coordinator in (reaching_min, staying_below, not_given):
+        coordinator.refresh_from_db()
+    assert (reaching_min.project_status, reaching_min.status_since) == (CoordinatorProjectStatus.WORKING_OK, timestamp)
+    assert (staying_below.project_status, staying_below.status_since) == (
+        CoordinatorProjectStatus.WORKING_BELOW_THRESHOLD,
+        long_ago,
+    )
+    assert not_given.project_status == CoordinatorProjectStatus.WORKING_BELOW_THRESHOLD
+
+
+@pytest.mark.django_db
+def test_set_status_writes_only_status_fields(timestamp, availability_slots):
+    group = _make_group(
+        availability_slots=availability_slots,
+        timestamp=timestamp,
+        teachers=[],
+        students=[],
+        project_status=GroupProjectStatus.PENDING,
+    )
+    Group.objects.filter(pk=group.pk).update(comment="changed elsewhere")
+
+    with CaptureQueriesContext(connection) as queries:
+        StatusSetter.set_status(obj=group, project_status=GroupProjectStatus.AWAITING_START, status_since=timestamp)
+
+    (update,) = [query["sql"] for query in queries if query["sql"].startswith('UPDATE "api_group"')]
+    assert '"comment"' not in update
+    group.refresh_from_db()
+    assert (group.project_status, group.status_since, group.comment) == (
+        GroupProjectStatus.AWAITING_START,
+        timestamp,
+        "changed elsewhere",
+    )
+
+
+@pytest.mark.django_db
+def test_set_statuses_updates_all_objects_in_one_query(timestamp):
+    students = baker.make(Student, project_status=StudentProjectStatus.NO_GROUP_YET, situational_status="", _quantity=3)
+
+    with CaptureQueriesContext(connection) as queries:
+        StatusSetter.set_statuses(
+            students, situational_status=StudentSituationalStatus.GROUP_OFFERED, status_since=timestamp
+        )
+
+    assert len([query for query in queries if query["sql"].startswith('UPDATE "api_student"')]) == 1
+    for student in students:
+        assert student.situational_status == StudentSituationalStatus.GROUP_OFFERED
+        student.refresh_from_db()
+        assert (student.situational_status, student.status_since) == (StudentSituationalStatus.GROUP_OFFERED, timestamp)
+        assert student.project_status == StudentProjectStatus.NO_GROUP_YET
@@ -163,12 +163,9 @@ class TestDashboardGroupStart:
         assert_date_time_with_timestamp(common_status_since, timestamp)
 
         for coordinator in group.coordinators.iterator():
-            assert coordinator.project_status in (
-                CoordinatorProjectStatus.WORKING_BELOW_THRESHOLD,
-                CoordinatorProjectStatus.WORKING_OK,
-                CoordinatorProjectStatus.WORKING_LIMIT_REACHED,
-            )
-            assert coordinator.status_since == common_status_since
+            # the only group of the coordinator keeps them below threshold, so their row is not rewritten
+            assert coordinator.project_status == CoordinatorProjectStatus.WORKING_BELOW_THRESHOLD
+            assert coordinator.status_since < common_status_since
 
             log_event: CoordinatorLogEvent = CoordinatorLogEvent.objects.get(coordinator_id=coordinator.pk)
             assert log_event.type == CoordinatorLogEventType.TOOK_NEW_GROUP
@@ -311,12 +308,9 @@ class TestDashboardGroupAbort:
         assert not active_group.coordinators.count()
 
         for coordinator in active_group.coordinators_former.iterator():
-            assert coordinator.project_status in (
-                CoordinatorProjectStatus.WORKING_BELOW_THRESHOLD,
-                CoordinatorProjectStatus.WORKING_OK,
-                CoordinatorProjectStatus.WORKING_LIMIT_REACHED,
-            )
-            assert coordinator.status_since == common_status_since
+            # the only group of the coordinator keeps them below threshold, so their row is not rewritten
+            assert coordinator.project_status == CoordinatorProjectStatus.WORKING_BELOW_THRESHOLD
+            assert coordinator.status_since < common_status_since
 
             log_event: CoordinatorLogEvent = CoordinatorLogEvent.objects.get(coordinator_id=coordinator.pk)
             assert log_event.type == CoordinatorLogEventType.GROUP_ABORTED
@@ -553,12 +547,9 @@ class TestDashboardGroupFinish:
         assert not active_group.coordinators.count()
 
         for coordinator in active_group.coordinators_former.iterator():
-            assert coordinator.project_status in (
-                CoordinatorProjectStatus.WORKING_BELOW_THRESHOLD,
-                CoordinatorProjectStatus.WORKING_OK,
-                CoordinatorProjectStatus.WORKING_LIMIT_REACHED,
-            )
-            assert coordinator.status_since == common_status_since
+            # the only group of the coordinator keeps them below threshold, so their row is not rewritten
+            assert coordinator.project_status == CoordinatorProjectStatus.WORKING_BELOW_THRESHOLD
+            assert coordinator.status_since < common_status_since
 
             log_event: CoordinatorLogEvent = CoordinatorLogEvent.objects.get(coordinator_id=coordinator.pk)
             assert log_event.type == CoordinatorLogEventType.GROUP_FINISHED
@@ -68,7 +68,7 @@ def test_student_create(api_client, faker, timestamp, include_language_and_level
 
     assert Student.objects.filter(**data).exists()
     if include_language_and_level:
-        log_events = StudentLogEvent.objects.filter(student_id=personal_info.id)
+        log_events = StudentLogEvent.objects.filter(student_id=personal_info.id).order_by("pk")
         assert log_events[0].type == StudentLogEventType.REGISTERED
         assert_date_time_with_timestamp(log_events[0].date_time, timestamp)
         assert log_events[1].type == StudentLogEventType.AWAITING_OFFER
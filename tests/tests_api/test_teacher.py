@@ -551,7 +551,7 @@ class TestDashboardFinishedAndLeaving:
         )
         teacher.refresh_from_db()
         assert response.status_code == status.HTTP_204_NO_CONTENT
-        log_events = TeacherLogEvent.objects.filter(teacher_id=teacher.pk)
+        log_events = TeacherLogEvent.objects.filter(teacher_id=teacher.pk).order_by("pk")
         assert log_events[0].type == TeacherLogEventType.ACCESS_REVOKED
         assert log_events[1].type == TeacherLogEventType.FINISHED_AND_LEAVING
         assert teacher.project_status == TeacherProjectStatus.FINISHED_LEFT